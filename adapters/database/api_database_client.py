@@ -301,6 +301,21 @@ class ApiDatabaseClient(IDatabaseClient):
         
         return success
     
+    def get_replays_for_reprocessing(self, after_replay_id: int = 0, limit: int = 500) -> List[Dict]:
+        """Keyset page of replays for the historical reprocessing job"""
+        result = self._make_request('GET', '/api/v1/replays/batch', {
+            'after_id': int(after_replay_id),
+            'limit': int(limit)
+        })
+        return result if isinstance(result, list) else []
+    
+    def update_replays_batch(self, updates: List[Dict]) -> int:
+        """Apply reprocessed replay fields in one server-side transaction"""
+        result = self._make_request('PUT', '/api/v1/replays/batch', {
+            'updates': updates
+        })
+        return int(result.get('updated', 0)) if isinstance(result, dict) else 0
+    
     def update_player_comments_in_last_replay(self, comment: str) -> bool:
         """Update player comment for the last replay"""
         result = self._make_request('PUT', '/api/v1/replays/last/comment', {
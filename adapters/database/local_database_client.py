@@ -73,6 +73,14 @@ class LocalDatabaseClient(IDatabaseClient):
         """Insert replay information into database"""
         return self._db.insert_replay_info(replay_summary)
     
+    def get_replays_for_reprocessing(self, after_replay_id: int = 0, limit: int = 500) -> List[Dict]:
+        """Keyset page of replays for the historical reprocessing job"""
+        return self._db.get_replays_for_reprocessing(after_replay_id, limit)
+    
+    def update_replays_batch(self, updates: List[Dict]) -> int:
+        """Apply reprocessed replay fields in one transaction"""
+        return self._db.update_replays_batch(updates)
+    
     def update_player_comments_in_last_replay(self, comment: str) -> bool:
         """Update player comment for the last replay"""
         return self._db.update_player_comments_in_last_replay(comment)
@@ -1,6 +1,9 @@
+import asyncio
 import logging
 from typing import List, Optional
+from core.executors import get_executor
 from core.interfaces import ILanguageModel
+from core.llm_client import get_llm_client
 import api.chat_utils as chat_utils
 import settings.config as config
 
@@ -13,16 +16,22 @@ class OpenAIAdapter(ILanguageModel):
     async def generate_response(self, prompt: str, context: List[str] = None) -> str:
         """
         Generates a response using the existing chat_utils logic (with persona).
+        The persona logic is synchronous, so it runs on the llm executor; its
+        completion goes through the shared client's sync shim.
         """
         try:
             from api.chat_utils import process_ai_message
             
-            response = process_ai_message(
-                user_message=prompt,
-                conversation_mode="normal", # Default
-                contextHistory=context if context else [],
-                platform="core",
-                logger=self.logger
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                get_executor("llm"),
+                lambda: process_ai_message(
+                    user_message=prompt,
+                    conversation_mode="normal", # Default
+                    contextHistory=context if context else [],
+                    platform="core",
+                    logger=self.logger
+                )
             )
             
             return response
@@ -31,15 +40,15 @@ class OpenAIAdapter(ILanguageModel):
             logger.error(f"Error in OpenAIAdapter.generate_response: {e}")
             return "I'm having trouble thinking right now."
 
-    async def generate_raw(self, prompt: str) -> str:
+    async def generate_raw(self, prompt: str, cache: Optional[str] = None) -> str:
         """
         Generates a raw response directly from OpenAI without persona injection.
         Useful for system tasks like JSON parsing, summarization, etc.
+        ``cache`` names the prompt class for prompts that are pure functions of DB data.
         """
         try:
-            from api.chat_utils import send_prompt_to_openai
-            
-            completion = send_prompt_to_openai(prompt)
+            completion = await get_llm_client().complete([{"role": "user", "content": prompt}], call="raw",
+                                                         cache=cache)
             
             if completion and completion.choices and completion.choices[0].message:
                 return completion.choices[0].message.content
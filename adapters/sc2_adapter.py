@@ -4,6 +4,8 @@ import time
 import os
 from typing import Optional, Any
 from datetime import datetime
+from core.executors import get_executor
+from core.metrics import SC2_POLLS
 from core.interfaces import IGameStateProvider
 from core.bot import BotCore
 from core.events import GameStateEvent
@@ -56,7 +58,7 @@ class SC2Adapter(IGameStateProvider):
         # This prevents "Game Over" spam on bot restart if the game is already in 'MATCH_ENDED' state
         try:
             loop = asyncio.get_event_loop()
-            initial_game = await loop.run_in_executor(None, check_SC2_game_status, logger)
+            initial_game = await loop.run_in_executor(get_executor("poll"), check_SC2_game_status, logger)
             self.current_game = initial_game
             self.previous_game = initial_game
             status = initial_game.get_status() if initial_game else 'None'
@@ -72,56 +74,18 @@ class SC2Adapter(IGameStateProvider):
                 loop = asyncio.get_event_loop()
                 
                 # Poll SC2 API
-                current_game = await loop.run_in_executor(None, check_SC2_game_status, logger)
+                current_game = await loop.run_in_executor(get_executor("poll"), check_SC2_game_status, logger)
+                SC2_POLLS.inc(result="ok" if current_game is not None else "no_game")
                 
                 # Log SC2 client status to file
                 self._log_sc2_status(current_game, monitoring_success)
                 
-                # Detect State Change
-                if self._has_state_changed(self.current_game, current_game):
-                    old_status = self.current_game.get_status() if self.current_game and hasattr(self.current_game, 'get_status') else "None"
-                    new_status = current_game.get_status() if current_game and hasattr(current_game, 'get_status') else "None"
-                    logger.info(f"SC2 State Change Detected: {old_status} -> {new_status}")
-                    
-                    # 1. Notify Core (for simple status updates)
-                    event = self._create_game_event(current_game)
-                    self.bot_core.add_event(event)
-                    logger.debug(f"Pushed {event.event_type} event to BotCore")
-                    
-                    # 2. Trigger GameResultService (New Architecture)
-                    # Handle both MATCH_ENDED and REPLAY_ENDED (user watched replay immediately after game)
-                    ended_states = ("MATCH_ENDED", "REPLAY_ENDED")
-                    status = current_game.get_status() if current_game else "None"
-                    if status in ended_states and self.game_result_service:
-                        # Remember this ended game so we can retry on exit if the file is still locked now.
-                        self._pending_end_game = current_game
-                        logger.info(f"Triggering GameResultService.process_game_end for {status} (Async Task)")
-                        # Run as task to not block monitoring loop
-                        asyncio.create_task(self.game_result_service.process_game_end(current_game))
-                    elif (
-                        old_status in ended_states
-                        and new_status not in ended_states
-                        and self._pending_end_game is not None
-                        and self.game_result_service
-                    ):
-                        # User left the score/replay screen. The replay file is typically unlocked
-                        # now, so re-run processing. Dedup in GameResultService (claim-lock on
-                        # last_processed_replay) makes this a no-op if it was already handled,
-                        # so this never double-prompts alongside the deferred unlock retry.
-                        logger.info(
-                            f"Exited {old_status} -> {new_status}; re-triggering process_game_end for the ended game"
-                        )
-                        asyncio.create_task(self.game_result_service.process_game_end(self._pending_end_game))
-                        self._pending_end_game = None
-                    
-                    # Note: Legacy logic (handle_SC2_game_results) is intentionally disabled
-                    # to prevent double processing of game results. All logic is now in GameResultService.
-
-                self.previous_game = self.current_game
-                self.current_game = current_game
+                # Record the raw snapshot (latency harness) and detect state changes
+                await self.process_snapshot(current_game)
                 
             except Exception as e:
                 monitoring_success = False
+                SC2_POLLS.inc(result="error")
                 # Handle specific known error that indicates connection failure/GameInfo crash
                 if "isReplay" in str(e):
                     print("o", end="", flush=True)
@@ -157,6 +121,59 @@ class SC2Adapter(IGameStateProvider):
             # Sleep interval from config
             await asyncio.sleep(config.MONITOR_GAME_SLEEP_SECONDS)
 
+    async def process_snapshot(self, current_game):
+        """
+        Handle one polled SC2 client snapshot: push a GameStateEvent to BotCore on a
+        status change and trigger game-end processing. Used by the monitoring loop
+        and by the latency harness when replaying recorded snapshots.
+        """
+        recorder = getattr(self.bot_core, 'recorder', None)
+        if recorder:
+            recorder.record_sc2_snapshot(current_game)
+        
+        # Detect State Change
+        if self._has_state_changed(self.current_game, current_game):
+            old_status = self.current_game.get_status() if self.current_game and hasattr(self.current_game, 'get_status') else "None"
+            new_status = current_game.get_status() if current_game and hasattr(current_game, 'get_status') else "None"
+            logger.info(f"SC2 State Change Detected: {old_status} -> {new_status}")
+            
+            # 1. Notify Core (for simple status updates)
+            event = self._create_game_event(current_game)
+            self.bot_core.add_event(event)
+            logger.debug(f"Pushed {event.event_type} event to BotCore")
+            
+            # 2. Trigger GameResultService (New Architecture)
+            # Handle both MATCH_ENDED and REPLAY_ENDED (user watched replay immediately after game)
+            ended_states = ("MATCH_ENDED", "REPLAY_ENDED")
+            status = current_game.get_status() if current_game else "None"
+            if status in ended_states and self.game_result_service:
+                # Remember this ended game so we can retry on exit if the file is still locked now.
+                self._pending_end_game = current_game
+                logger.info(f"Triggering GameResultService.process_game_end for {status} (Async Task)")
+                # Run as task to not block monitoring loop
+                asyncio.create_task(self.game_result_service.process_game_end(current_game))
+            elif (
+                old_status in ended_states
+                and new_status not in ended_states
+                and self._pending_end_game is not None
+                and self.game_result_service
+            ):
+                # User left the score/replay screen. The replay file is typically unlocked
+                # now, so re-run processing. Dedup in GameResultService (claim-lock on
+                # last_processed_replay) makes this a no-op if it was already handled,
+                # so this never double-prompts alongside the deferred unlock retry.
+                logger.info(
+                    f"Exited {old_status} -> {new_status}; re-triggering process_game_end for the ended game"
+                )
+                asyncio.create_task(self.game_result_service.process_game_end(self._pending_end_game))
+                self._pending_end_game = None
+            
+            # Note: Legacy logic (handle_SC2_game_results) is intentionally disabled
+            # to prevent double processing of game results. All logic is now in GameResultService.
+
+        self.previous_game = self.current_game
+        self.current_game = current_game
+
     def stop(self):
         self.running = False
 
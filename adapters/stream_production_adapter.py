@@ -16,6 +16,8 @@ from datetime import datetime
 from typing import Optional
 
 import settings.config as config
+from core.executors import get_executor
+from core.metrics import STREAM_PRODUCTION_HEARTBEAT_AGE, STREAM_PRODUCTION_LAST_SUCCESS
 from core.stream_production.client import StreamProductionClient
 from core.stream_production.coalescer import (
     EventCoalescer,
@@ -60,7 +62,7 @@ class StreamProductionAdapter:
         # Baseline poll: adopt current seq and mark existing events as seen so a
         # restart mid-match doesn't replay old events into chat.
         try:
-            baseline = await loop.run_in_executor(None, self.client.fetch_status, 0)
+            baseline = await loop.run_in_executor(get_executor("poll"), self.client.fetch_status, 0)
             if baseline is not None:
                 if baseline.seq:
                     self.last_seq = baseline.seq
@@ -74,7 +76,7 @@ class StreamProductionAdapter:
                 for label, rel_path, kind in self._scoreboard_sources():
                     try:
                         self._prev_scoreboards[rel_path] = await loop.run_in_executor(
-                            None, self._fetch_parse_scoreboard, rel_path, kind
+                            get_executor("poll"), self._fetch_parse_scoreboard, rel_path, kind
                         )
                     except Exception as e:
                         logger.debug(f"scoreboard baseline failed ({rel_path}): {e}")
@@ -83,10 +85,13 @@ class StreamProductionAdapter:
 
         while self.running:
             try:
-                snapshot = await loop.run_in_executor(None, self.client.fetch_status, self.last_seq)
+                snapshot = await loop.run_in_executor(get_executor("poll"), self.client.fetch_status, self.last_seq)
                 now = time.monotonic()
 
                 if snapshot is not None:
+                    STREAM_PRODUCTION_LAST_SUCCESS.set(time.time())
+                    if snapshot.heartbeat_age_ms is not None:
+                        STREAM_PRODUCTION_HEARTBEAT_AGE.set(snapshot.heartbeat_age_ms / 1000)
                     if snapshot.seq:
                         self.last_seq = snapshot.seq
 
@@ -168,7 +173,7 @@ class StreamProductionAdapter:
                 scoreboard_context=(sb_info or {}).get("text"),
             )
             resp = await loop.run_in_executor(
-                None, send_prompt_to_openai_system_user, system, user
+                get_executor("llm"), send_prompt_to_openai_system_user, system, user
             )
             text = extract_llm_text(resp)
             if text:
@@ -231,7 +236,7 @@ class StreamProductionAdapter:
         fallback = []  # (label, matchup) matching the spotlighted player
 
         for label, rel_path, kind in self._scoreboard_sources():
-            curr = await loop.run_in_executor(None, self._fetch_parse_scoreboard, rel_path, kind)
+            curr = await loop.run_in_executor(get_executor("poll"), self._fetch_parse_scoreboard, rel_path, kind)
             if not curr:
                 continue
             prev = self._prev_scoreboards.get(rel_path, [])
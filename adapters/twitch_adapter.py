@@ -1,6 +1,5 @@
 import logging
 import asyncio
-import re
 import requests
 from typing import Optional
 from core.interfaces import IChatService
@@ -36,22 +35,14 @@ class TwitchAdapter(IChatService):
         """
         if self.twitch_bot and hasattr(self.twitch_bot, 'connection'):
             try:
-                # The legacy bot uses synchronous privmsg, but this method is async.
-                # In a full asyncio rewrite, we'd use twitchio. 
-                # For now, we wrap the sync call.
-                
                 # Handle generic channel names by using the bot's configured channel
                 target_channel = channel
                 if channel == "channel" and hasattr(self.twitch_bot, 'channel'):
                     target_channel = self.twitch_bot.channel
 
-                # IRC PRIVMSG must not contain CR/LF (Twitch: "Carriage returns not allowed")
-                message = re.sub(r"[\r\n]+", " | ", message or "").strip()
-
-                self.twitch_bot.connection.privmsg(target_channel, message)
-                # Sanitize for logging (remove non-ASCII characters that can't be encoded in console)
-                safe_message = tokensArray.replace_non_ascii(message, replacement='?')
-                logger.info(f"Sent to Twitch: {safe_message}")
+                # The bot's outbound queue strips CR/LF, packs and rate-limits; lines sent
+                # from a game_critical_chat flow (game end) go out ahead of chat replies
+                self.twitch_bot.queue_chat(message, channel=target_channel)
             except Exception as e:
                 logger.error(f"Failed to send message to Twitch: {e}")
         else:
@@ -144,9 +135,5 @@ class TwitchAdapter(IChatService):
             channel=channel
         )
         
-        # Dispatch to main loop thread-safely
-        if self.loop and self.loop.is_running():
-            self.loop.call_soon_threadsafe(self.bot_core.add_event, event)
-        else:
-            logger.warning("Main loop not available, attempting direct add (unsafe)")
-            self.bot_core.add_event(event)
+        # BotCore.add_event hands the event to the core loop thread-safely
+        self.bot_core.add_event(event)
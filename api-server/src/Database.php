@@ -671,6 +671,53 @@ class Database {
         return ['success' => $stmt->rowCount() > 0, 'replay_id' => (int)$replay_id];
     }
     
+    // Columns the historical reprocessing job is allowed to rewrite.
+    private const REPROCESS_UPDATABLE_COLUMNS = [
+        'Replay_Summary', 'Player1_PickRace', 'Player2_PickRace', 'Player1_Race', 'Player2_Race'
+    ];
+    
+    public function getReplaysForReprocessing($after_id, $limit) {
+        $sql = "SELECT r.ReplayId, r.UnixTimestamp, r.Player1_PickRace, r.Player2_PickRace,
+                       r.Player1_Race, r.Player2_Race, r.Replay_Summary,
+                       p1.SC2_UserId as Player1_Name, p2.SC2_UserId as Player2_Name
+                FROM Replays r
+                LEFT JOIN Players p1 ON r.Player1_Id = p1.Id
+                LEFT JOIN Players p2 ON r.Player2_Id = p2.Id
+                WHERE r.ReplayId > ?
+                ORDER BY r.ReplayId ASC
+                LIMIT ?";
+        $stmt = $this->conn->prepare($sql);
+        $stmt->bindValue(1, (int)$after_id, PDO::PARAM_INT);
+        $stmt->bindValue(2, max(1, min(2000, (int)$limit)), PDO::PARAM_INT);
+        $stmt->execute();
+        return $stmt->fetchAll();
+    }
+    
+    public function updateReplaysBatch($updates) {
+        $updated = 0;
+        $this->conn->beginTransaction();
+        try {
+            foreach ($updates as $update) {
+                $fields = array_intersect_key(
+                    $update['fields'] ?? [],
+                    array_flip(self::REPROCESS_UPDATABLE_COLUMNS)
+                );
+                if (empty($fields) || empty($update['replay_id'])) {
+                    continue;
+                }
+                $assignments = implode(', ', array_map(fn($col) => "$col = ?", array_keys($fields)));
+                $stmt = $this->conn->prepare("UPDATE Replays SET $assignments WHERE ReplayId = ?");
+                $stmt->execute(array_merge(array_values($fields), [(int)$update['replay_id']]));
+                $updated += $stmt->rowCount();
+            }
+            $this->conn->commit();
+        } catch (Exception $e) {
+            $this->conn->rollBack();
+            throw $e;
+        }
+        return ['success' => true, 'updated' => $updated];
+    }
+    
     public function savePlayerCommentWithData($comment_data) {
         // Save full comment data to PlayerComments table with keywords, build_order, etc.
         // comment_data should be a JSON string or array containing: raw_comment, cleaned_comment, keywords, game_data, etc.
@@ -75,6 +75,53 @@ $app->get('/api/v1/replays/games', function (Request $request, Response $respons
     }
 });
 
+// GET /api/v1/replays/batch?after_id=X&limit=N - keyset page for historical reprocessing
+$app->get('/api/v1/replays/batch', function (Request $request, Response $response) use ($db) {
+    try {
+        $params = $request->getQueryParams();
+        $after_id = isset($params['after_id']) ? (int)$params['after_id'] : 0;
+        $limit = isset($params['limit']) ? (int)$params['limit'] : 500;
+        
+        $result = $db->getReplaysForReprocessing($after_id, $limit);
+        $response->getBody()->write(json_encode($result));
+        return $response->withHeader('Content-Type', 'application/json');
+    } catch (Exception $e) {
+        $data = [
+            'error' => 'Database Error',
+            'message' => $e->getMessage()
+        ];
+        $response->getBody()->write(json_encode($data));
+        return $response->withStatus(500)->withHeader('Content-Type', 'application/json');
+    }
+});
+
+// PUT /api/v1/replays/batch - apply reprocessed fields in one transaction
+$app->put('/api/v1/replays/batch', function (Request $request, Response $response) use ($db) {
+    try {
+        $body = json_decode($request->getBody()->getContents(), true);
+        
+        if (!isset($body['updates']) || !is_array($body['updates'])) {
+            $data = [
+                'error' => 'Bad Request',
+                'message' => 'Missing required parameter: updates'
+            ];
+            $response->getBody()->write(json_encode($data));
+            return $response->withStatus(400)->withHeader('Content-Type', 'application/json');
+        }
+        
+        $result = $db->updateReplaysBatch($body['updates']);
+        $response->getBody()->write(json_encode($result));
+        return $response->withHeader('Content-Type', 'application/json');
+    } catch (Exception $e) {
+        $data = [
+            'error' => 'Database Error',
+            'message' => $e->getMessage()
+        ];
+        $response->getBody()->write(json_encode($data));
+        return $response->withStatus(500)->withHeader('Content-Type', 'application/json');
+    }
+});
+
 // PUT /api/v1/replays/last/comment - MUST come before parameterized routes
 $app->put('/api/v1/replays/last/comment', function (Request $request, Response $response) use ($db) {
     try {
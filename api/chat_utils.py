@@ -1,5 +1,4 @@
 from settings import config
-import openai
 import re
 import random
 import hashlib
@@ -10,6 +9,7 @@ import time
 import math
 import os
 import json
+from types import SimpleNamespace
 from utils.emote_utils import get_random_emote
 from utils.emote_utils import remove_emotes_from_message
 import utils.wiki_utils as wiki_utils
@@ -17,6 +17,10 @@ import utils.tokensArray as tokensArray
 import string
 from models.mathison_db import Database
 from utils.player_comment_args import split_replay_ref_prefix
+from core.llm_client import get_llm_client
+from core.outbound_chat import truncate_utf8
+from core import record_templates
+from core.tts_worker import restore_punctuation
 
 # Prepended to every OpenAI request in last_time_played mode (game-start summaries, build-only lines, etc.)
 LAST_TIME_PLAYED_INSTRUCTIONS = (
@@ -81,26 +85,14 @@ def send_prompt_to_openai_system_user(system_text: str, user_text: str):
             kwargs["temperature"] = float(lt_temp)
         except (TypeError, ValueError):
             pass
-    if hasattr(openai, "OpenAI"):
-        client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
-        return client.chat.completions.create(
-            model=config.ENGINE,
-            messages=[
-                {"role": "system", "content": system_text},
-                {"role": "user", "content": user_text},
-            ],
-            **kwargs,
-        )
-    openai.api_key = config.OPENAI_API_KEY
-    create_kw = {
-        "model": config.ENGINE,
-        "messages": [
+    return get_llm_client().complete_sync(
+        [
             {"role": "system", "content": system_text},
             {"role": "user", "content": user_text},
         ],
-    }
-    create_kw.update(kwargs)
-    return openai.ChatCompletion.create(**create_kw)
+        call="system_user",
+        **kwargs,
+    )
 
 
 def substitute_streamer_aliases_for_chat_display(text: str, account_names=None) -> str:
@@ -753,7 +745,7 @@ def clean_text_for_chat(msg):
     return msg
 
 # This function sends and logs the messages sent to twitch chat channel and optionally Discord
-def msgToChannel(self, message, logger, text2speech=False, send_to_discord=False):
+def msgToChannel(self, message, logger, text2speech=False, send_to_discord=False, priority=False):
 
     # Clean up the message
     message = clean_text_for_chat(message)
@@ -765,17 +757,19 @@ def msgToChannel(self, message, logger, text2speech=False, send_to_discord=False
     # Log the byte size of the message
     logger.debug(f"Message size in bytes: {message_size}")
 
-    # Check if the message exceeds the 512-byte limit
-    if message_size > 512:
-        truncated_message_bytes = message_bytes[:512 - len(" ... more".encode())] + " ... more".encode()
+    # Keep one PRIVMSG worth of text; cut on a character boundary so multi-byte text stays valid
+    byte_limit = getattr(config, "TWITCH_CHAT_BYTE_LIMIT", 450)
+    if message_size > byte_limit:
+        more = " ... more"
+        truncated_message_str = truncate_utf8(message, byte_limit - len(more.encode())) + more
     else:
-        truncated_message_bytes = message_bytes
-
-    # Convert the truncated message back to a string
-    truncated_message_str = truncated_message_bytes.decode()
+        truncated_message_str = message
 
     # Send to Twitch if this is a Twitch bot
-    if hasattr(self, 'connection') and hasattr(self.connection, 'privmsg'):
+    if hasattr(self, 'outbound'):
+        # Rate-limited queue; it logs "Sent to Twitch" when the line actually goes out
+        self.outbound.send(self.channel, truncated_message_str, priority=priority)
+    elif hasattr(self, 'connection') and hasattr(self.connection, 'privmsg'):
         self.connection.privmsg(self.channel, truncated_message_str)
         # INFO so file logs capture outbound chat even when callers use loggers stuck at INFO (e.g. core.bot).
         safe_message = tokensArray.replace_non_ascii(truncated_message_str, replacement='?')
@@ -829,18 +823,11 @@ def msgToChannel(self, message, logger, text2speech=False, send_to_discord=False
         try:
             logger.debug("Preparing to speak the message.")
 
-            # Process the message to remove emotes and add punctuation
+            # Process the message to remove emotes and add punctuation (local rules, no completion)
             truncated_message_str = remove_emotes_from_message(truncated_message_str)
-            truncated_message_str = "add commas, period and other appropriate punctuation: " + truncated_message_str
-
-            # Generate the response using OpenAI
-            completion = send_prompt_to_openai(truncated_message_str)
-            if completion.choices[0].message is not None:
-                logger.debug("completion.choices[0].message.content: " + completion.choices[0].message.content)
-                response = completion.choices[0].message.content
-                truncated_message_str = response
+            truncated_message_str = restore_punctuation(truncated_message_str)
 
-            # Speak the processed message if TTS is available
+            # Queue the processed message for the TTS worker if TTS is available (does not wait for it)
             if TTS_AVAILABLE and speak_text is not None:
                 speak_text(truncated_message_str, mode=1)
             else:
@@ -1384,6 +1371,11 @@ def process_pubmsg(self, event, logger, contextHistory):
         logger.debug("career overall record answer: \n" + career_record)          
         career2_record = self.db.get_player_race_matchup_records(player_name)        
         logger.debug("career matchups record answer: \n" + career_record)    
+        lines = (record_templates.format_career(player_name, career_record, career2_record)
+                 if record_templates.templates_enabled() else None)
+        if lines:
+            _send_record_lines(self, lines, "career", logger)
+            return
         career_record = career_record + " " + career2_record      
 
         # Check if there are any results
@@ -1414,8 +1406,8 @@ def process_pubmsg(self, event, logger, contextHistory):
         # Send the message for processing
         # processMessageForOpenAI(self, msg, self.conversation_mode, logger, contextHistory)
         
-        # no mathison flavoring, just raw send to prompt
-        completion = send_prompt_to_openai(msg)
+        # no mathison flavoring, just raw send to prompt (same records -> same reply, so cached)
+        completion = send_prompt_to_openai(msg, cache="career")
         if completion.choices[0].message is not None:
             logger.debug(
                 "completion.choices[0].message.content: " + completion.choices[0].message.content)
@@ -1452,6 +1444,11 @@ def process_pubmsg(self, event, logger, contextHistory):
         player_name = msg.split(" ", 1)[1]
         history_list = self.db.get_player_records(player_name)
         logger.debug("history answer: /n" + str(history_list))  
+        lines = (record_templates.format_history(player_name, history_list)
+                 if history_list and record_templates.templates_enabled() else None)
+        if lines:
+            _send_record_lines(self, lines, "history", logger)
+            return
 
         # Process each record and format it as desired
         formatted_records = [f"{rec.split(', ')[0]} vs {rec.split(', ')[1]}, {rec.split(', ')[2].split(' ')[0]}-{rec.split(', ')[3].split(' ')[0]}" for rec in history_list]
@@ -1469,11 +1466,6 @@ def process_pubmsg(self, event, logger, contextHistory):
         processMessageForOpenAI(self, msg, self.conversation_mode, logger, contextHistory)
         return
   
-    def chunk_list(lst, max_chunk_size):
-        """Splits the list into smaller lists each having a length less than or equal to max_chunk_size."""
-        for i in range(0, len(lst), max_chunk_size):
-            yield lst[i:i + max_chunk_size]
-
     # Check if the message contains "games in" and "hours"
     if 'games in' in msg.lower() and 'hours' in msg.lower():
         logger.debug("Received command to fetch games in the last X hours")
@@ -1495,24 +1487,12 @@ def process_pubmsg(self, event, logger, contextHistory):
         # Process each game record and format it as desired
         formatted_records = [f"{game}" for game in recent_games]
 
-        # Define chunk size based on an estimated average size of each record
-        avg_record_size = 100  # This is an estimation; you might need to adjust it
-        max_chunk_size = config.TWITCH_CHAT_BYTE_LIMIT // avg_record_size
-
-        msg = f"Games played in the last {hours} hours are: "
-        msgToChannel(self, msg, logger)
-        
-        # Split the formatted records into chunks
-        for chunk in chunk_list(formatted_records, max_chunk_size):
-            # Join the records in the chunk into a single string
-            chunk_string = " and ".join(chunk)
-
-            # Truncate the chunk string to byte limit
-            trimmed_msg = tokensArray.truncate_to_byte_limit(chunk_string, config.TWITCH_CHAT_BYTE_LIMIT)
-
-            # Send the chunk message
-            msgToChannel(self, trimmed_msg, logger)
-            # processMessageForOpenAI(self, msg, self.conversation_mode, logger, contextHistory)
+        # Pack whole records into as few messages as fit the byte limit (instead of a guessed
+        # records-per-message count that could still truncate records away)
+        for line in record_templates.pack_messages(
+            f"Games played in the last {hours} hours are: ", formatted_records, separator=" and "
+        ):
+            msgToChannel(self, line, logger)
 
     # Function to process the 'head to head' command
     if 'head to head' in msg.lower():
@@ -1528,6 +1508,11 @@ def process_pubmsg(self, event, logger, contextHistory):
             head_to_head_list = self.db.get_head_to_head_matchup(player1_name, player2_name)
             logger.debug(f"Type of head_to_head_list: {type(head_to_head_list)}")
             logger.debug(f"Head to head answer: \n{str(head_to_head_list)}")
+            lines = (record_templates.format_head_to_head(player1_name, player2_name, head_to_head_list)
+                     if head_to_head_list and record_templates.templates_enabled() else None)
+            if lines:
+                _send_record_lines(self, lines, "head_to_head", logger)
+                return
 
             # Check if there are any results
             if head_to_head_list:
@@ -1559,8 +1544,8 @@ def process_pubmsg(self, event, logger, contextHistory):
             # Send the message for processing
             # processMessageForOpenAI(self, msg, self.conversation_mode, logger, contextHistory)
             
-            # no mathison flavoring, just raw send to prompt
-            completion = send_prompt_to_openai(msg)
+            # no mathison flavoring, just raw send to prompt (same records -> same reply, so cached)
+            completion = send_prompt_to_openai(msg, cache="head_to_head")
             if completion.choices[0].message is not None:
                 logger.debug(
                     "completion.choices[0].message.content: " + completion.choices[0].message.content)
@@ -1652,12 +1637,34 @@ def process_pubmsg(self, event, logger, contextHistory):
         }
         msgToChannel(self, switcher.get(response), logger)
 
-def send_prompt_to_openai(msg):
+def _send_record_lines(self, lines, prompt_class, logger):
+    """Send template record lines; the optional LLM flourish follows from the llm executor."""
+    for line in lines:
+        msgToChannel(self, line, logger)
+    if not record_templates.flourish_enabled():
+        return
+
+    def flourish():
+        try:
+            completion = send_prompt_to_openai(record_templates.flourish_prompt(lines), cache=prompt_class)
+            comment = (completion.choices[0].message.content or "").strip()
+            if comment:
+                msgToChannel(self, comment, logger)
+        except Exception as e:
+            logger.debug(f"Record flourish skipped: {e}")
+
+    from core.executors import get_executor
+    get_executor("llm").submit(flourish)
+
+
+def send_prompt_to_openai(msg, cache=None):
     """
     Send a given message as a prompt to OpenAI and return the response.
-    Supports both old (0.27.x) and new (>=1.0.0) OpenAI API versions.
+    Goes through the shared pooled client (core.llm_client), which supports both
+    old (0.27.x) and new (>=1.0.0) OpenAI API versions.
 
     :param msg: The message to send to OpenAI as a prompt.
+    :param cache: Prompt class (e.g. "career") to reuse a recent reply for the same prompt; None bypasses the cache.
     :return: The response from OpenAI.
     """
     import logging
@@ -1665,27 +1672,7 @@ def send_prompt_to_openai(msg):
     log = logging.getLogger(__name__)
     _log_ai_extra(log, "OpenAI user-only prompt", msg)
 
-    # Check which API version is available by testing if OpenAI class exists
-    if hasattr(openai, 'OpenAI'):
-        # New API (openai >= 1.0.0)
-        client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
-        completion = client.chat.completions.create(
-            model=config.ENGINE,
-            messages=[
-                {"role": "user", "content": msg}
-            ]
-        )
-        return completion
-    else:
-        # Old API (openai < 1.0.0, e.g., 0.27.8)
-        openai.api_key = config.OPENAI_API_KEY
-        completion = openai.ChatCompletion.create(
-            model=config.ENGINE,
-            messages=[
-                {"role": "user", "content": msg}
-            ]
-        )
-        return completion
+    return get_llm_client().complete_sync([{"role": "user", "content": msg}], call="prompt", cache=cache)
 
 
 def summarize_strategy_with_units(player_name: str, pattern_name: str, 
@@ -1749,6 +1736,113 @@ def sanitize_retry_replay_commentary(text: str, max_words: int = 0) -> str:
     out = out.rstrip(",;:")
     return out + "."
 
+def _clean_ai_whitespace(response: str) -> str:
+    # Remove carriage returns, newlines, and tabs
+    response = re.sub('[\r\n\t]', ' ', response)
+    # Remove non-ASCII characters
+    response = re.sub('[^\x00-\x7F]+', '', response)
+    response = re.sub(' +', ' ', response)  # Remove extra spaces
+    return response.strip()  # Remove leading and trailing whitespace
+
+
+def _strip_bot_tells(response: str) -> str:
+    # dont make it too obvious its a bot
+    response = response.replace("As an AI language model, ", "")
+    response = response.replace("User: , ", "")
+    response = response.replace("Observer: , ", "")
+    response = response.replace("Player: , ", "")
+    # replace with ? all non ascii characters that throw an error in logger
+    response = tokensArray.replace_non_ascii(response, replacement='?')
+    # Remove all occurrences of "AI: "
+    return re.sub(r'\bAI: ', '', response)
+
+
+def _correct_replay_winner(response, msg, logger, reply_so_far=None):
+    """
+    Replay analysis: fix replies that name the loser as the winner (or the winner as the loser),
+    using the Winners:/Losers: lines of the prompt. Only short phrases such as "X won" are
+    replaced. When streaming, ``reply_so_far`` is the reply up to and including ``response``:
+    whether the reply contradicts the result is decided on it, and only ``response`` is rewritten.
+    """
+    if "Winners:" not in msg or "Losers:" not in msg:
+        return response
+    # Extract winners and losers from the original message
+    winners_line = [line for line in msg.split('\n') if line.startswith('Winners:')]
+    losers_line = [line for line in msg.split('\n') if line.startswith('Losers:')]
+    if not winners_line or not losers_line:
+        return response
+    winners = winners_line[0].replace('Winners:', '').strip()
+    losers = losers_line[0].replace('Losers:', '').strip()
+    if not winners or not losers:
+        return response
+
+    # Check if AI response contradicts the actual results
+    response_lower = (response if reply_so_far is None else reply_so_far).lower()
+    winners_lower = winners.lower()
+    losers_lower = losers.lower()
+
+    # If AI says loser won, fix it
+    if losers_lower in response_lower and "win" in response_lower and "victory" in response_lower:
+        logger.warning(f"AI hallucinated wrong winner! Said {losers} won when {winners} actually won. Fixing response.")
+        response = response.replace(f"{losers} won", f"{winners} won")
+        response = response.replace(f"{losers} victory", f"{winners} victory")
+        response = response.replace(f"{losers} took", f"{winners} took")
+
+    # If AI says winner lost, fix it
+    if winners_lower in response_lower and "loss" in response_lower and "defeat" in response_lower:
+        logger.warning(f"AI hallucinated wrong loser! Said {winners} lost when {losers} actually lost. Fixing response.")
+        response = response.replace(f"{winners} lost", f"{losers} lost")
+        response = response.replace(f"{winners} defeat", f"{losers} defeat")
+    return response
+
+
+def _stream_ai_reply(msg, conversation_mode, contextHistory, logger, on_chunk):
+    """
+    Stream the completion for ``msg`` and hand each sentence-bounded message to
+    ``on_chunk(text, is_last)`` as soon as it is complete. Only the per-message
+    filters (whitespace, bot tells, replay-analysis winner corrections) apply;
+    modes whose filters need the whole reply are not streamed (see LLM_STREAM_MODES). Returns the full reply, or
+    None if the stream failed before anything was sent (caller falls back).
+    """
+    from core.llm_stream import sentence_chunks
+
+    _log_ai_extra(logger, "OpenAI user-only prompt (streamed)", msg)
+    deltas = get_llm_client().stream_sync([{"role": "user", "content": msg}], call="stream")
+    # Decided up front, like the non-streamed path, so it lands on the last message
+    add_emote = random.choice([True, False])
+    sent = []
+    raw = []  # messages before the winner correction, to judge the reply as a whole
+    try:
+        for text, is_last in sentence_chunks(
+            deltas,
+            min_chars=int(getattr(config, "LLM_STREAM_MIN_CHUNK_CHARS", 150)),
+            max_bytes=int(getattr(config, "LLM_STREAM_CHUNK_BYTES", 400)),
+        ):
+            if is_last and add_emote:
+                text = f'{text} {get_random_emote()}'
+            text = _strip_bot_tells(_clean_ai_whitespace(text))
+            if conversation_mode == "replay_analysis":
+                raw.append(text)
+                text = _correct_replay_winner(text, msg, logger, reply_so_far=" ".join(raw))
+            if not text:
+                continue
+            on_chunk(text, is_last)
+            sent.append(text)
+    except Exception as e:
+        if not sent:
+            logger.warning(f"Streaming completion failed, retrying without streaming: {e}")
+            return None
+        logger.error(f"Streaming completion failed after {len(sent)} message(s): {e}")
+    finally:
+        deltas.close()
+
+    response = " ".join(sent)
+    _log_ai_extra(logger, f"OpenAI streamed reply ({conversation_mode})", response)
+    tokensArray.add_new_msg(contextHistory, 'AI: ' + response + "\n", logger)
+    logger.debug(f'AI response streamed: {clean_text_for_logging(response)}')
+    return response
+
+
 def process_ai_message(
     user_message,
     conversation_mode="normal",
@@ -1757,21 +1851,26 @@ def process_ai_message(
     logger=None,
     *,
     suppress_last_time_sc2_alias_substitution: bool = False,
+    on_chunk=None,
+    precomputed_reply=None,
 ):
     """
     Platform-agnostic AI message processing.
     Returns the AI response without platform-specific handling.
+
+    on_chunk: if given, the completion is streamed and each sentence-bounded
+    message is passed to ``on_chunk(text, is_last)`` as it is generated (the
+    full reply is still returned). Not used for last_time_played.
+    precomputed_reply: model output already obtained for this message (e.g. from the
+    pregame composer); it skips the API call but gets the same post-processing.
     """
     if contextHistory is None:
-        contextHistory = []
+        contextHistory = tokensArray.ContextHistory()
     
     if logger is None:
         import logging
         logger = logging.getLogger(__name__)
 
-    # let's give these requests some breathing room
-    time.sleep(config.MONITOR_GAME_SLEEP_SECONDS)
-
     # remove open sesame
     msg = user_message.replace('open sesame', '')
     logger.debug(
@@ -1906,10 +2005,16 @@ def process_ai_message(
     if conversation_mode != "last_time_played":
         _log_ai_extra(logger, f"final prompt to OpenAI ({conversation_mode})", msg)
 
-    if conversation_mode == "last_time_played":
+    if precomputed_reply is not None:
+        completion = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=precomputed_reply))])
+    elif conversation_mode == "last_time_played":
         system_msg = LAST_TIME_PLAYED_INSTRUCTIONS + "\n\n" + LAST_TIME_PLAYED_SYSTEM_SUFFIX
         completion = send_prompt_to_openai_system_user(system_msg, msg)
     else:
+        if on_chunk is not None:
+            streamed = _stream_ai_reply(msg, conversation_mode, contextHistory, logger, on_chunk)
+            if streamed is not None:
+                return streamed
         completion = send_prompt_to_openai(msg)
 
     try:
@@ -1927,12 +2032,7 @@ def process_ai_message(
             logger.debug(clean_text_for_logging(response))
 
             # Clean up response
-            # Remove carriage returns, newlines, and tabs
-            response = re.sub('[\r\n\t]', ' ', response)
-            # Remove non-ASCII characters
-            response = re.sub('[^\x00-\x7F]+', '', response)
-            response = re.sub(' +', ' ', response)  # Remove extra spaces
-            response = response.strip()  # Remove leading and trailing whitespace
+            response = _clean_ai_whitespace(response)
 
             if conversation_mode == "last_time_played" and not suppress_last_time_sc2_alias_substitution:
                 response = substitute_streamer_aliases_for_chat_display(response)
@@ -1956,19 +2056,9 @@ def process_ai_message(
                     response,
                 )
 
-            # dont make it too obvious its a bot
-            response = response.replace("As an AI language model, ", "")
-            response = response.replace("User: , ", "")
-            response = response.replace("Observer: , ", "")
-            response = response.replace("Player: , ", "")
-
+            response = _strip_bot_tells(response)
             logger.debug("cleaned up message from OpenAI:")
-            # replace with ? all non ascii characters that throw an error in logger
-            response = tokensArray.replace_non_ascii(response, replacement='?')
             logger.debug(clean_text_for_logging(response))
-
-            # Remove all occurrences of "AI: "
-            response = re.sub(r'\bAI: ', '', response)
             
             # Add AI response to conversation context
             tokensArray.add_new_msg(
@@ -1977,33 +2067,8 @@ def process_ai_message(
             logger.debug(f'AI response generated: {clean_text_for_logging(response)}')
             
             # For replay analysis, validate that the response doesn't contradict the actual game results
-            if conversation_mode == "replay_analysis" and "Winners:" in msg and "Losers:" in msg:
-                # Extract winners and losers from the original message
-                winners_line = [line for line in msg.split('\n') if line.startswith('Winners:')]
-                losers_line = [line for line in msg.split('\n') if line.startswith('Losers:')]
-                
-                if winners_line and losers_line:
-                    winners = winners_line[0].replace('Winners:', '').strip()
-                    losers = losers_line[0].replace('Losers:', '').strip()
-                    
-                    # Check if AI response contradicts the actual results
-                    if winners and losers:
-                        response_lower = response.lower()
-                        winners_lower = winners.lower()
-                        losers_lower = losers.lower()
-                        
-                        # If AI says loser won, fix it
-                        if losers_lower in response_lower and "win" in response_lower and "victory" in response_lower:
-                            logger.warning(f"AI hallucinated wrong winner! Said {losers} won when {winners} actually won. Fixing response.")
-                            response = response.replace(f"{losers} won", f"{winners} won")
-                            response = response.replace(f"{losers} victory", f"{winners} victory")
-                            response = response.replace(f"{losers} took", f"{winners} took")
-                        
-                        # If AI says winner lost, fix it  
-                        if winners_lower in response_lower and "loss" in response_lower and "defeat" in response_lower:
-                            logger.warning(f"AI hallucinated wrong loser! Said {winners} lost when {losers} actually lost. Fixing response.")
-                            response = response.replace(f"{winners} lost", f"{losers} lost")
-                            response = response.replace(f"{winners} defeat", f"{losers} defeat")
+            if conversation_mode == "replay_analysis":
+                response = _correct_replay_winner(response, msg, logger)
             
             logger.debug(
                 f'Conversation in context so far: {tokensArray.get_printed_array("reversed", contextHistory)}')
@@ -2019,6 +2084,10 @@ def process_ai_message(
         logger.error('Failed to generate response: %s', e)
         return 'oops, I have no response to that'
 
+
+GAME_CRITICAL_MODES = ("in_game", "replay_analysis", "last_time_played")
+
+
 def processMessageForOpenAI(
     self,
     msg,
@@ -2028,14 +2097,33 @@ def processMessageForOpenAI(
     *,
     response_suffix="",
     suppress_last_time_sc2_alias_substitution: bool = False,
+    precomputed_reply=None,
 ):
     """
     Legacy function for Twitch bot compatibility.
     Now uses the platform-agnostic process_ai_message function.
 
     response_suffix: appended after the model reply (e.g. deterministic opponent opening from DB order).
+    precomputed_reply: model output already obtained elsewhere (pregame composer); skips the API call.
     """
-    
+    # Game commentary (in-game intel, replay analysis) jumps ahead of queued chat replies
+    priority = conversation_mode in GAME_CRITICAL_MODES
+
+    # Stream long replies to chat sentence by sentence where every post-processing step is per-message
+    on_chunk = None
+    if (getattr(config, "LLM_STREAMING", False)
+            and conversation_mode in getattr(config, "LLM_STREAM_MODES", ("normal", "helpful", "in_game", "replay_analysis"))
+            and not response_suffix
+            and precomputed_reply is None):
+        streamed_chunks = []
+
+        def on_chunk(text, is_last):
+            # Same rule as below: a reply that fits in one short message gets spoken
+            speak = is_last and not streamed_chunks and len(text) <= 150
+            streamed_chunks.append(text)
+            msgToChannel(self, text, logger, text2speech=speak, priority=priority)
+            logger.debug(f'Sending streamed openAI response chunk: {clean_text_for_logging(text)}')
+
     # Use the new platform-agnostic function
     response = process_ai_message(
         msg,
@@ -2044,7 +2132,12 @@ def processMessageForOpenAI(
         "twitch",
         logger,
         suppress_last_time_sc2_alias_substitution=suppress_last_time_sc2_alias_substitution,
+        on_chunk=on_chunk,
+        precomputed_reply=precomputed_reply,
     )
+    if on_chunk is not None and streamed_chunks:
+        logger.debug(f'AI msg streamed to chat in {len(streamed_chunks)} message(s)')
+        return
     if conversation_mode == "last_time_played":
         response = _strip_llm_opponent_opening_clause(response)
     if response_suffix:
@@ -2074,16 +2167,16 @@ def processMessageForOpenAI(
 
         # Send response chunks to chat
         for chunk in chunks:
-            msgToChannel(self, chunk, logger)
+            msgToChannel(self, chunk, logger, priority=priority)
             # Log relevant details
             logger.debug(f'Sending openAI response chunk: {clean_text_for_logging(chunk)}')
     else:
         # if response is less than 150 characters
         if len(response) <= 150:
             # really short messages get to be spoken
-            msgToChannel(self, response, logger, text2speech=True)
+            msgToChannel(self, response, logger, text2speech=True, priority=priority)
         else:
-            msgToChannel(self, response, logger)                                        
+            msgToChannel(self, response, logger, priority=priority)
 
         # Log relevant details
         logger.debug(f'AI msg to chat: {response}')
\ No newline at end of file
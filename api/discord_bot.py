@@ -2,18 +2,18 @@ import discord
 from discord.ext import commands
 import logging
 import asyncio
-import queue
 import threading
+from collections import deque
 from datetime import datetime, timedelta
 from settings import config
 from api.chat_utils import clean_text_for_chat
 import utils.tokensArray as tokensArray
+from core.executors import get_executor
+from core.metrics import CHAT_MESSAGES_OUT
+from core.rate_limit import TokenBucket
 
 logger = logging.getLogger(__name__)
 
-# Global message queue for sending messages to Discord
-message_queue = queue.Queue()
-
 class DiscordBot(commands.Bot):
     def __init__(self, twitch_bot_ref=None):
         intents = discord.Intents.default()
@@ -27,9 +27,9 @@ class DiscordBot(commands.Bot):
         self.channel_id = None
         
         # Share context history with Twitch bot for consistent AI responses
-        self.contextHistory = []
-        if twitch_bot_ref:
-            self.contextHistory = twitch_bot_ref.contextHistory if hasattr(twitch_bot_ref, 'contextHistory') else []
+        self.contextHistory = tokensArray.ContextHistory()
+        if twitch_bot_ref and hasattr(twitch_bot_ref, 'contextHistory'):
+            self.contextHistory = twitch_bot_ref.contextHistory
         
         # Track messages for last word feature - stores message metadata for reply detection
         self.message_tracker = {}  # {message_id: {'timestamp': datetime, 'has_replies': bool, 'content': str, 'author': str}}
@@ -38,6 +38,14 @@ class DiscordBot(commands.Bot):
         # Background task for last word feature (will be started after on_ready)
         self.last_word_task = None
 
+        # Mirrored Twitch chat waiting to be posted; filled on the client loop by enqueue_mirror()
+        self.mirror_outbox = deque()
+        self.mirror_ready = asyncio.Event()
+        self.mirror_bucket = TokenBucket(
+            rate=float(getattr(config, 'DISCORD_MIRROR_MESSAGES_PER_SECOND', 1.0)),
+            capacity=int(getattr(config, 'DISCORD_MIRROR_BURST', 5)),
+        )
+
     async def on_ready(self):
         """Called when the bot is ready."""
         # Use the same logger as the Twitch bot
@@ -209,7 +217,7 @@ class DiscordBot(commands.Bot):
             import utils.tokensArray as tokensArray
             
             # Use separate context for last word (to avoid interfering with main conversation)
-            last_word_context = []
+            last_word_context = tokensArray.ContextHistory()
             
             # Generate AI response 
             def generate_ai_response():
@@ -223,7 +231,7 @@ class DiscordBot(commands.Bot):
             
             # Run AI processing in executor to avoid blocking
             loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, generate_ai_response)
+            response = await loop.run_in_executor(get_executor("llm"), generate_ai_response)
             
             if response:
                 # Clean and truncate for Discord (2000 char limit)
@@ -276,38 +284,56 @@ class DiscordBot(commands.Bot):
                 logger.error(f"Error during bot shutdown: {e}")
         await super().close()
 
+    def enqueue_mirror(self, message_text):
+        """Add a mirrored line to the outbox (call on the client loop; see queue_message_for_discord)."""
+        cleaned = clean_text_for_chat(message_text).strip()
+        if cleaned:
+            self.mirror_outbox.append(cleaned)
+            self.mirror_ready.set()
+
+    def _next_mirror_post(self):
+        """Pop queued lines into one post, one line each, up to the Discord length limit."""
+        limit = int(getattr(config, 'DISCORD_MESSAGE_CHAR_LIMIT', 2000))
+        post = self.mirror_outbox.popleft()[:limit]
+        while self.mirror_outbox and len(post) + 1 + len(self.mirror_outbox[0]) <= limit:
+            post += "\n" + self.mirror_outbox.popleft()
+        return post
+
     async def process_message_queue(self):
-        """Process messages from the queue and send them to Discord.
+        """Post mirrored messages from other parts of the bot (like the Twitch bot) to Discord.
         
-        This runs continuously and processes messages that other parts of the bot
-        (like the Twitch bot) want to send to Discord via the queue.
+        Waits on the outbox instead of polling. Lines arriving within
+        DISCORD_MIRROR_BATCH_SECONDS of each other, or while the send budget is
+        spent, are combined into a single post.
         """
         # Use the same logger as the Twitch bot to keep logs in same file
         from api.twitch_bot import logger as twitch_logger
         
         twitch_logger.info("Discord message queue processor started")
+        batch_seconds = float(getattr(config, 'DISCORD_MIRROR_BATCH_SECONDS', 0.5))
         message_count = 0
         failed_count = 0
         
         try:
             while True:
                 try:
-                    # Check for messages in the queue (non-blocking)
-                    if not message_queue.empty():
-                        message_text = message_queue.get_nowait()
-                        message_count += 1
-                        twitch_logger.info(f"Processing Discord message #{message_count}: {message_text[:100]}...")
-                        
-                        try:
-                            await self.send_message_to_discord(message_text)
-                            twitch_logger.info(f"Successfully sent message #{message_count} to Discord")
-                        except Exception as send_error:
-                            failed_count += 1
-                            twitch_logger.error(f"Failed to send message #{message_count} to Discord: {send_error}")
-                            twitch_logger.info(f"Discord send stats - Success: {message_count - failed_count}, Failed: {failed_count}")
+                    if not self.mirror_outbox:
+                        self.mirror_ready.clear()
+                        await self.mirror_ready.wait()
+                        # Let the rest of a burst arrive so it shares one post
+                        await asyncio.sleep(batch_seconds)
+                    await self.mirror_bucket.acquire()
+                    post = self._next_mirror_post()
+                    message_count += 1
+                    twitch_logger.info(f"Processing Discord message #{message_count}: {post[:100]}...")
                     
-                    # Wait a bit before checking again (prevents busy waiting)
-                    await asyncio.sleep(0.1)
+                    try:
+                        await self.send_message_to_discord(post, preformatted=True)
+                        twitch_logger.info(f"Successfully sent message #{message_count} to Discord")
+                    except Exception as send_error:
+                        failed_count += 1
+                        twitch_logger.error(f"Failed to send message #{message_count} to Discord: {send_error}")
+                        twitch_logger.info(f"Discord send stats - Success: {message_count - failed_count}, Failed: {failed_count}")
                     
                 except asyncio.CancelledError:
                     # Task was cancelled (likely due to shutdown) - break gracefully
@@ -495,7 +521,7 @@ class DiscordBot(commands.Bot):
             import utils.tokensArray as tokensArray
             
             # Use separate context for history commands (cleared each time like Twitch)
-            history_context = []
+            history_context = tokensArray.ContextHistory()
             
             # Generate AI response 
             def generate_ai_response():
@@ -509,7 +535,7 @@ class DiscordBot(commands.Bot):
             
             # Run AI processing in executor to avoid blocking
             loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, generate_ai_response)
+            response = await loop.run_in_executor(get_executor("llm"), generate_ai_response)
             
             if response:
                 # Clean and truncate for Discord (2000 char limit)
@@ -536,7 +562,7 @@ class DiscordBot(commands.Bot):
             
             # Use separate context history for Discord
             if not hasattr(self, 'discord_context_history'):
-                self.discord_context_history = []
+                self.discord_context_history = tokensArray.ContextHistory()
             
             # Process with the clean AI function in a thread to avoid blocking
             def generate_ai_response():
@@ -550,7 +576,7 @@ class DiscordBot(commands.Bot):
             
             # Run AI processing in executor to avoid blocking
             loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, generate_ai_response)
+            response = await loop.run_in_executor(get_executor("llm"), generate_ai_response)
             
             if response:
                 # Clean and truncate for Discord (2000 char limit)
@@ -584,8 +610,11 @@ class DiscordBot(commands.Bot):
         # This method is deprecated but kept for compatibility during transition
         pass
 
-    async def send_message_to_discord(self, message_text):
-        """Send a message to the configured Discord channel."""
+    async def send_message_to_discord(self, message_text, preformatted=False):
+        """Send a message to the configured Discord channel.
+
+        preformatted: the text is already cleaned (batched mirror posts keep their line breaks).
+        """
         # Use the same logger as the Twitch bot
         from api.twitch_bot import logger as twitch_logger
         
@@ -599,11 +628,12 @@ class DiscordBot(commands.Bot):
         if channel:
             try:
                 # Clean and truncate message for Discord (2000 char limit)
-                cleaned_message = clean_text_for_chat(message_text)
+                cleaned_message = message_text if preformatted else clean_text_for_chat(message_text)
                 truncated_message = tokensArray.truncate_to_byte_limit(cleaned_message, 2000)
                 
                 twitch_logger.info(f"Sending to Discord channel '{channel.name}': {truncated_message}")
                 await channel.send(truncated_message)
+                CHAT_MESSAGES_OUT.inc(platform="discord")
                 twitch_logger.info(f"Successfully sent message to Discord")
             except Exception as e:
                 twitch_logger.error(f"Failed to send message to Discord: {e}")
@@ -635,8 +665,17 @@ def queue_message_for_discord(message_text):
         # Simple connection check - only queue if Discord bot is ready
         # This prevents messages from being lost if Discord is disconnected
         if discord_bot_instance and discord_bot_instance.is_ready():
-            message_queue.put_nowait(message_text)
-            twitch_logger.info(f"Queued message for Discord (queue size: {message_queue.qsize()}): {message_text[:100]}...")
+            # Hand off to the Discord client loop; the processor wakes on it (no polling)
+            bot = discord_bot_instance
+            try:
+                on_client_loop = asyncio.get_running_loop() is bot.loop
+            except RuntimeError:
+                on_client_loop = False
+            if on_client_loop:
+                bot.enqueue_mirror(message_text)
+            else:
+                bot.loop.call_soon_threadsafe(bot.enqueue_mirror, message_text)
+            twitch_logger.info(f"Queued message for Discord: {message_text[:100]}...")
         else:
             twitch_logger.debug(f"Discord bot not ready - skipping message: {message_text[:100]}...")
     except Exception as e:
@@ -2,6 +2,7 @@ from datetime import datetime
 import pytz
 from api.chat_utils import processMessageForOpenAI, msgToChannel
 
+from core.instrumentation import span
 from core.pregame_intel import PreGameBrief, run_known_opponent_pregame
 from core.random_opponent_intel import gather_concrete_race_intel_for_random_opponent
 from core.pregame_matchup_blurb import (
@@ -157,9 +158,10 @@ def game_started(self, current_game, contextHistory, logger):
                             if not random_race_intel:
                                 result = None
                         else:
-                            result = self.db.check_player_and_race_exists(
-                                player_name, player_current_race
-                            )
+                            with span("pregame.player_lookup"):
+                                result = self.db.check_player_and_race_exists(
+                                    player_name, player_current_race
+                                )
                         logger.debug(f"Result for player check: {result}")
 
                         if result is not None:
@@ -194,7 +196,8 @@ def game_started(self, current_game, contextHistory, logger):
                                         f"resolved ladder id {canonical_opp} for {original_opp} (random intel)"
                                     )
 
-                                raw_records = self.db.get_player_records(canonical_opp)
+                                with span("pregame.records"):
+                                    raw_records = self.db.get_player_records(canonical_opp)
                                 logger.debug(f"[RECORD DEBUG] Raw records for {canonical_opp}: {raw_records}")
 
                                 record_vs = parse_streamer_record_vs_opponent(raw_records)
@@ -262,7 +265,8 @@ def game_started(self, current_game, contextHistory, logger):
                                 if not_alias is not None:
                                     logger.debug(f"found alias: {not_alias} for {original_opp}")
 
-                                raw_records = self.db.get_player_records(canonical_opp)
+                                with span("pregame.records"):
+                                    raw_records = self.db.get_player_records(canonical_opp)
                                 logger.debug(f"[RECORD DEBUG] Raw records for {canonical_opp}: {raw_records}")
 
                                 record_vs = parse_streamer_record_vs_opponent(raw_records)
@@ -270,9 +274,10 @@ def game_started(self, current_game, contextHistory, logger):
 
                                 player_record = "past results:\n" + '\n'.join(raw_records)
 
-                                first_few_build_steps = self.db.extract_opponent_build_order(
-                                    canonical_opp, player_current_race, streamer_current_race
-                                )
+                                with span("pregame.build_order"):
+                                    first_few_build_steps = self.db.extract_opponent_build_order(
+                                        canonical_opp, player_current_race, streamer_current_race
+                                    )
 
                                 if canonical_opp != original_opp:
                                     if result.get('Replay_Summary') is not None:
@@ -316,7 +321,8 @@ def game_started(self, current_game, contextHistory, logger):
                                     )
 
                                 # Comments keyed by SC2_UserId: canonical name, else other player on this row.
-                                player_comments = self.db.get_player_comments(player_name, player_current_race)
+                                with span("pregame.comments"):
+                                    player_comments = self.db.get_player_comments(player_name, player_current_race)
                                 if not player_comments:
                                     p1n = str(result.get("Player1_Name", ""))
                                     p2n = str(result.get("Player2_Name", ""))
@@ -357,7 +363,8 @@ def game_started(self, current_game, contextHistory, logger):
                                     logger,
                                 ),
                             )
-                            run_known_opponent_pregame(self, brief, logger, contextHistory, current_map)
+                            with span("pregame.known_opponent"):
+                                run_known_opponent_pregame(self, brief, logger, contextHistory, current_map)
                             
                         else:
                             # DB row missing can still mean we've seen them in pattern-learning file or loose records;
@@ -4,7 +4,7 @@ import time
 import utils.tokensArray as tokensArray
 from utils.file_utils import find_latest_file
 from utils.file_utils import find_recent_file_within_time
-import spawningtool.parser
+from core import replay_parser_pool
 from api.game_event_utils import game_started_handler
 from api.game_event_utils import game_replay_handler
 from api.game_event_utils import game_ended_handler
@@ -253,7 +253,7 @@ def handle_SC2_game_results(self, previous_game, current_game, contextHistory, l
 
             # capture error so it does not run another processSC2game
             try:
-                replay_data = spawningtool.parser.parse_replay(result)
+                replay_data = replay_parser_pool.parse_replay(result)
                 consecutive_parse_failures = 0
             except Exception as e:
                 consecutive_parse_failures += 1
@@ -1,21 +1,275 @@
-import sgreplay_pb2
-import google.protobuf.message
-
-# Load the binary data
-path_to_your_file = r'C:\Users\karl_\AppData\Local\Stormgate\Saved\Replays\7a2ddb7b-4ad7-4274-96d2-0e2b5855f09c'
-header_size = 16  # Assuming the first 16 bytes are non-protobuf data
-
-# Then proceed with opening the file as before
-with open(path_to_your_file + r'\CL44821-2024.02.07-16.55.SGReplay', 'rb') as file:
-    file.seek(header_size)  # Skip the header
-    data = file.read()
-
-# Parse the data
-replay_data = sgreplay_pb2.ReplayStreamRecordHeader()
-try:
-    replay_data.ParseFromString(data)
-except google.protobuf.message.DecodeError:
-    print("Error: Unable to parse the data. Please ensure the data matches the protobuf message definition.")
-
-# Access and work with the parsed data
-print(replay_data)
\ No newline at end of file
+"""Streaming reader for Stormgate .SGReplay files.
+
+Layout: a 16-byte header (little-endian u32s: magic, unknown, build number,
+unknown) followed by a gzip stream (raw frames are accepted too). The payload is
+a sequence of varint length-delimited ``ReplayStreamRecordHeader`` messages
+(timestamp, player id, and the ``ReplayStreamRecord`` oneof).
+
+The file is memory-mapped and decompressed incrementally, and frames are yielded
+lazily, so long replays are read in constant memory. Type filters peek at the
+protobuf wire format to find the record kind and only fully decode matching
+frames (fast-forward past command spam when you only want chat or joins).
+
+``summarize_replay`` produces a spawningtool-shaped dict, and
+``build_replay_summary`` the same text GameSummarizer feeds to insert_replay_info.
+"""
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from api import sgreplay_pb2
+
+HEADER_SIZE = 16
+_HEADER = struct.Struct("<4I")
+_GZIP_MAGIC = b"\x1f\x8b"
+_CHUNK_SIZE = 64 * 1024
+
+# Record timestamps are game time in 1/1024 s (community reverse-engineering).
+TIMESTAMP_UNITS_PER_SECOND = 1024
+
+RECORD_CHAT = "ChatRecord"
+RECORD_MAP_DETAILS = "MapDetailsRecord"
+RECORD_PLAYER_COMMAND = "PlayerCommandRecord"
+RECORD_PLAYER_DETAILS = "PlayerDetailsRecord"
+RECORD_END_OF_REPLAY = "EndOfReplayRecord"
+
+_RECORD_NUMBERS = {f.name: f.number for f in sgreplay_pb2.ReplayStreamRecord.DESCRIPTOR.fields}
+_RECORD_NAMES = {number: name for name, number in _RECORD_NUMBERS.items()}
+
+_FILENAME_TIMESTAMP = re.compile(r"(\d{4})\.(\d{2})\.(\d{2})-(\d{2})\.(\d{2})")
+
+
+class SGReplayError(Exception):
+    """Raised when a file is not a readable Stormgate replay."""
+
+
+def _read_varint(buf, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(buf):
+            raise IndexError("truncated varint")
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+        if shift > 63:
+            raise SGReplayError("malformed varint")
+
+
+def _skip_field(buf, pos: int, wire_type: int) -> int:
+    if wire_type == 0:
+        return _read_varint(buf, pos)[1]
+    if wire_type == 1:
+        return pos + 8
+    if wire_type == 2:
+        length, pos = _read_varint(buf, pos)
+        return pos + length
+    if wire_type == 5:
+        return pos + 4
+    raise SGReplayError(f"unsupported wire type {wire_type}")
+
+
+def _find_submessage(buf, start: int, end: int, field_number: int) -> Optional[Tuple[int, int]]:
+    pos = start
+    while pos < end:
+        tag, pos = _read_varint(buf, pos)
+        number, wire_type = tag >> 3, tag & 7
+        if number == field_number and wire_type == 2:
+            length, pos = _read_varint(buf, pos)
+            return pos, pos + length
+        pos = _skip_field(buf, pos, wire_type)
+    return None
+
+
+def peek_frame(frame: bytes) -> Tuple[int, Optional[str]]:
+    """(timestamp, record type name) of a frame without decoding the record body."""
+    timestamp = 0
+    pos, end = 0, len(frame)
+    data_span = None
+    while pos < end:
+        tag, pos = _read_varint(frame, pos)
+        number, wire_type = tag >> 3, tag & 7
+        if number == 1 and wire_type == 0:
+            timestamp, pos = _read_varint(frame, pos)
+        elif number == 3 and wire_type == 2:
+            length, pos = _read_varint(frame, pos)
+            data_span = (pos, pos + length)
+            pos += length
+        else:
+            pos = _skip_field(frame, pos, wire_type)
+    if data_span is None:
+        return timestamp, None
+    record_span = _find_submessage(frame, data_span[0], data_span[1], 1)
+    if record_span is None or record_span[0] >= record_span[1]:
+        return timestamp, None
+    tag, _ = _read_varint(frame, record_span[0])
+    return timestamp, _RECORD_NAMES.get(tag >> 3)
+
+
+class SGReplayReader:
+    """Lazily iterates the records of one .SGReplay file. Use as a context manager."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._mm = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self) -> None:
+        if self._mm is not None:
+            return
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER_SIZE:
+            self.close()
+            raise SGReplayError(f"File too small to be a Stormgate replay: {self.path}")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def header(self) -> Dict[str, int]:
+        self.open()
+        magic, unknown1, build, unknown2 = _HEADER.unpack_from(self._mm, 0)
+        return {"magic": magic, "build": build, "unknown1": unknown1, "unknown2": unknown2}
+
+    def _payload_chunks(self) -> Iterator[bytes]:
+        self.open()
+        mm = self._mm
+        if mm[HEADER_SIZE:HEADER_SIZE + 2] == _GZIP_MAGIC:
+            inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            for offset in range(HEADER_SIZE, len(mm), _CHUNK_SIZE):
+                out = inflater.decompress(mm[offset:offset + _CHUNK_SIZE])
+                if out:
+                    yield out
+            tail = inflater.flush()
+            if tail:
+                yield tail
+        else:
+            for offset in range(HEADER_SIZE, len(mm), _CHUNK_SIZE):
+                yield mm[offset:offset + _CHUNK_SIZE]
+
+    def frames(self) -> Iterator[bytes]:
+        """Raw length-delimited frames, decoded incrementally from the payload stream."""
+        buf = bytearray()
+        pos = 0
+        for chunk in self._payload_chunks():
+            buf += chunk
+            while True:
+                try:
+                    length, body = _read_varint(buf, pos)
+                except IndexError:
+                    break
+                if body + length > len(buf):
+                    break
+                yield bytes(buf[body:body + length])
+                pos = body + length
+            del buf[:pos]
+            pos = 0
+        if buf:
+            raise SGReplayError(f"Trailing {len(buf)} bytes after last record in {self.path}")
+
+    def records(self, types: Optional[Iterable[str]] = None) -> Iterator[sgreplay_pb2.ReplayStreamRecordHeader]:
+        """Decoded ``ReplayStreamRecordHeader`` messages, optionally only of the given record types."""
+        wanted = set(types) if types else None
+        for frame in self.frames():
+            if wanted is not None and peek_frame(frame)[1] not in wanted:
+                continue
+            message = sgreplay_pb2.ReplayStreamRecordHeader()
+            message.ParseFromString(frame)
+            yield message
+
+    def chat(self) -> Iterator[sgreplay_pb2.ReplayStreamRecordHeader]:
+        return self.records([RECORD_CHAT])
+
+    def player_joins(self) -> Iterator[sgreplay_pb2.ReplayStreamRecordHeader]:
+        return self.records([RECORD_PLAYER_DETAILS])
+
+    def commands(self) -> Iterator[sgreplay_pb2.ReplayStreamRecordHeader]:
+        return self.records([RECORD_PLAYER_COMMAND])
+
+
+def _unix_timestamp(path: str) -> int:
+    match = _FILENAME_TIMESTAMP.search(os.path.basename(path))
+    if match:
+        try:
+            return int(datetime(*(int(g) for g in match.groups())).timestamp())
+        except ValueError:
+            pass
+    return int(os.path.getmtime(path))
+
+
+def summarize_replay(path: str) -> dict:
+    """One streaming pass over the replay; returns a spawningtool-shaped replay_data dict.
+
+    Stormgate replays do not record faction or result in the stream we decode, so
+    races are 'Unknown' and no player is marked as winner.
+    """
+    players: Dict[int, dict] = {}
+    map_name = "Unknown"
+    last_timestamp = 0
+    with SGReplayReader(path) as reader:
+        build = reader.header()["build"]
+        for frame in reader.frames():
+            timestamp, kind = peek_frame(frame)
+            last_timestamp = max(last_timestamp, timestamp)
+            if kind not in (RECORD_MAP_DETAILS, RECORD_PLAYER_DETAILS):
+                continue
+            message = sgreplay_pb2.ReplayStreamRecordHeader()
+            message.ParseFromString(frame)
+            record = message.Data.Record
+            if kind == RECORD_MAP_DETAILS:
+                map_name = record.MapDetailsRecord.MapName or record.MapDetailsRecord.MapFolder or map_name
+            else:
+                details = record.PlayerDetailsRecord
+                key = message.PlayerId or details.PlayerIndex or len(players) + 1
+                players[key] = {
+                    "name": details.PlayerIdentifier.Name or f"Player {key}",
+                    "race": "Unknown",
+                    "is_winner": False,
+                    "buildOrder": [],
+                    "unitsLost": [],
+                }
+
+    return {
+        "players": players,
+        "map": map_name,
+        "region": "Unknown",
+        "game_type": f"{len(players) // 2}v{len(players) // 2}" if len(players) % 2 == 0 and players else "Unknown",
+        "unix_timestamp": _unix_timestamp(path),
+        "frames": last_timestamp,
+        "frames_per_second": TIMESTAMP_UNITS_PER_SECOND,
+        "build": build,
+    }
+
+
+def build_replay_summary(path: str, winning_players: str = "Unknown", losing_players: str = "Unknown") -> str:
+    """Legacy summary text (as consumed by insert_replay_info) for a Stormgate replay."""
+    from core.game_summarizer import GameSummarizer
+    return GameSummarizer.generate_summary(summarize_replay(path), winning_players, losing_players)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python -m api.stormgate <file.SGReplay>")
+        sys.exit(1)
+    print(build_replay_summary(sys.argv[1]))
@@ -1,18 +1,16 @@
 import pyttsx3
 import logging
-import time
 from settings import config
+from core.tts_worker import PhraseAudioCache, TTSWorker
 
 logging.basicConfig(level=logging.INFO)
 logging.getLogger('comtypes').setLevel(logging.INFO)
 
-def speak_text(text, mode=1):
-    # Initialize the converter
-    converter = pyttsx3.init()
 
+def _configure_voice(converter, mode):
     # Get volume from config (default to 0.7 if not set)
     volume = getattr(config, 'SOUND_VOLUME', 0.7)
-    
+
     # Set properties based on the mode
     if mode == 1:
         # Normal voice
@@ -28,23 +26,25 @@ def speak_text(text, mode=1):
         converter.setProperty('voice', voices[1].id)  # Change the index for a different voice
     # Add more elif blocks for other modes
 
-    # wait for intro sound to finish
-    time.sleep(config.MONITOR_GAME_SLEEP_SECONDS)
 
-    # Say the text
-    converter.say(text)
+# One engine for the whole process, created on the worker thread at import so the first line starts right away
+_worker = TTSWorker(pyttsx3.init, _configure_voice, phrase_cache=PhraseAudioCache())
+_worker.start()
+
 
-    # Wait for the speech to finish
-    converter.runAndWait()
+def speak_text(text, mode=1, wait=False):
+    # Queue the line for the TTS worker; wait=True blocks until it has been spoken
+    return _worker.speak(text, mode=mode, wait=wait)
 
 # You can add more functions or modify this one for additional features
 # USAGE:
 '''
     #if same directory as this file, which is /api
-    from .text2speech import speak_text 
+    from .text2speech import speak_text
 
     # Using the function with different modes
                 speak_text("is StarCraft 2 on?", mode=1)
                 speak_text("is StarCraft 2 on?", mode=2)
+                speak_text("yes?", wait=True)  # returns after the line has been spoken
                 # Add more calls with different modes as you define them
 '''
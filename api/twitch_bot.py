@@ -101,6 +101,8 @@ from api.game_event_utils import game_replay_handler
 from api.game_event_utils import game_ended_handler
 from api.chat_utils import message_on_welcome, process_pubmsg
 from api.sc2_game_utils import handle_SC2_game_results
+from core.command_service import CommandMatcher
+from core.outbound_chat import OutboundChatQueue
 # Ensure database initialization
 from models.mathison_db import Database
 from adapters.database.database_client_factory import create_database_client
@@ -126,6 +128,16 @@ except ImportError as e:
 # Build preview constants for Twitch chat messages
 BUILD_PREVIEW_ITEMS = 12  # Number of build order items to show in chat previews (workers filtered after first 2)
 
+# Commands handled ONLY by BotCore's CommandService; on_pubmsg skips legacy processing
+# for any line mentioning one (compiled once, matched in a single regex search)
+_MIGRATED_COMMANDS = CommandMatcher([
+    'wiki', 'career', 'history', 'head to head',
+    'player comment', 'analyze', 'fsl_review',
+    'please retry', 'please replay', 'please preview', 'please review', 'please perf',
+    'accept ratings', 'open ratings', 'start ratings',
+    'end ratings', 'close ratings', '!ratings',
+])
+
 # Short follow-ups asking for the streamer's label (varied so chat/logs aren't identical).
 # Omit "player comment …" — that command is documented elsewhere; repeating it reads like spam next to freeform replies.
 _PATTERN_LEARNING_FOLLOWUP_VARIANTS = (
@@ -257,8 +269,8 @@ def compose_strategy_line(opponent_name: str, strategy_label: str, versus_name:
 
 # The contextHistory array is a list of tuples, where each tuple contains two elements: the message string and its
 # corresponding token size. This allows us to keep track of both the message content and its size in the array. When
-# a new message is added to the contextHistory array, its token size is determined using the nltk.word_tokenize()
-# function. If the total number of tokens in the array exceeds the maxContextTokens threshold, the function starts
+# a new message is added to the contextHistory array, its token size is determined using the configured tokenizer
+# (tokensArray.ContextHistory keeps a running total, so this does not re-sum the history). If the total number of tokens in the array exceeds the maxContextTokens threshold, the function starts
 # deleting items from the end of the array until the total number of tokens is below the threshold. If the last item
 # in the array has a token size less than or equal to the maxContextTokens threshold, the item is removed completely.
 # However, if the last item has a token size greater than the threshold, the function removes tokens from the end of
@@ -269,7 +281,7 @@ def compose_strategy_line(opponent_name: str, strategy_label: str, versus_name:
 # array always contains a maximum number of tokens specified by maxContextTokens, while keeping the most recent
 # messages in the array.
 global contextHistory
-contextHistory = []
+contextHistory = tokensArray.ContextHistory()
 
 
 # Initialize the logger at the beginning of the script
@@ -494,15 +506,29 @@ class TwitchBot(irc.bot.SingleServerIRCBot):
 
         self.fsl_voting_session = None
 
+        # All outbound chat goes through one rate-limited, packing queue (started by run_core)
+        self.outbound = OutboundChatQueue(self._privmsg)
+
+    def _privmsg(self, channel: str, text: str) -> None:
+        self.connection.privmsg(channel, text)
+
+    def queue_chat(self, text: str, priority: bool = False, channel: str = None) -> None:
+        """Send a chat line through the outbound queue (safe from any thread)."""
+        outbound = getattr(self, "outbound", None)
+        if outbound is None:
+            self.connection.privmsg(channel or self.channel, text)
+            return
+        outbound.send(channel or self.channel, text, priority=priority)
+
     def send_channel_message_sync(self, text: str) -> None:
-        """IRC privmsg from a worker thread (e.g. FSL voting auto-submit)."""
+        """Chat line from a worker thread (e.g. FSL voting auto-submit)."""
         conn = getattr(self, "connection", None)
         if not conn:
             logger.warning("send_channel_message_sync: no IRC connection")
             return
         try:
             lim = getattr(config, "TWITCH_CHAT_BYTE_LIMIT", 450)
-            conn.privmsg(self.channel, text[:lim])
+            self.queue_chat(text[:lim])
         except Exception as e:
             logger.error(f"send_channel_message_sync failed: {e}")
 
@@ -539,7 +565,8 @@ class TwitchBot(irc.bot.SingleServerIRCBot):
             AUDIO_IMPORTS_AVAILABLE and 
             ts is not None):
             try:
-                ts.speak_text(text)
+                # Wait for the line: the speech listener records the answer right after a prompt
+                ts.speak_text(text, wait=True)
             except Exception as e:
                 logger.error(f"Error in text-to-speech: {e}")
         else:
@@ -1003,22 +1030,9 @@ class TwitchBot(irc.bot.SingleServerIRCBot):
             # Check if this is a command that should be handled ONLY by BotCore
             # This prevents double-processing for migrated commands
             msg_lower = msg.strip().lower()
-            migrated_commands = [
-                'wiki', 'career', 'history', 'head to head',
-                'player comment', 'analyze', 'fsl_review',
-                'please retry', 'please replay', 'please preview', 'please review',
-                'accept ratings', 'open ratings', 'start ratings',
-                'end ratings', 'close ratings', '!ratings',
-            ]
-            
-            # CommandService uses strict prefix matching usually, but legacy was loose.
-            # We'll check if it starts with any of these to be safe and prefer the new system.
-            # For 'player comment', we check both 'player comment' and 'player comments'
-            is_migrated = False
-            for cmd in migrated_commands:
-                if cmd in msg_lower:
-                    is_migrated = True
-                    break
+            # CommandService uses strict prefix matching, but legacy was loose: skip
+            # any line mentioning a migrated keyword to prefer the new system.
+            is_migrated = _MIGRATED_COMMANDS.mentions(msg_lower)
             
             # Also skip legacy processing for Y/N responses when pending_player_comment exists
             # CommandService will handle these via CommentHandler
@@ -1627,7 +1641,7 @@ Just the JSON object."""
                 }
                 self.suggested_pattern_comment = existing_replay_comment
                 self.suggested_ai_summary = None
-                self.connection.privmsg(self.channel, concise_msg)
+                self.queue_chat(concise_msg, priority=True)
                 logger.debug(f"Sent existing-comment concise line: {concise_msg}")
                 return
             
@@ -1852,7 +1866,7 @@ Just the JSON object."""
                                     msg2 = pick_pattern_learning_followup_prompt()
                                 msg2 = _ensure_followup_prompt(msg2, build_summary, ai_summary)
                                 combined = msg1 if not msg2 else compose_build_followup_line(opponent_name, msg1, msg2, versus_name)
-                                self.connection.privmsg(self.channel, combined)
+                                self.queue_chat(combined, priority=True)
                                 logger.debug(f"Sent pattern learning combined line: {combined}")
                             except Exception as e:
                                 logger.error(f"Error sending pattern match to Twitch chat: {e}")
@@ -1912,7 +1926,7 @@ Just the JSON object."""
                                     msg2 = pick_pattern_learning_followup_prompt()
                                 msg2 = _ensure_followup_prompt(msg2, build_summary, ai_summary)
                                 combined = msg1 if not msg2 else compose_build_followup_line(opponent_name, msg1, msg2, versus_name)
-                                self.connection.privmsg(self.channel, combined)
+                                self.queue_chat(combined, priority=True)
                                 logger.debug(f"Sent pattern learning combined line: {combined}")
                             except Exception as e:
                                 logger.error(f"Error sending pattern match to Twitch chat: {e}")
@@ -1960,7 +1974,7 @@ Just the JSON object."""
                             msg2 = "" if suppress_followup_prompt else pick_pattern_learning_followup_prompt()
                             msg2 = _ensure_followup_prompt(msg2, build_summary, ai_summary)
                             combined = msg1 if not msg2 else compose_build_followup_line(opponent_name, msg1, msg2, versus_name)
-                            self.connection.privmsg(self.channel, combined)
+                            self.queue_chat(combined, priority=True)
                             logger.debug(f"Sent no-pattern combined line: {combined}")
                         except Exception as e:
                             logger.error(f"Error sending pattern match to Twitch chat: {e}")
@@ -2000,7 +2014,7 @@ Just the JSON object."""
                         build_preview = f"{opponent_name}'s build: {', '.join(build_summary[:BUILD_PREVIEW_ITEMS])}. " if build_summary else ""
                         msg1 = build_preview.rstrip()
                         combined = msg1 if not follow_prompt else compose_build_followup_line(opponent_name, msg1, follow_prompt, versus_name)
-                        self.connection.privmsg(self.channel, clean_text_for_chat(combined))
+                        self.queue_chat(clean_text_for_chat(combined), priority=True)
                     except Exception as e:
                         logger.error(f"Error sending pattern match to Twitch chat: {e}")
                 logger.info(f"Sent pattern learning prompt to Twitch: {follow_prompt[:80]}...")
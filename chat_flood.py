@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Flood TwitchAdapter/BotCore with synthetic chat (mocked LLM, DB and IRC) and print throughput, queue growth and latency.
+Usage: python chat_flood.py [--rate N] [--duration S] [--mix chat=70,command=10,vote=15,mention=5]
+                            [--viewers N] [--llm-delay S] [--db-delay S] [--legacy-cost S] [--seed N] [--json]
+Example: python chat_flood.py --rate 50 --duration 20 --llm-delay 1.5 --legacy-cost 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from tests.perf.chat_load_generator import DEFAULT_MIX, ChatFloodGenerator, format_report, parse_mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure how the bot keeps up with a chat flood.")
+    parser.add_argument("--rate", type=float, default=20.0, help="chat lines per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of chat to send")
+    parser.add_argument("--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+                        help="weights per line kind (chat, command, vote, mention)")
+    parser.add_argument("--viewers", type=int, default=200, help="distinct chatters")
+    parser.add_argument("--llm-delay", type=float, default=0.5, help="simulated seconds per LLM completion")
+    parser.add_argument("--db-delay", type=float, default=0.02, help="simulated seconds per DB query")
+    parser.add_argument("--legacy-cost", type=float, default=0.0,
+                        help="seconds the legacy chat path blocks the IRC thread per line")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the line mix")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s:%(levelname)s:%(name)s: %(message)s")
+    generator = ChatFloodGenerator(rate=args.rate, duration=args.duration, mix=parse_mix(args.mix),
+                                   viewers=args.viewers, llm_delay=args.llm_delay, db_delay=args.db_delay,
+                                   legacy_cost=args.legacy_cost, seed=args.seed)
+    report = asyncio.run(generator.run())
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Serialize speech and wait for sounds that are actually playing.
+
+``speak_text`` used to sleep ``MONITOR_GAME_SLEEP_SECONDS`` before every line
+"to let the intro finish", whether or not anything was playing. The scheduler
+instead:
+
+- holds one lock around each spoken line, so two threads never drive the TTS
+  engine at once and lines come out one after another;
+- before speaking, waits only while a sound (player intro, victory/defeat
+  sound) is still playing on the pygame mixer, polling every
+  ``AUDIO_IDLE_POLL_SECONDS`` and giving up after ``AUDIO_MAX_WAIT_SECONDS``.
+
+When nothing is playing, speech starts immediately.
+"""
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from core.config_utils import cfg
+
+logger = logging.getLogger(__name__)
+
+
+def mixer_busy() -> bool:
+    """True while pygame's music channel (used by SoundPlayer) is playing; False if pygame is not in use."""
+    pygame = sys.modules.get("pygame")
+    if pygame is None:
+        return False
+    try:
+        return bool(pygame.mixer.get_init() and pygame.mixer.music.get_busy())
+    except Exception:
+        return False
+
+
+class AudioScheduler:
+    """One speaker at a time, starting as soon as any playing sound has finished."""
+
+    def __init__(self, is_busy: Optional[Callable[[], bool]] = None, poll_interval=None, max_wait=None):
+        self.is_busy = is_busy or mixer_busy
+        self.poll_interval = float(cfg(poll_interval, "AUDIO_IDLE_POLL_SECONDS", 0.1))
+        self.max_wait = float(cfg(max_wait, "AUDIO_MAX_WAIT_SECONDS", 15))
+        self._speech_lock = threading.Lock()
+
+    def wait_until_idle(self) -> float:
+        """Block while a sound is playing (at most ``max_wait``); returns the seconds waited."""
+        started = time.monotonic()
+        deadline = started + self.max_wait
+        while self.is_busy():
+            if time.monotonic() >= deadline:
+                logger.debug(f"Audio still playing after {self.max_wait}s, speaking anyway")
+                break
+            time.sleep(self.poll_interval)
+        return time.monotonic() - started
+
+    @contextmanager
+    def speaking(self):
+        """Hold the speech slot, after any playing sound has finished."""
+        with self._speech_lock:
+            self.wait_until_idle()
+            yield
+
+
+_scheduler = AudioScheduler()
+
+
+def get_audio_scheduler() -> AudioScheduler:
+    return _scheduler
@@ -1,13 +1,34 @@
 import asyncio
+import itertools
 import logging
-import queue
-from typing import Dict, List, Optional, Any
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Hashable, List, Optional, Any
+from core.executors import get_executor
+from core.instrumentation import span, traced
+from core.metrics import CHAT_MESSAGES_IN, EVENTS_PROCESSED
 from core.interfaces import IChatService, IGameStateProvider, ILanguageModel, IAudioService
 from core.events import BaseEvent, MessageEvent, GameStateEvent
+from core.event_lanes import (
+    EventLane, OVERFLOW_DROP_NON_COMMANDS, OVERFLOW_DROP_OLDEST, OVERFLOW_MERGE_DUPLICATES,
+)
 import settings.config as config
 
 logger = logging.getLogger(__name__)
 
+# Wakes the dispatcher so start() can return after stop()
+_STOP = object()
+
+
+@dataclass
+class _QueuedEvent:
+    event: BaseEvent
+    lane: EventLane
+    seq: int
+    enqueued_at: float
+
+
 class BotCore:
     def __init__(self, 
                  chat_services: List[IChatService],
@@ -23,7 +44,25 @@ class BotCore:
         self.command_service = command_service
         self.audio_service = audio_service
         self.fsl_ask_assistant = None  # optional FslAskAssistant set from run_core
-        self.event_queue = queue.Queue()
+        self.recorder = None  # optional EventRecorder (EVENT_RECORD_FILE) capturing the input stream
+        # Ingress queue; adapters on other threads are routed onto the loop in add_event
+        self.event_queue: asyncio.Queue = asyncio.Queue()
+        self.worker_count = max(1, int(getattr(config, "BOT_CORE_WORKERS", 4)))
+        # Game state always goes first; chat is bounded and never takes the last free worker
+        self.game_lane = EventLane("game", priority=0)
+        self.chat_lane = EventLane(
+            "chat", priority=1,
+            max_depth=int(getattr(config, "BOT_CORE_CHAT_QUEUE_MAX", 200)),
+            max_concurrency=max(1, self.worker_count - 1),
+            overflow_policy=getattr(config, "BOT_CORE_CHAT_OVERFLOW_POLICY", OVERFLOW_DROP_OLDEST),
+        )
+        self._lanes = [self.game_lane, self.chat_lane]
+        # Events waiting per ordering key; a key is present while any of its events is queued or running
+        self._pending: Dict[Hashable, Deque[_QueuedEvent]] = {}
+        self._running_keys = set()
+        self._work_available = asyncio.Event()
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self.running = False
         
         # Internal State
@@ -36,24 +75,153 @@ class BotCore:
             logger.warning("BotCore initialized WITHOUT AudioService")
         
     def add_event(self, event: BaseEvent):
-        """Add an event to the processing queue"""
-        self.event_queue.put(event)
+        """Add an event to the processing queue (safe to call from any thread)"""
+        if isinstance(event, MessageEvent):
+            CHAT_MESSAGES_IN.inc(platform=event.platform)
+        if self.recorder is not None:
+            self.recorder.record_event(event)
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            # Not started yet: queued events are picked up when start() runs
+            self.event_queue.put_nowait(event)
+            return
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if current is loop:
+            self.event_queue.put_nowait(event)
+        else:
+            loop.call_soon_threadsafe(self.event_queue.put_nowait, event)
+
+    @staticmethod
+    def _ordering_key(event: BaseEvent) -> Hashable:
+        """Events sharing a key run one at a time, in arrival order; different keys run concurrently."""
+        if isinstance(event, MessageEvent):
+            return ("message", event.platform, event.channel, (event.author or "").lower())
+        if isinstance(event, GameStateEvent):
+            return ("game",)
+        return (type(event).__name__,)
         
     async def start(self):
         """Start the bot processing loop"""
+        self._loop = asyncio.get_running_loop()
         self.running = True
-        logger.info("BotCore started")
-        while self.running:
+        workers = [
+            asyncio.create_task(self._worker(), name=f"botcore-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info(f"BotCore started ({self.worker_count} workers)")
+        try:
+            while self.running:
+                event = await self.event_queue.get()
+                if event is not _STOP:
+                    self._schedule(event)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def lane_stats(self) -> Dict[str, Dict[str, float]]:
+        """Depth, drops and queue wait per priority lane."""
+        return {lane.name: lane.stats() for lane in self._lanes}
+
+    def _lane_for(self, event: BaseEvent) -> EventLane:
+        return self.chat_lane if isinstance(event, MessageEvent) else self.game_lane
+
+    def _schedule(self, event: BaseEvent) -> None:
+        lane = self._lane_for(event)
+        if lane.full() and not self._make_room(lane, event):
+            return
+        key = self._ordering_key(event)
+        item = _QueuedEvent(event, lane, next(self._seq), time.monotonic())
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = deque([item])
+            lane.ready.append(key)
+        else:
+            # Key already queued or running; its worker takes this next
+            pending.append(item)
+        lane.enqueued()
+        self._work_available.set()
+
+    def _waiting(self, lane: EventLane):
+        """(key, item) for every not-yet-started event in a lane, oldest first."""
+        items = [(key, item) for key, pending in self._pending.items() for item in pending if item.lane is lane]
+        return sorted(items, key=lambda ki: ki[1].seq)
+
+    def _drop(self, key: Hashable, item: _QueuedEvent) -> None:
+        pending = self._pending[key]
+        pending.remove(item)
+        item.lane.depth -= 1
+        item.lane.dropped += 1
+        if not pending and key not in self._running_keys:
+            del self._pending[key]
+            item.lane.ready.remove(key)
+
+    def _make_room(self, lane: EventLane, event: BaseEvent) -> bool:
+        """Apply the lane's overflow policy; False means the incoming event is discarded."""
+        waiting = self._waiting(lane)
+        policy = lane.overflow_policy
+        if policy == OVERFLOW_MERGE_DUPLICATES and isinstance(event, MessageEvent):
+            text = (event.content or "").strip().lower()
+            for _key, item in waiting:
+                other = item.event
+                if (other.platform, other.channel, (other.content or "").strip().lower()) == (event.platform, event.channel, text):
+                    lane.merged += 1
+                    return False
+        elif policy == OVERFLOW_DROP_NON_COMMANDS:
+            if not self._is_command(event):
+                lane.dropped += 1
+                logger.debug(f"Chat lane full - dropped non-command from {getattr(event, 'author', '?')}")
+                return False
+            non_commands = [(k, i) for k, i in waiting if not self._is_command(i.event)]
+            waiting = non_commands or waiting
+        if waiting:
+            key, victim = waiting[0]
+            self._drop(key, victim)
+            logger.debug(f"Chat lane full - dropped oldest waiting event ({policy})")
+        return True
+
+    def _is_command(self, event: BaseEvent) -> bool:
+        if not isinstance(event, MessageEvent) or not self.command_service:
+            return False
+        try:
+            return self.command_service.is_command(event.content)
+        except Exception:
+            return False
+
+    def _next_ready(self) -> Optional[EventLane]:
+        for lane in self._lanes:
+            if lane.can_start():
+                return lane
+        return None
+
+    async def _worker(self):
+        while True:
+            lane = self._next_ready()
+            if lane is None:
+                self._work_available.clear()
+                await self._work_available.wait()
+                continue
+            key = lane.ready.popleft()
+            pending = self._pending[key]
+            item = pending.popleft()
+            lane.started(item.enqueued_at)
+            self._running_keys.add(key)
             try:
-                # Non-blocking get with timeout to allow checking self.running
-                try:
-                    event = self.event_queue.get_nowait()
-                    await self.process_event(event)
-                except queue.Empty:
-                    await asyncio.sleep(0.1)
+                await self.process_event(item.event)
             except Exception as e:
                 logger.error(f"Error in BotCore loop: {e}")
-                await asyncio.sleep(1)
+            finally:
+                lane.finished()
+                self._running_keys.discard(key)
+                # Re-queue behind other keys so one busy author can't starve the rest
+                if pending:
+                    lane.ready.append(key)
+                else:
+                    del self._pending[key]
+                self._work_available.set()
                 
     async def process_event(self, event: BaseEvent):
         """Process a single event"""
@@ -61,10 +229,14 @@ class BotCore:
         logger.info(f"Processing event: {event_type}")
         
         if isinstance(event, MessageEvent):
-            await self.handle_message(event)
+            EVENTS_PROCESSED.inc(type=f"{event.platform}_message")
+            with span(f"event.{event.platform}_message"):
+                await self.handle_message(event)
         elif isinstance(event, GameStateEvent):
             logger.info(f"GameStateEvent detected: {event.event_type}")
-            await self.handle_game_state(event)
+            EVENTS_PROCESSED.inc(type=event.event_type)
+            with span(f"event.{event.event_type}"):
+                await self.handle_game_state(event)
             
     async def handle_message(self, event: MessageEvent):
         # Ignore own messages
@@ -187,8 +359,8 @@ class BotCore:
                     ctx_hist = api.twitch_bot.contextHistory
                     
                     await loop.run_in_executor(
-                        None,
-                        game_started,
+                        get_executor("llm"),
+                        traced("pregame")(game_started),
                         twitch_service.twitch_bot, # self
                         game_info,                 # current_game
                         ctx_hist,                  # contextHistory
@@ -249,3 +421,6 @@ class BotCore:
     
     def stop(self):
         self.running = False
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self.event_queue.put_nowait, _STOP)
@@ -1,6 +1,9 @@
 import abc
 import logging
-from typing import List, Any, Dict, Optional
+import re
+from typing import Iterable, List, Any, Dict, Optional, Tuple
+
+from core.instrumentation import span
 
 logger = logging.getLogger(__name__)
 
@@ -19,15 +22,65 @@ class ICommandHandler(abc.ABC):
     async def handle(self, context: CommandContext, args: str):
         pass
 
+# Natural-language keywords that match anywhere in a line, not only as a prefix.
+# Keep this list short: a common word here would hijack normal chat.
+CONTAINS_KEYWORDS = ("head to head", "player comment")
+
+
+class CommandMatcher:
+    """
+    Keyword table compiled into regexes once, so matching a chat line costs the
+    same however many commands are registered.
+
+    match() applies the dispatch rules (optional '!' prefix, keyword alone or
+    followed by a space, CONTAINS_KEYWORDS anywhere; longest keyword wins).
+    mentions() is the loose "keyword appears anywhere" test.
+    """
+    def __init__(self, keywords: Iterable[str], contains_keywords: Iterable[str] = CONTAINS_KEYWORDS):
+        # Stable sort keeps registration order between keywords of equal length
+        self.keywords = sorted({k.lower(): None for k in keywords}, key=len, reverse=True)
+        self._contains = [k for k in self.keywords if k in {c.lower() for c in contains_keywords}]
+        alternation = "|".join(re.escape(k) for k in self.keywords)
+        if alternation:
+            # Longest-first alternation: the first alternative that matches is the longest keyword
+            self._prefix = re.compile(rf"!?({alternation})(?: (.*))?", re.IGNORECASE | re.DOTALL)
+            self._anywhere = re.compile(alternation, re.IGNORECASE)
+        else:
+            self._prefix = self._anywhere = None
+        self._rank = {k: i for i, k in enumerate(self.keywords)}
+
+    def match(self, text: str) -> Optional[Tuple[str, str]]:
+        """(keyword, args) for a stripped line, or None."""
+        if self._prefix is None:
+            return None
+        best = None
+        m = self._prefix.fullmatch(text)
+        if m:
+            best = (m.group(1).lower(), (m.group(2) or "").strip())
+        msg_lower = text.lower()
+        for keyword in self._contains:
+            if best and self._rank[keyword] >= self._rank[best[0]]:
+                break
+            if keyword in msg_lower:
+                return keyword, text  # stripped; handler may need full line — rarely differs
+        return best
+
+    def mentions(self, text: str) -> bool:
+        """True if any keyword appears anywhere in text."""
+        return self._anywhere is not None and self._anywhere.search(text) is not None
+
+
 class CommandService:
     """Service for parsing and dispatching chat commands"""
     def __init__(self, chat_services: List[Any]):
         self.chat_services = chat_services
         self.handlers: Dict[str, ICommandHandler] = {}
+        self.matcher = CommandMatcher([])
         
     def register_handler(self, keyword: str, handler: ICommandHandler):
         """Register a handler for a command keyword (case-insensitive)"""
         self.handlers[keyword.lower()] = handler
+        self.matcher = CommandMatcher(self.handlers)
         logger.info(f"Registered command handler: '{keyword.lower()}'")
         
     async def handle_message(self, message: str, channel: str, author: str, platform: str) -> bool:
@@ -60,56 +113,36 @@ class CommandService:
         # Strip so Twitch leading spaces / odd padding still match (!wiki, accept ratings, etc.)
         text = message.strip()
         msg_lower = text.lower()
-        logger.debug(f"Checking command for: '{msg_lower}' (registered: {list(self.handlers.keys())})")
+        logger.debug("Checking command for: %r", msg_lower)
         
-        # Sort handlers by length (descending) to match longest prefix first
-        # IMPORTANT: Use strict matching for multi-word commands to avoid partial matches in normal sentences
-        sorted_keys = sorted(self.handlers.keys(), key=len, reverse=True)
-        
-        for keyword in sorted_keys:
-            is_match = False
-            args = ""
+        match = self.match_command(text)
+        if match:
+            keyword, args = match
+            logger.info(f"Command match: '{keyword}' from {author}")
+            
+            # Find the correct chat service for this platform
+            service = self._get_chat_service(platform)
+            
+            context = CommandContext(message, channel, author, platform, service)
             
-            # 1. Exact match
-            if msg_lower == keyword:
-                is_match = True
-                args = ""
-            # 2. Exact match with prefix
-            elif msg_lower == "!" + keyword:
-                is_match = True
-                args = ""
-            # 3. Starts with keyword followed by space (standard command)
-            elif msg_lower.startswith(keyword + " "):
-                is_match = True
-                args = text[len(keyword):].strip()
-            # 4. Starts with prefix followed by space
-            elif msg_lower.startswith("!" + keyword + " "):
-                is_match = True
-                args = text[len("!") + len(keyword):].strip()
-            # 5. Contains keyword for special natural language commands (like "player comment")
-            #    BUT be careful not to over-match common words.
-            #    "head to head" is safe to search anywhere.
-            elif keyword in ["head to head", "player comment"] and keyword in msg_lower:
-                is_match = True
-                args = text  # stripped; handler may need full line — rarely differs
-                
-            if is_match:
-                logger.info(f"Command match: '{keyword}' from {author}")
-                
-                # Find the correct chat service for this platform
-                service = self._get_chat_service(platform)
-                
-                context = CommandContext(message, channel, author, platform, service)
-                
-                try:
+            try:
+                with span(f"command.{keyword}"):
                     await self.handlers[keyword].handle(context, args)
-                    return True
-                except Exception as e:
-                    logger.error(f"Error handling command '{keyword}': {e}")
-                    return True # Still return True because we matched a command intent
+                return True
+            except Exception as e:
+                logger.error(f"Error handling command '{keyword}': {e}")
+                return True # Still return True because we matched a command intent
                     
         return False
 
+    def is_command(self, message: str) -> bool:
+        """True if the message would dispatch to a registered handler (ignores the Y/N comment prompt)."""
+        return bool(message) and self.match_command(message.strip()) is not None
+
+    def match_command(self, text: str) -> Optional[Tuple[str, str]]:
+        """(keyword, args) for the handler a stripped message matches, or None."""
+        return self.matcher.match(text)
+
     def _get_chat_service(self, platform: str) -> Optional[Any]:
         """Helper to find the right chat service"""
         if not self.chat_services:
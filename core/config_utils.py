@@ -0,0 +1,9 @@
+"""Helpers for reading settings.config."""
+from settings import config
+
+
+def cfg(explicit, key, default):
+    """``explicit`` if it was given (not None), else ``config.<key>``, else ``default``."""
+    if explicit is not None:
+        return explicit
+    return getattr(config, key, default)
@@ -0,0 +1,83 @@
+"""Priority lanes for BotCore's keyed event scheduler.
+
+Each lane holds the ordering keys that have work ready, plus counters for depth
+and queue wait so the stream can see where latency comes from. Lanes are served
+strictly in priority order, and a lane can cap how many of its keys run at once
+(the chat lane leaves a worker free so game-state events never wait behind
+slow LLM replies).
+
+Only the bounded chat lane applies an overflow policy:
+
+- ``drop_oldest``: discard the oldest waiting chat event
+- ``drop_non_commands``: discard the incoming line unless it is a command; a
+  command displaces the oldest waiting non-command (or the oldest event)
+- ``merge_duplicates``: an incoming line identical to one already waiting (same
+  channel, same text) is folded into it; otherwise drop the oldest
+"""
+import time
+from collections import deque
+from typing import Deque, Dict, Hashable
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NON_COMMANDS = "drop_non_commands"
+OVERFLOW_MERGE_DUPLICATES = "merge_duplicates"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NON_COMMANDS, OVERFLOW_MERGE_DUPLICATES)
+
+
+class EventLane:
+    """Ready keys of one priority class, with depth/wait accounting."""
+
+    def __init__(self, name: str, priority: int, max_depth: int = 0, max_concurrency: int = 0,
+                 overflow_policy: str = OVERFLOW_DROP_OLDEST):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow_policy}' (expected one of {OVERFLOW_POLICIES})")
+        self.name = name
+        self.priority = priority
+        self.max_depth = max_depth
+        self.max_concurrency = max_concurrency
+        self.overflow_policy = overflow_policy
+        self.ready: Deque[Hashable] = deque()
+        self.depth = 0
+        self.running = 0
+        self.peak_depth = 0
+        self.processed = 0
+        self.dropped = 0
+        self.merged = 0
+        self.last_wait = 0.0
+        self.max_wait = 0.0
+        self._wait_total = 0.0
+
+    def full(self) -> bool:
+        return self.max_depth > 0 and self.depth >= self.max_depth
+
+    def can_start(self) -> bool:
+        return bool(self.ready) and (self.max_concurrency <= 0 or self.running < self.max_concurrency)
+
+    def enqueued(self) -> None:
+        self.depth += 1
+        self.peak_depth = max(self.peak_depth, self.depth)
+
+    def started(self, enqueued_at: float) -> None:
+        wait = time.monotonic() - enqueued_at
+        self.depth -= 1
+        self.running += 1
+        self.processed += 1
+        self.last_wait = wait
+        self.max_wait = max(self.max_wait, wait)
+        self._wait_total += wait
+
+    def finished(self) -> None:
+        self.running -= 1
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "depth": self.depth,
+            "running": self.running,
+            "peak_depth": self.peak_depth,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "merged": self.merged,
+            "last_wait_ms": round(self.last_wait * 1000, 1),
+            "avg_wait_ms": round(self._wait_total / self.processed * 1000, 1) if self.processed else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+        }
@@ -0,0 +1,96 @@
+"""Record the bot's input stream so it can be replayed offline (see tests.perf.latency_harness).
+
+With ``EVENT_RECORD_FILE`` set, run_core attaches an ``EventRecorder`` to BotCore.
+It appends one JSON line per input with its offset in seconds from the start of
+the recording:
+
+- ``message``: a chat ``MessageEvent`` as it reached ``BotCore.add_event``
+- ``game_state``: a ``GameStateEvent`` as it reached ``BotCore.add_event``
+- ``sc2``: a raw SC2 client ``/game`` snapshot (``isReplay``, ``displayTime``,
+  ``players``) from every SC2Adapter poll
+
+Snapshots are what the replayer feeds back through SC2Adapter, so game-state
+detection is part of the measured path; the recorded ``game_state`` lines are
+kept for reference and for recordings made without SC2 polling.
+"""
+import json
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from core.events import BaseEvent, GameStateEvent, MessageEvent
+
+logger = logging.getLogger(__name__)
+
+KIND_MESSAGE = "message"
+KIND_GAME_STATE = "game_state"
+KIND_SC2 = "sc2"
+
+
+def snapshot_to_json(game_info) -> Optional[Dict]:
+    """The /game JSON a GameInfo was built from, or None for failed polls (timeouts, no client)."""
+    if game_info is None or not hasattr(game_info, 'players'):
+        return None
+    return {
+        'isReplay': getattr(game_info, 'isReplay', False),
+        'displayTime': getattr(game_info, 'displayTime', 0),
+        'players': game_info.players,
+    }
+
+
+class EventRecorder:
+    """Thread-safe JSON-lines writer for BotCore inputs and SC2 snapshots."""
+
+    def __init__(self, path: str, clock=time.monotonic):
+        self.path = path
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+        self.count = 0
+        logger.info(f"Recording bot input stream to {path}")
+
+    def _write(self, kind: str, data: Dict) -> None:
+        line = json.dumps({'t': round(self._clock() - self._started, 4), 'kind': kind, 'data': data},
+                          default=str)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.count += 1
+
+    def record_event(self, event: BaseEvent) -> None:
+        try:
+            if isinstance(event, MessageEvent):
+                self._write(KIND_MESSAGE, {'platform': event.platform, 'channel': event.channel,
+                                           'author': event.author, 'content': event.content})
+            elif isinstance(event, GameStateEvent):
+                self._write(KIND_GAME_STATE, {'event_type': event.event_type})
+        except Exception as e:
+            logger.debug(f"Event recording failed: {e}")
+
+    def record_sc2_snapshot(self, game_info) -> None:
+        snapshot = snapshot_to_json(game_info)
+        if snapshot is not None:
+            try:
+                self._write(KIND_SC2, snapshot)
+            except Exception as e:
+                logger.debug(f"SC2 snapshot recording failed: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def load_recording(path: str) -> List[Dict]:
+    """Records of a recording file, in time order."""
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+    records.sort(key=lambda r: r['t'])
+    return records
@@ -0,0 +1,131 @@
+"""Named, bounded thread pools for blocking work called from the asyncio loop.
+
+Everything used to go through ``loop.run_in_executor(None, ...)`` and share the
+default executor, so a burst of slow OpenAI calls could hold every thread while
+the 5-second SC2 poll or a game-end replay parse waited in line. Each workload
+now gets its own pool:
+
+- ``db``: MySQL / API database calls (repositories, FSL queries, player comments)
+  and pattern-learner persistence
+- ``llm``: OpenAI completions and the legacy game start/end pipelines
+  (including preview's DB + LLM opponent analysis)
+- ``parse``: replay lookup and parsing
+- ``poll``: SC2 client and stream-production polling
+
+Chat sends, TTS / sound playback and wiki lookups are short or external and stay on
+the loop's default executor.
+
+Pool sizes come from ``EXECUTOR_<NAME>_WORKERS``. Each pool counts queued and
+running jobs and how long jobs waited for a thread (``executor_stats()``), so a
+saturated pool shows up in the numbers instead of as a late game-start.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from settings import config
+from core.metrics import EXECUTOR_JOB_SECONDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = {"db": 4, "llm": 4, "parse": 2, "poll": 2}
+
+
+class BoundedExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor with a fixed thread count and queue/wait accounting."""
+
+    def __init__(self, name: str, max_workers: int):
+        super().__init__(max_workers=max_workers, thread_name_prefix=f"exec-{name}")
+        self.name = name
+        self.max_workers = max_workers
+        self._stats_lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.last_wait = 0.0
+        self.max_wait = 0.0
+        self._wait_total = 0.0
+
+    def submit(self, fn, *args, **kwargs):
+        enqueued_at = time.monotonic()
+
+        def _timed():
+            started = time.monotonic()
+            wait = started - enqueued_at
+            with self._stats_lock:
+                self.queued -= 1
+                self.running += 1
+                self.last_wait = wait
+                self.max_wait = max(self.max_wait, wait)
+                self._wait_total += wait
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                with self._stats_lock:
+                    self.failed += 1
+                raise
+            finally:
+                with self._stats_lock:
+                    self.running -= 1
+                    self.completed += 1
+                EXECUTOR_JOB_SECONDS.observe(time.monotonic() - started, pool=self.name)
+
+        with self._stats_lock:
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            return super().submit(_timed)
+        except RuntimeError:
+            with self._stats_lock:
+                self.queued -= 1
+            raise
+
+    def stats(self) -> Dict[str, float]:
+        with self._stats_lock:
+            return {
+                "workers": self.max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "peak_queued": self.peak_queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "last_wait_ms": round(self.last_wait * 1000, 1),
+                "avg_wait_ms": round(self._wait_total / self.completed * 1000, 1) if self.completed else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 1),
+            }
+
+
+_executors: Dict[str, BoundedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """Shared pool for a workload, created on first use."""
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            workers = getattr(config, f"EXECUTOR_{name.upper()}_WORKERS", DEFAULT_WORKERS.get(name, 2))
+            executor = BoundedExecutor(name, max(1, int(workers)))
+            _executors[name] = executor
+            logger.info(f"Executor '{name}' started with {executor.max_workers} thread(s)")
+        return executor
+
+
+def executor_stats() -> Dict[str, Dict[str, float]]:
+    """Queue depth and wait times for every pool created so far."""
+    with _executors_lock:
+        executors = list(_executors.values())
+    return {executor.name: executor.stats() for executor in executors}
+
+
+def shutdown_executors(wait: bool = False) -> None:
+    """Stop all pools; queued jobs are cancelled, running ones finish in the background."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait, cancel_futures=True)
@@ -13,6 +13,7 @@ from typing import Any, Callable, Dict, Optional, Tuple
 
 import settings.config as config
 import utils.tokensArray as tokensArray
+from core.executors import get_executor
 from core.events import MessageEvent
 from core.interfaces import ILanguageModel
 
@@ -1028,7 +1029,7 @@ class FslAskAssistant:
         loop = asyncio.get_running_loop()
 
         async def call(fn: Callable, *a, **kw):
-            return await loop.run_in_executor(None, lambda: fn(*a, **kw))
+            return await loop.run_in_executor(get_executor("db"), lambda: fn(*a, **kw))
 
         action = (action or "none").strip().lower()
         p = params or {}
@@ -1160,7 +1161,7 @@ class FslAskAssistant:
                 else:
                     lim = min(150, max(5, int(p.get("limit", 25))))
                 data = await loop.run_in_executor(
-                    None,
+                    get_executor("db"),
                     lambda: db.fsl_matches(
                         season=sn,
                         player_name=pn,
@@ -1272,7 +1273,8 @@ class FslAskAssistant:
             "No emojis unless they appear in FACTS.\n\n"
             f"QUESTION: {question}\n\nFACTS:\n{facts}\n"
         )
-        out = await self._llm.generate_raw(prompt)
+        # The reply is a pure function of the question and FACTS, so repeats are served from the cache
+        out = await self._llm.generate_raw(prompt, cache="fsl_answer")
         out = (out or "").strip()
         out = re.sub(r"[\r\n]+", " ", out)
         return out if out else facts
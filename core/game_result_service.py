@@ -4,13 +4,19 @@ import os
 import json
 import time
 from typing import List, Optional, Any, Dict
+from core.executors import get_executor
+from core.instrumentation import span, traced
+from core.metrics import REPLAY_PARSE_SECONDS
+from core.outbound_chat import game_critical_chat
 from core.interfaces import IChatService, IReplayRepository
 from models.game_info import GameInfo
 from utils.file_utils import find_recent_file_within_time, find_latest_file
 from utils import tokensArray
 from settings import config
-import spawningtool.parser
+from core import replay_parser_pool
 from core.game_summarizer import GameSummarizer
+from core import replay_readiness
+from core.replay_readiness import ReplayReadinessDetector
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +102,8 @@ class GameResultService:
         # Replay paths that were locked at game end (file held open while viewing the replay).
         # Used to post a one-time "after replay viewing... retrying" notice when they finally process.
         self._locked_replays_awaiting = set()
+        # Replaces the fixed sleeps between the score screen and parsing.
+        self._readiness = ReplayReadinessDetector()
 
     def _is_file_unlocked(self, path: str) -> bool:
         """Best-effort check that the replay file exists and isn't held open by SC2."""
@@ -246,6 +254,8 @@ class GameResultService:
         logger.info(f"Pattern Learning: analyzing vs {opponent_name} ({opponent_race})")
         twitch_bot._display_pattern_validation(game_data, logger)
         
+    @game_critical_chat
+    @traced("game_end")
     async def process_game_end(
         self,
         game_info: GameInfo,
@@ -281,32 +291,15 @@ class GameResultService:
         # If replay_data is provided, skip file finding/parsing
         if not replay_data:
             # Normal flow: find and parse replay file
-            # Wait for SC2 to finish writing replay file
-            # Initial wait to give SC2 time to finish writing
+            # Watch for the new replay instead of sleeping a fixed amount first
             logger.info("Waiting for replay file...")
-            await asyncio.sleep(3)
-            
-            # Polling optimization: check every 1s for up to 15s
-            replay_path = None
-            
-            for _ in range(15):
-                await asyncio.sleep(1)
-                try:
-                    replay_path = await loop.run_in_executor(
-                        None, 
-                        self._find_replay_file, 
-                        config.REPLAYS_FOLDER
-                    )
-                    if replay_path and replay_path != self.last_processed_replay:
-                        logger.info(f"Replay file detected immediately: {replay_path}")
-                        break
-                except Exception as e:
-                    logger.debug(f"Replay search attempt failed: {e}")
-            
-            # Final check if loop finished without success
-            if not replay_path or replay_path == self.last_processed_replay:
-                 # Try one last time if polling didn't catch it
-                 pass # Logic flows to existing check below
+            with span("game_end.wait_replay"):
+                replay_path = await self._readiness.wait_for_new_replay(
+                    lambda: self._find_replay_file(config.REPLAYS_FOLDER),
+                    exclude=self.last_processed_replay,
+                )
+            if replay_path:
+                logger.info(f"Replay file detected: {replay_path}")
             
             # 1. Find Replay (Final Confirmation)
             if not replay_path:
@@ -321,16 +314,17 @@ class GameResultService:
                         # Normal operation - check last 2 mins
                         time_window = 2
                         
-                    replay_path = await loop.run_in_executor(
-                        None, 
-                        find_recent_file_within_time, # Use the imported function directly
-                        config.REPLAYS_FOLDER,
-                        config.REPLAYS_FILE_EXTENSION,
-                        time_window, # minutes
-                        0, # retries
-                        logger,
-                        self.last_processed_replay
-                    )
+                    with span("game_end.find_replay"):
+                        replay_path = await loop.run_in_executor(
+                            get_executor("parse"), 
+                            find_recent_file_within_time, # Use the imported function directly
+                            config.REPLAYS_FOLDER,
+                            config.REPLAYS_FILE_EXTENSION,
+                            time_window, # minutes
+                            0, # retries
+                            logger,
+                            self.last_processed_replay
+                        )
                 except Exception as e:
                     logger.error(f"Error finding replay file: {e}")
                     return
@@ -350,76 +344,36 @@ class GameResultService:
             logger.info(f"Found new replay: {replay_path}")
 
             # 2. Parse Replay
-            # Wait a bit for file to finish writing
-            await asyncio.sleep(3)
-            
-            # Validate file before parsing to avoid segfaults
-            if not os.path.exists(replay_path):
+            # Await the readiness event: size stable for the configured window and file openable.
+            # Validating before parsing also avoids segfaults on half-written files.
+            with span("game_end.replay_ready"):
+                readiness = await self._readiness.wait_until_ready(replay_path)
+            if readiness == replay_readiness.MISSING:
                 logger.error(f"Replay file does not exist: {replay_path}")
                 return
-            
-            # Check if file is locked (still being written by SC2)
-            # Retry with increasing delays to handle file sync delays
-            max_retries = 3
-            retry_delay = 3  # Start with 3 seconds
-            file_locked = True
-            
-            for attempt in range(max_retries):
-                try:
-                    # Check file size first (if file is locked, this might also fail)
-                    file_size = os.path.getsize(replay_path)
-                    if file_size == 0:
-                        logger.warning(f"Replay file is empty, waiting... ({attempt + 1}/{max_retries})")
-                        if attempt < max_retries - 1:
-                            await asyncio.sleep(retry_delay)
-                            continue
-                        else:
-                            logger.error(f"Replay file still empty after {max_retries} attempts: {replay_path}")
-                            return
-                    
-                    if file_size < 1000:  # SC2 replays are typically > 1KB
-                        logger.warning(f"Replay file suspiciously small ({file_size} bytes): {replay_path}")
-                    
-                    # Try to open file in append mode - if locked, this will fail
-                    with open(replay_path, 'a+b') as f:
-                        pass
-                    
-                    # File is accessible - check if size is stable (not still writing)
-                    await asyncio.sleep(1)
-                    new_size = os.path.getsize(replay_path)
-                    if new_size != file_size:
-                        logger.debug(f"File size changed ({file_size} -> {new_size}), still writing... ({attempt + 1}/{max_retries})")
-                        if attempt < max_retries - 1:
-                            await asyncio.sleep(retry_delay)
-                            continue
-                    
-                    # File is unlocked and size is stable
-                    file_locked = False
-                    logger.info(f"Replay file is ready: {replay_path} ({new_size} bytes)")
-                    break
-                    
-                except (IOError, OSError, PermissionError) as e:
-                    if attempt < max_retries - 1:
-                        logger.debug(f"Replay file locked, retrying in {retry_delay}s... ({attempt + 1}/{max_retries}): {replay_path}")
-                        await asyncio.sleep(retry_delay)
-                        retry_delay += 1  # Increase delay for each retry (3s, 4s, 5s, 6s, 7s)
-                    else:
-                        logger.error(f"Replay file still locked after {max_retries} attempts: {replay_path} - {e}")
-                        await self._handle_locked_replay(replay_path, game_info, skip_duplicate_check, defer_on_lock)
-                        return
-            
-            if file_locked:
+            if readiness == replay_readiness.EMPTY:
+                logger.error(f"Replay file still empty before deadline: {replay_path}")
+                return
+            if readiness != replay_readiness.READY:
                 logger.error(f"Cannot parse locked replay file: {replay_path}")
                 await self._handle_locked_replay(replay_path, game_info, skip_duplicate_check, defer_on_lock)
                 return
             
+            try:
+                file_size = os.path.getsize(replay_path)
+            except OSError:
+                file_size = 0
+            if file_size < 1000:  # SC2 replays are typically > 1KB
+                logger.warning(f"Replay file suspiciously small ({file_size} bytes): {replay_path}")
+            
             try:
                 logger.debug(f"Attempting to parse replay: {replay_path} ({file_size} bytes)")
-                replay_data = await loop.run_in_executor(
-                    None,
-                    self._parse_replay,
-                    replay_path
-                )
+                with span("game_end.parse"):
+                    replay_data = await loop.run_in_executor(
+                        get_executor("parse"),
+                        self._parse_replay,
+                        replay_path
+                    )
                 logger.debug(f"Successfully parsed replay: {replay_path}")
                 
                 # Save JSON file for potential retry (even if processing fails later)
@@ -453,12 +407,16 @@ class GameResultService:
         # Continue with processing (both normal and retry paths converge here)
         
         # 3. Save to DB
+        # Structured form of the summary (players, races, result, duration); the commentary step reads it
+        summary_data: Optional[Dict] = None
         try:
             # Generate summary string required by legacy DB schema
             winning_players = ', '.join(game_info.get_player_names(result_filter='Victory'))
             losing_players = ', '.join(game_info.get_player_names(result_filter='Defeat'))
             
-            summary = GameSummarizer.generate_summary(replay_data, winning_players, losing_players)
+            built = GameSummarizer.build(replay_data, winning_players, losing_players)
+            summary = built.text
+            summary_data = built.data
             
             # Save summary to file for retry capability (created after parsing, used if processing fails)
             try:
@@ -468,7 +426,8 @@ class GameResultService:
                 logger.warning(f"Failed to save replay summary file for retry: {e}")
             
             # Use Repository (handles executor/async)
-            await self.replay_repo.save_replay(summary)
+            with span("game_end.save"):
+                await self.replay_repo.save_replay(summary)
             logger.info("Saved replay summary to DB")
             
             # TODO: Insert individual player history (legacy does this too)
@@ -571,15 +530,16 @@ Generate ONE short message only, no explanation."""
                     twitch_bot.total_seconds = 0
                 
                 # Call legacy game_ended which has observer detection logic
-                msg = await loop.run_in_executor(
-                    None,
-                    game_ended,
-                    twitch_bot,
-                    game_player_names,
-                    winning_players,
-                    losing_players,
-                    logger
-                )
+                with span("game_end.announce"):
+                    msg = await loop.run_in_executor(
+                        get_executor("llm"),
+                        game_ended,
+                        twitch_bot,
+                        game_player_names,
+                        winning_players,
+                        losing_players,
+                        logger
+                    )
                 
                 # Send the properly formatted message
                 for service in self.chat_services:
@@ -613,10 +573,11 @@ Generate ONE short message only, no explanation."""
                 winning_players_str = winning_players if winning_players else "Unknown"
                 losing_players_str = losing_players if losing_players else "Unknown"
                 
-                # Get game duration from replay_summary (same calculation used in GameSummarizer)
-                duration_info = GameSummarizer.calculate_duration(replay_data)
-                duration_seconds = duration_info['totalSeconds']
-                duration_str = duration_info['gameDuration']
+                # Duration and players from the structured summary built for the DB save
+                if summary_data is None:
+                    summary_data = GameSummarizer.build(replay_data, winning_players, losing_players).data
+                duration_seconds = summary_data['duration_seconds']
+                duration_str = summary_data['duration']
                 
                 # Get twitch_bot early (needed for optional DB note + send path).
                 twitch_bot = None
@@ -628,15 +589,13 @@ Generate ONE short message only, no explanation."""
                 # Optional expert note (DB player comment) to fold into the single replay line.
                 opponent_note = ""
                 try:
-                    if twitch_bot and hasattr(twitch_bot, "db") and replay_data.get("players"):
-                        streamer_accounts = [n.lower() for n in getattr(config, "SC2_PLAYER_ACCOUNTS", [])]
+                    if twitch_bot and hasattr(twitch_bot, "db") and summary_data["players"]:
                         opp_name = None
                         opp_race = None
-                        for _k, p in replay_data.get("players", {}).items():
-                            n = str(p.get("name", ""))
-                            if n and n.lower() not in streamer_accounts:
-                                opp_name = n
-                                opp_race = p.get("race", "")
+                        for entry in summary_data["players"]:
+                            if entry["name"] and not entry["is_streamer"]:
+                                opp_name = str(entry["name"])
+                                opp_race = entry.get("race", "")
                                 break
                         if opp_name and opp_race:
                             rec = twitch_bot.db.check_player_and_race_exists(opp_name, opp_race)
@@ -668,11 +627,12 @@ Generate ONE short message only, no explanation."""
                     from api.chat_utils import send_prompt_to_openai, sanitize_retry_replay_commentary
                     
                     # Call OpenAI directly for concise response
-                    completion = await loop.run_in_executor(
-                        None,
-                        send_prompt_to_openai,
-                        concise_prompt
-                    )
+                    with span("game_end.commentary"):
+                        completion = await loop.run_in_executor(
+                            get_executor("llm"),
+                            send_prompt_to_openai,
+                            concise_prompt
+                        )
                     
                     if completion and completion.choices and completion.choices[0].message:
                         ai_commentary = completion.choices[0].message.content.strip()
@@ -761,7 +721,8 @@ Generate ONE short message only, no explanation."""
                 from core.strategy_summary_service import get_game_summary
                 
                 analyzer = get_ml_analyzer()
-                strategy_summary = get_game_summary(replay_data, analyzer)
+                with span("game_end.strategy"):
+                    strategy_summary = get_game_summary(replay_data, analyzer)
                 
                 if strategy_summary:
                     logger.info(f"Strategy Summary: {strategy_summary}")
@@ -967,7 +928,7 @@ Generate ONE short message only, no explanation."""
         """Retry by replay file recency; offset=0 latest, offset=3 means 3 games ago."""
         loop = asyncio.get_running_loop()
         try:
-            replay_path = await loop.run_in_executor(None, self._find_nth_latest_replay_file, offset)
+            replay_path = await loop.run_in_executor(get_executor("parse"), self._find_nth_latest_replay_file, offset)
         except Exception as e:
             logger.error(f"Error finding replay file for retry: {e}")
             return False
@@ -990,14 +951,18 @@ Generate ONE short message only, no explanation."""
             except Exception as e:
                 logger.warning(f"Could not check replay file timestamp: {e}")
         
-        # Parse replay to get GameInfo and replay_data
+        # One full parse in the parser pool: an unreadable replay fails there (timeout, memory cap and
+        # crash isolation included) with ReplayParseError, and GameInfo is built from the same result.
         try:
             logger.info(f"Parsing replay for retry: {replay_path}")
-            replay_data = await loop.run_in_executor(None, self._parse_replay, replay_path)
+            replay_data = await loop.run_in_executor(get_executor("parse"), self._parse_replay, replay_path)
             
             if not replay_data:
                 logger.error("Failed to parse replay - replay_data is None")
                 return False
+            if not replay_data.get('players'):
+                logger.error("Retry replay has no players - not processing")
+                return False
             
             logger.info(f"Successfully parsed replay, got {len(replay_data.get('players', {}))} players")
             
@@ -1525,11 +1490,13 @@ Generate ONE short message only, no explanation."""
         is_too_short = game_duration_seconds < 60
         
         # Save to DB
+        summary_data: Optional[Dict] = None
         try:
             winning_players = ', '.join(game_info.get_player_names(result_filter='Victory'))
             losing_players = ', '.join(game_info.get_player_names(result_filter='Defeat'))
-            summary = GameSummarizer.generate_summary(replay_data, winning_players, losing_players)
-            await self.replay_repo.save_replay(summary)
+            built = GameSummarizer.build(replay_data, winning_players, losing_players)
+            summary_data = built.data
+            await self.replay_repo.save_replay(built.text)
             logger.info("Saved replay summary to DB")
         except Exception as e:
             logger.error(f"Error saving to DB: {e}")
@@ -1606,7 +1573,7 @@ Generate ONE short message only, no explanation."""
                     twitch_bot.total_seconds = 0
                 
                 msg = await loop.run_in_executor(
-                    None,
+                    get_executor("llm"),
                     game_ended,
                     twitch_bot,
                     game_player_names,
@@ -1630,23 +1597,22 @@ Generate ONE short message only, no explanation."""
                 winning_players = ', '.join(game_info.get_player_names(result_filter='Victory'))
                 losing_players = ', '.join(game_info.get_player_names(result_filter='Defeat'))
                 
-                frames = replay_data.get('frames', 0)
-                fps = replay_data.get('frames_per_second', 22.4)
-                duration_seconds = frames / fps if fps > 0 else 0
-                duration_str = f"{int(duration_seconds // 60)}m {int(duration_seconds % 60)}s"
+                # Duration and players from the structured summary built for the DB save
+                if summary_data is None:
+                    summary_data = GameSummarizer.build(replay_data, winning_players, losing_players).data
+                duration_seconds = summary_data['duration_seconds']
+                duration_str = summary_data['duration']
                 
                 # Optional expert note (DB player comment) to fold into the single replay line.
                 opponent_note = ""
                 try:
-                    if twitch_bot and hasattr(twitch_bot, "db") and replay_data.get("players"):
-                        streamer_accounts = [n.lower() for n in getattr(config, "SC2_PLAYER_ACCOUNTS", [])]
+                    if twitch_bot and hasattr(twitch_bot, "db") and summary_data["players"]:
                         opp_name = None
                         opp_race = None
-                        for _k, p in replay_data.get("players", {}).items():
-                            n = str(p.get("name", ""))
-                            if n and n.lower() not in streamer_accounts:
-                                opp_name = n
-                                opp_race = p.get("race", "")
+                        for entry in summary_data["players"]:
+                            if entry["name"] and not entry["is_streamer"]:
+                                opp_name = str(entry["name"])
+                                opp_race = entry.get("race", "")
                                 break
                         if opp_name and opp_race:
                             rec = twitch_bot.db.check_player_and_race_exists(opp_name, opp_race)
@@ -1680,7 +1646,7 @@ Generate ONE short message only, no explanation."""
                 
                 if twitch_bot:
                     from api.chat_utils import send_prompt_to_openai, sanitize_retry_replay_commentary
-                    completion = await loop.run_in_executor(None, send_prompt_to_openai, concise_prompt)
+                    completion = await loop.run_in_executor(get_executor("llm"), send_prompt_to_openai, concise_prompt)
                     
                     if completion and completion.choices and completion.choices[0].message:
                         ai_commentary = completion.choices[0].message.content.strip()
@@ -1788,10 +1754,12 @@ Generate ONE short message only, no explanation."""
             self.last_processed_replay
         )
         
+    @REPLAY_PARSE_SECONDS.time()
     def _parse_replay(self, path):
         """
         Parse SC2 replay file using spawningtool.
-        Wrapped in try/except to catch any exceptions, though segfaults will still crash.
+        Runs in the isolated parser worker pool (REPLAY_PARSER_WORKERS > 0), so a
+        segfault or hang on a corrupt file kills a worker instead of the bot.
         """
         try:
             # Additional validation before calling native library
@@ -1801,8 +1769,7 @@ Generate ONE short message only, no explanation."""
             if not os.access(path, os.R_OK):
                 raise PermissionError(f"Cannot read replay file: {path}")
             
-            # Call the parser (this may segfault on corrupted files)
-            return spawningtool.parser.parse_replay(path)
+            return replay_parser_pool.parse_replay(path)
         except Exception as e:
             logger.error(f"Exception in _parse_replay for {path}: {e}")
             raise
@@ -1,111 +1,122 @@
-from collections import defaultdict
+from collections import Counter
+from dataclasses import dataclass, field
 from settings import config
 import re
 
+
+@dataclass
+class ReplaySummary:
+    """Legacy summary text (what insert_replay_info parses) plus the same facts as a dict."""
+    text: str
+    data: dict = field(default_factory=dict)
+
+
 class GameSummarizer:
     @staticmethod
     def generate_summary(replay_data, winning_players, losing_players):
-        replay_summary = ""
-        
-        # Players and Map
-        players_list = []
-        if isinstance(replay_data.get('players'), dict):
-            for p_data in replay_data['players'].values():
-                players_list.append(f"{p_data['name']}: {p_data['race']}")
-        
-        players_str = ', '.join(players_list)
-        
-        replay_summary += f"Players: {players_str}\n"
-        replay_summary += f"Map: {replay_data.get('map', 'Unknown')}\n"
-        replay_summary += f"Region: {replay_data.get('region', 'Unknown')}\n"
-        replay_summary += f"Game Type: {replay_data.get('game_type', 'Unknown')}\n"
-        replay_summary += f"Timestamp: {replay_data.get('unix_timestamp', 0)}\n"
-        replay_summary += f"Winners: {winning_players}\n"
-        replay_summary += f"Losers: {losing_players}\n"
-        
-        # Duration
+        return GameSummarizer.build(replay_data, winning_players, losing_players).text
+
+    @staticmethod
+    def build(replay_data, winning_players, losing_players, build_order_steps=None):
+        """
+        Walk the parsed replay once and produce both the legacy text and a structured dict.
+
+        Streamer accounts are swapped for STREAMER_NICKNAME as each name is emitted, so
+        the text never needs a substitution pass afterwards. build_order_steps defaults
+        to the duration-based depth used at game end.
+        """
+        players = replay_data.get('players') if isinstance(replay_data.get('players'), dict) else {}
         duration_info = GameSummarizer.calculate_duration(replay_data)
         total_seconds = duration_info['totalSeconds']
-        replay_summary += f"Game Duration: {duration_info['gameDuration']}\n\n"
-        
-        # Units Lost
-        if 'players' in replay_data:
-            units_lost_summary = {pk: pd.get('unitsLost', []) for pk, pd in replay_data['players'].items()}
-            for pk, units_lost in units_lost_summary.items():
-                player_name = replay_data['players'][pk]['name']
-                replay_summary += f"Units Lost by {player_name}\n"
-                
-                units_lost_aggregate = defaultdict(int)
-                if units_lost:
-                    for unit in units_lost:
-                        name = unit.get('name', "N/A")
-                        units_lost_aggregate[name] += 1
-                    for name, count in units_lost_aggregate.items():
-                        replay_summary += f"{name}: {count}\n"
-                else:
-                    replay_summary += "None \n"
-                replay_summary += '\n'
-
-        # Build Orders
-        if total_seconds < 600:
-            base_build_count = 120
-        else:
-            base_build_count = 180
-            
-        total_players = len(replay_data.get('players', {}))
-        if total_players > 2:
-            build_order_count = base_build_count / 2
-        else:
-            build_order_count = base_build_count
-            
+
+        if build_order_steps is None:
+            # Strategy is set in the first ~10 minutes; longer games get more steps to show tech choices.
+            build_order_steps = 120 if total_seconds < 600 else 180
+            # Team games would blow the token budget, so halve the per-player depth.
+            if len(players) > 2:
+                build_order_steps = build_order_steps / 2
+        build_order_steps = int(build_order_steps)
+
+        alias_patterns = GameSummarizer._alias_patterns()
+        entries = []
+        streamer_pk = None
+        for pk, pd in players.items():
+            name = pd['name']
+            is_streamer = name.lower() in alias_patterns[1]
+            if is_streamer:
+                streamer_pk = pk
+            entries.append({
+                'key': pk,
+                'name': name,
+                'display_name': GameSummarizer._display_name(name, alias_patterns),
+                'race': pd['race'],
+                'pick_race': pd.get('pick_race', pd['race']),
+                'is_winner': bool(pd.get('is_winner', False)),
+                'is_streamer': is_streamer,
+                'units_lost': dict(Counter(unit.get('name', "N/A") for unit in pd.get('unitsLost') or [])),
+                'build_order': [
+                    {'time': o.get('time', ''), 'name': o.get('name', ''), 'supply': o.get('supply', '')}
+                    for o in (pd.get('buildOrder') or [])[:build_order_steps]
+                ],
+            })
+
+        winners = GameSummarizer._display_name(winning_players, alias_patterns)
+        losers = GameSummarizer._display_name(losing_players, alias_patterns)
+
+        parts = [
+            "Players: ", ', '.join(f"{e['display_name']}: {e['race']}" for e in entries), "\n",
+            f"Map: {replay_data.get('map', 'Unknown')}\n",
+            f"Region: {replay_data.get('region', 'Unknown')}\n",
+            f"Game Type: {replay_data.get('game_type', 'Unknown')}\n",
+            f"Timestamp: {replay_data.get('unix_timestamp', 0)}\n",
+            f"Winners: {winners}\n",
+            f"Losers: {losers}\n",
+            f"Game Duration: {duration_info['gameDuration']}\n\n",
+        ]
+
         if 'players' in replay_data:
-            build_orders = {pk: pd.get('buildOrder', []) for pk, pd in replay_data['players'].items()}
-            
-            # Sort players (Opponent first, Streamer last)
-            # STRICTLY identify the streamer
-            player_order = []
-            player_accounts_lower = [name.lower() for name in config.SC2_PLAYER_ACCOUNTS]
-            
-            streamer_pk = None
-            opponent_pk = None
-            
-            for pk, pd in replay_data['players'].items():
-                if pd['name'].lower() in player_accounts_lower:
-                    streamer_pk = pk
+            for e in entries:
+                parts.append(f"Units Lost by {e['display_name']}\n")
+                if e['units_lost']:
+                    parts.extend(f"{name}: {count}\n" for name, count in e['units_lost'].items())
                 else:
-                    opponent_pk = pk # In 1v1, this is unique. In team games, list logic handles it.
-            
-            # Reconstruct order: Opponents first, then Streamer
-            # This ensures "Opponent Build" comes first in text, if iterating
-            player_keys = list(replay_data['players'].keys())
-            sorted_keys = sorted(player_keys, key=lambda k: 1 if k == streamer_pk else 0)
-            
-            for pk in sorted_keys:
-                if pk not in build_orders: continue
-                
-                build_order = build_orders[pk]
-                player_name = replay_data['players'][pk]['name']
-                
-                # Explicitly label build orders based on identity
-                is_streamer = (pk == streamer_pk)
-                
-                header_name = config.STREAMER_NICKNAME if is_streamer else player_name
-                replay_summary += f"{header_name}'s Build Order (first set of steps):\n"
-                
-                for order in build_order[:int(build_order_count)]:
-                    order_time = order.get('time', '')
-                    name = order.get('name', '')
-                    supply = order.get('supply', '')
-                    replay_summary += f"Time: {order_time}, Name: {name}, Supply: {supply}\n"
-                replay_summary += '\n'
-                
-        # Anonymize Streamer Name in the rest of the text (already handled in headers above, but good for other sections)
-        # Use word boundaries to prevent "FALSE" from matching "FalseSith"
-        for player_name in config.SC2_PLAYER_ACCOUNTS:
-            pattern = re.compile(r'\b' + re.escape(player_name) + r'\b', re.IGNORECASE)
-            replay_summary = pattern.sub(config.STREAMER_NICKNAME, replay_summary)
-            
-        return replay_summary
+                    parts.append("None \n")
+                parts.append('\n')
+
+            # Opponents first, streamer last, so the opponent's build leads the text
+            for e in sorted(entries, key=lambda e: 1 if e['key'] == streamer_pk else 0):
+                parts.append(f"{e['display_name']}'s Build Order (first set of steps):\n")
+                parts.extend(
+                    f"Time: {o['time']}, Name: {o['name']}, Supply: {o['supply']}\n" for o in e['build_order']
+                )
+                parts.append('\n')
+
+        data = {
+            'players': entries,
+            'map': replay_data.get('map', 'Unknown'),
+            'region': replay_data.get('region', 'Unknown'),
+            'game_type': replay_data.get('game_type', 'Unknown'),
+            'unix_timestamp': replay_data.get('unix_timestamp', 0),
+            'winners': winners,
+            'losers': losers,
+            'duration_seconds': total_seconds,
+            'duration': duration_info['gameDuration'],
+        }
+        return ReplaySummary(text="".join(parts), data=data)
+
+    @staticmethod
+    def _alias_patterns():
+        accounts = list(getattr(config, 'SC2_PLAYER_ACCOUNTS', []) or [])
+        # Word boundaries so "FALSE" does not match "FalseSith"
+        patterns = [re.compile(r'\b' + re.escape(a) + r'\b', re.IGNORECASE) for a in accounts]
+        return patterns, {a.lower() for a in accounts}
+
+    @staticmethod
+    def _display_name(text, alias_patterns):
+        text = str(text)
+        for pattern in alias_patterns[0]:
+            text = pattern.sub(config.STREAMER_NICKNAME, text)
+        return text
 
     @staticmethod
     def calculate_duration(replay_data):
@@ -113,12 +124,11 @@ class GameSummarizer:
         frames = replay_data.get('frames', 0)
         fps = replay_data.get('frames_per_second', 16)
         if fps == 0: fps = 16
-            
+
         total_seconds = frames / fps
         minutes = int(total_seconds // 60)
         seconds = int(total_seconds % 60)
-        
+
         res["totalSeconds"] = total_seconds
         res["gameDuration"] = f"{minutes}m {seconds}s"
         return res
-
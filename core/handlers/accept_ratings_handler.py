@@ -1,6 +1,7 @@
 import asyncio
 import logging
 
+from core.executors import get_executor
 from core.command_service import CommandContext, ICommandHandler
 from core import fsl_chat_voting as fcv
 from settings import config
@@ -70,7 +71,7 @@ class AcceptRatingsHandler(ICommandHandler):
             return
 
         loop = asyncio.get_running_loop()
-        mdata, err = await loop.run_in_executor(None, fcv.api_get_match, mid)
+        mdata, err = await loop.run_in_executor(get_executor("db"), fcv.api_get_match, mid)
         if err or not mdata:
             await context.chat_service.send_message(
                 context.channel, f"Ratings: match lookup failed: {err}"
@@ -82,7 +83,7 @@ class AcceptRatingsHandler(ICommandHandler):
                 mid, context.author, getattr(config, "PAGE", "") or ""
             )
 
-        ena, err2 = await loop.run_in_executor(None, _enable)
+        ena, err2 = await loop.run_in_executor(get_executor("db"), _enable)
         if err2 or not ena:
             await context.chat_service.send_message(
                 context.channel, f"Ratings: enable failed: {err2}"
@@ -158,5 +159,5 @@ class EndRatingsHandler(ICommandHandler):
             return
         reason = f"mod {context.author}"
         loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, sess.submit_final, reason)
+        await loop.run_in_executor(get_executor("db"), sess.submit_final, reason)
         # submit_final posts summary to chat and clears fsl_voting_session
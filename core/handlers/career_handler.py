@@ -1,6 +1,7 @@
 import logging
 from core.command_service import ICommandHandler, CommandContext
 from core.interfaces import ILanguageModel, IPlayerRepository
+from core import record_templates
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,15 @@ class CareerHandler(ICommandHandler):
             if matchups:
                 career_record += " " + matchups
             
+            lines = (
+                record_templates.format_career(player_name, overall, matchups)
+                if career_record and record_templates.templates_enabled() else None
+            )
+            if lines:
+                # Deterministic restatement; no completion on the critical path
+                await record_templates.send_with_flourish(context, self.llm, lines, "career")
+                return
+
             if career_record:
                 # Legacy Logic Port: Exact Prompt Engineering
                 import utils.tokensArray as tokensArray
@@ -55,7 +65,7 @@ class CareerHandler(ICommandHandler):
                 '''
                 
                 # Use generate_raw to bypass persona/mood injection (matching legacy send_prompt_to_openai)
-                response = await self.llm.generate_raw(prompt)
+                response = await self.llm.generate_raw(prompt, cache="career")
             else:
                 prompt = f"Restate all of the info here: There is no career games that I know for {player_name} ."
                 # For empty results, legacy used processMessageForOpenAI (persona injected) but raw prompt is safer for consistency here
@@ -2,6 +2,7 @@ import logging
 import asyncio
 import json
 import os
+from core.executors import get_executor
 from core.command_service import ICommandHandler, CommandContext
 from core.interfaces import IReplayRepository
 from settings import config
@@ -69,12 +70,12 @@ class CommentHandler(ICommandHandler):
                             logger.warning(f"Could not load build order from replay JSON: {e}")
                         
                         await loop.run_in_executor(
-                            None,
+                            get_executor("db"),
                             self.pattern_learner._process_new_comment,
                             game_data,
                             comment_text
                         )
-                        await loop.run_in_executor(None, self.pattern_learner.save_patterns_to_file)
+                        await loop.run_in_executor(get_executor("db"), self.pattern_learner.save_patterns_to_file)
                         
                         response = f"Overwritten comment for game vs {replay_info['opponent']} on {replay_info['map']} ({replay_info['date']}): '{comment_text}'"
                         await context.chat_service.send_message(context.channel, response)
@@ -136,12 +137,12 @@ class CommentHandler(ICommandHandler):
                                     logger.warning(f"Could not load build order: {e}")
                                 
                                 await loop.run_in_executor(
-                                    None,
+                                    get_executor("db"),
                                     self.pattern_learner._process_new_comment,
                                     game_data,
                                     comment_text
                                 )
-                                await loop.run_in_executor(None, self.pattern_learner.save_patterns_to_file)
+                                await loop.run_in_executor(get_executor("db"), self.pattern_learner.save_patterns_to_file)
                                 
                                 response = f"Saved comment to newer replay vs {latest_replay['opponent']} on {latest_replay['map']}: '{comment_text}'"
                                 await context.chat_service.send_message(context.channel, response)
@@ -215,7 +216,7 @@ class CommentHandler(ICommandHandler):
                     loop = asyncio.get_running_loop()
                     try:
                         action, interpreted_comment = await loop.run_in_executor(
-                            None,
+                            get_executor("llm"),
                             twitch_bot._process_natural_language_pattern_response,
                             comment_text,
                             logger
@@ -277,7 +278,7 @@ class CommentHandler(ICommandHandler):
                             "Database client does not support replay-by-id lookup.",
                         )
                         return
-                    latest_replay = await loop.run_in_executor(None, db.get_replay_by_id, int(explicit_ref))
+                    latest_replay = await loop.run_in_executor(get_executor("db"), db.get_replay_by_id, int(explicit_ref))
                     if not latest_replay:
                         await context.chat_service.send_message(
                             context.channel,
@@ -294,7 +295,7 @@ class CommentHandler(ICommandHandler):
                             "Database client does not support -N (games ago) replay lookup.",
                         )
                         return
-                    latest_replay = await loop.run_in_executor(None, db.get_replay_by_recency_offset, n_back)
+                    latest_replay = await loop.run_in_executor(get_executor("db"), db.get_replay_by_recency_offset, n_back)
                     if not latest_replay:
                         await context.chat_service.send_message(
                             context.channel,
@@ -302,7 +303,7 @@ class CommentHandler(ICommandHandler):
                         )
                         return
             elif target_replay_id and db and hasattr(db, 'get_replay_by_id'):
-                latest_replay = await loop.run_in_executor(None, db.get_replay_by_id, int(target_replay_id))
+                latest_replay = await loop.run_in_executor(get_executor("db"), db.get_replay_by_id, int(target_replay_id))
                 if latest_replay and latest_replay.get('replay_id') is None:
                     latest_replay['replay_id'] = int(target_replay_id)
             if not latest_replay:
@@ -407,12 +408,12 @@ class CommentHandler(ICommandHandler):
                         logger.warning(f"Could not load build order from replay JSON: {e} - comment will be saved without build order")
                     
                     await loop.run_in_executor(
-                        None,
+                        get_executor("db"),
                         self.pattern_learner._process_new_comment,
                         game_data,
                         comment_text
                     )
-                    await loop.run_in_executor(None, self.pattern_learner.save_patterns_to_file)
+                    await loop.run_in_executor(get_executor("db"), self.pattern_learner.save_patterns_to_file)
                     
                 response = f"Saved comment for game vs {opponent} on {map_name} ({game_date}): '{comment_text}'"
                 await context.chat_service.send_message(context.channel, response)
@@ -430,7 +431,7 @@ class CommentHandler(ICommandHandler):
             db = getattr(self.replay_repo, 'db', None)
             if replay_id and db and hasattr(db, 'update_player_comments_by_replay_id'):
                 return await loop.run_in_executor(
-                    None,
+                    get_executor("db"),
                     db.update_player_comments_by_replay_id,
                     int(replay_id),
                     comment_text,
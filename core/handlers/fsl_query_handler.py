@@ -12,6 +12,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import settings.config as config
 import utils.tokensArray as tokensArray
+from core.executors import get_executor
 from core.command_service import CommandContext, ICommandHandler
 from core.repositories.sql_player_repository import SqlPlayerRepository
 
@@ -147,7 +148,7 @@ class FslQueryHandler(ICommandHandler):
 
     async def _run(self, fn, *args, **kwargs):
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, lambda: fn(*args, **kwargs))
+        return await loop.run_in_executor(get_executor("db"), lambda: fn(*args, **kwargs))
 
     async def handle(self, context: CommandContext, args: str) -> None:
         if not self._fsl_enabled():
@@ -289,7 +290,7 @@ class FslQueryHandler(ICommandHandler):
             p2 = m_h2h.group("p2").strip()
             season = int(m_h2h.group("s")) if m_h2h.group("s") else None
             data = await loop.run_in_executor(
-                None,
+                get_executor("db"),
                 lambda: db.fsl_matches(
                     season=season,
                     player_name=p1,
@@ -328,7 +329,7 @@ class FslQueryHandler(ICommandHandler):
 
         match_limit = 120 if season is not None else 14
         data = await loop.run_in_executor(
-            None,
+            get_executor("db"),
             lambda: db.fsl_matches(
                 season=season,
                 player_name=player_q,
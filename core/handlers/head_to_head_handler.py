@@ -1,10 +1,12 @@
 import logging
 import re
+from core.executors import get_executor
 from core.command_service import ICommandHandler, CommandContext
 from core.interfaces import ILanguageModel, IChatService
 from core.repositories.sql_player_repository import SqlPlayerRepository
 import settings.config as config
 import utils.tokensArray as tokensArray
+from core import record_templates
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +43,7 @@ class HeadToHeadHandler(ICommandHandler):
                 import asyncio
                 loop = asyncio.get_running_loop()
                 head_to_head_list = await loop.run_in_executor(
-                    None, 
+                    get_executor("db"), 
                     self.player_repo.db.get_head_to_head_matchup, 
                     player1_name, 
                     player2_name
@@ -51,6 +53,15 @@ class HeadToHeadHandler(ICommandHandler):
                 await context.chat_service.send_message(context.channel, "Error: Feature not supported by current repository.")
                 return
 
+            lines = (
+                record_templates.format_head_to_head(player1_name, player2_name, head_to_head_list)
+                if head_to_head_list and record_templates.templates_enabled() else None
+            )
+            if lines:
+                # Deterministic restatement; no completion on the critical path
+                await record_templates.send_with_flourish(context, self.llm, lines, "head_to_head")
+                return
+
             if head_to_head_list:
                 result_string = ", ".join(head_to_head_list)
                 trimmed_result = tokensArray.truncate_to_byte_limit(result_string, config.TWITCH_CHAT_BYTE_LIMIT)
@@ -74,7 +85,7 @@ class HeadToHeadHandler(ICommandHandler):
                 '''
                 
                 # Use generate_raw to bypass persona/mood injection (matching legacy send_prompt_to_openai)
-                response = await self.llm.generate_raw(prompt)
+                response = await self.llm.generate_raw(prompt, cache="head_to_head")
                 
                 # CRITICAL FIX: Discord messages are tracked by legacy bot.
                 # If we just 'return' from the handler, the legacy bot tracks it but sees no response.
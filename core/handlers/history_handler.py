@@ -1,6 +1,7 @@
 import logging
 from core.command_service import ICommandHandler, CommandContext
 from core.interfaces import IPlayerRepository, ILanguageModel
+from core import record_templates
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +21,15 @@ class HistoryHandler(ICommandHandler):
         
         try:
             history_list = await self.player_repo.get_player_records(player_name)
+
+            lines = (
+                record_templates.format_history(player_name, history_list)
+                if history_list and record_templates.templates_enabled() else None
+            )
+            if lines:
+                # Deterministic restatement; no completion on the critical path
+                await record_templates.send_with_flourish(context, self.llm, lines, "history")
+                return
             
             if not history_list:
                 prompt = f"restate all of the info here: there are no game records in history for {player_name}"
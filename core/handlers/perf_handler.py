@@ -0,0 +1,23 @@
+import logging
+from core.command_service import ICommandHandler, CommandContext
+from core.instrumentation import format_summary, get_instrumentation
+import settings.config as config
+
+logger = logging.getLogger(__name__)
+
+class PerfHandler(ICommandHandler):
+    """Handler for 'please perf [dump]' - loop lag, slowest spans and the last game-end/pregame breakdown"""
+
+    async def handle(self, context: CommandContext, args: str):
+        # Only the broadcaster / owner may read timing data
+        if context.author.lower() not in (config.PAGE.lower(), config.OWNER.lower()):
+            logger.info(f"Perf command rejected - not from owner (from: {context.author})")
+            return
+
+        instrumentation = get_instrumentation()
+        if args.strip().lower() == "dump":
+            path = instrumentation.dump()
+            reply = f"Timing snapshot written to {path}" if path else "Timing snapshot could not be written (see log)."
+        else:
+            reply = format_summary(instrumentation.snapshot()) or "No timing data yet."
+        await context.chat_service.send_message(context.channel, reply)
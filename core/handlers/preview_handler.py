@@ -4,7 +4,8 @@ import json
 import logging
 import os
 import re
-import spawningtool.parser
+from core.executors import get_executor
+from core.replay_access import LazyReplay
 from core.command_service import ICommandHandler, CommandContext
 import settings.config as config
 
@@ -181,7 +182,7 @@ class PreviewHandler(ICommandHandler):
                 # Preview/review: bundle expert notes + pattern + build + last-meeting in ONE GenAI user message.
                 # Saved line must be copied verbatim (see pregame_intel); game start uses the same bundling.
                 success = await loop.run_in_executor(
-                    None,
+                    get_executor("llm"),
                     lambda: self.opponent_analysis_service.analyze_opponent(
                         opponent_name,
                         opponent_race,
@@ -289,10 +290,10 @@ class PreviewHandler(ICommandHandler):
         """Load replay_data for N games ago by replay-file recency."""
         import asyncio
         loop = asyncio.get_running_loop()
-        replay_path = await loop.run_in_executor(None, self._find_nth_latest_replay_file, n_back)
+        replay_path = await loop.run_in_executor(get_executor("parse"), self._find_nth_latest_replay_file, n_back)
         if not replay_path:
             return None
-        replay_data = await loop.run_in_executor(None, self._parse_replay_file, replay_path)
+        replay_data = await loop.run_in_executor(get_executor("parse"), self._parse_replay_file, replay_path)
         return replay_data if isinstance(replay_data, dict) else None
 
     def _find_nth_latest_replay_file(self, n_back: int):
@@ -326,11 +327,11 @@ class PreviewHandler(ICommandHandler):
             return None
 
     def _parse_replay_file(self, replay_path: str):
-        """Parse replay file to replay_data dict."""
+        """Header-tier replay_data (players, races, map, timestamp) - all preview reads from a file."""
         try:
             if not os.path.exists(replay_path):
                 return None
-            return spawningtool.parser.parse_replay(replay_path)
+            return LazyReplay(replay_path).header()
         except Exception as e:
             logger.error(f"Preview - error parsing replay file {replay_path}: {e}")
             return None
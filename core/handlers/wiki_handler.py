@@ -2,6 +2,7 @@ import logging
 import asyncio
 from core.command_service import ICommandHandler, CommandContext
 from core.interfaces import ILanguageModel
+from core.llm_cache import get_llm_cache
 import utils.wiki_utils
 
 logger = logging.getLogger(__name__)
@@ -23,12 +24,17 @@ class WikiHandler(ICommandHandler):
             # Run legacy synchronous code in executor
             # utils.wiki_utils.wikipedia_question(question, self)
             # We pass None for self because it's unused in the legacy function
-            wiki_result = await loop.run_in_executor(
-                None,
-                utils.wiki_utils.wikipedia_question,
-                args,
-                None
-            )
+            lookup = lambda: utils.wiki_utils.wikipedia_question(args, None)
+            cache = get_llm_cache()
+            if cache is not None:
+                # The lookup agent's answer depends only on the question; repeats skip it
+                wiki_lookup = lambda: cache.get_or_compute(
+                    "wiki", args.strip().lower(), lookup,
+                    cacheable=lambda text: not text.startswith("Error searching wiki"),
+                )
+            else:
+                wiki_lookup = lookup
+            wiki_result = await loop.run_in_executor(None, wiki_lookup)
             
             # Prepare response using LLM to match bot personality
             prompt = f"Based on this info: '{wiki_result}', give a short summary for Twitch chat (under 450 chars)."
@@ -0,0 +1,269 @@
+"""Lightweight timing for the bot's hot paths.
+
+Three parts, all kept in memory as rolling histograms (the last
+``INSTRUMENTATION_WINDOW`` samples per name):
+
+- **spans**: ``with span("name"):`` (or ``@timed("name")``) around a block.
+  BotCore times every ``process_event`` (``event.<type>``), CommandService every
+  handler (``command.<keyword>``), and the game-end / pregame flows time their
+  stages (``game_end.*``, ``pregame.*``, ``openai.completion``).
+- **traces**: ``with trace("game_end"):`` is a span that also keeps, for the
+  last few runs, every span finished inside it in order, so a slow game-end or
+  pregame message shows where its time went.
+- **monitor**: a loop task measuring event-loop lag (how late a short sleep
+  wakes up) and sampling executor queue depths and BotCore lane depths.
+
+Read it with the owner-only ``please perf`` chat command, or from the JSON
+snapshot the monitor writes to ``INSTRUMENTATION_DUMP_FILE`` every
+``INSTRUMENTATION_DUMP_SECONDS`` (run_core also writes it at shutdown).
+"""
+import asyncio
+import contextvars
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Optional
+
+from core.config_utils import cfg
+from core.executors import executor_stats
+
+logger = logging.getLogger(__name__)
+
+_current_trace = contextvars.ContextVar("instrumentation_trace", default=None)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list (q in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(q / 100 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """count/p50/p90/p99/max in milliseconds for latencies given in seconds."""
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 1),
+        "p90_ms": round(percentile(ordered, 90) * 1000, 1),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 1),
+        "max_ms": round((ordered[-1] if ordered else 0.0) * 1000, 1),
+    }
+
+
+class RollingHistogram:
+    """The last ``size`` samples of one measurement plus a lifetime count."""
+
+    def __init__(self, size: int):
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.total = 0
+
+    def add(self, value: float) -> None:
+        self.samples.append(value)
+        self.total += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        stats = summarize(list(self.samples))
+        stats["total"] = self.total
+        return stats
+
+
+class Instrumentation:
+    """Span histograms, recent traces and sampled queue depths (thread-safe)."""
+
+    def __init__(self, window=None, trace_history=None):
+        self.window = max(1, int(cfg(window, "INSTRUMENTATION_WINDOW", 500)))
+        self.trace_history = max(1, int(cfg(trace_history, "INSTRUMENTATION_TRACE_HISTORY", 5)))
+        self._lock = threading.Lock()
+        self._spans: Dict[str, RollingHistogram] = {}
+        self._traces: Dict[str, Deque[Dict]] = {}
+        self._depths: Dict[str, Deque[int]] = {}
+        self.loop_lag = RollingHistogram(self.window)
+        self.bot = None  # BotCore whose lane depths are sampled (set by run_core)
+        self.started = time.time()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._spans.get(name)
+            if histogram is None:
+                histogram = self._spans[name] = RollingHistogram(self.window)
+            histogram.add(seconds)
+        current = _current_trace.get()
+        if current is not None and "total_ms" not in current:
+            current["stages"].append([name, round(seconds * 1000, 1)])
+
+    @contextmanager
+    def span(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    @contextmanager
+    def trace(self, name: str):
+        """
+        A span that also keeps, for the last few runs, the spans finished inside it:
+        in this task or thread, and in tasks it starts, until the trace ends.
+        """
+        current = {"at": time.strftime("%Y-%m-%d %H:%M:%S"), "stages": []}
+        token = _current_trace.set(current)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_trace.reset(token)
+            current["total_ms"] = round(elapsed * 1000, 1)
+            self.record(name, elapsed)
+            with self._lock:
+                recent = self._traces.get(name)
+                if recent is None:
+                    recent = self._traces[name] = deque(maxlen=self.trace_history)
+                recent.append(current)
+
+    def sample_depths(self) -> None:
+        depths = {f"executor.{name}": stats["queued"] for name, stats in executor_stats().items()}
+        if self.bot is not None:
+            depths.update({f"lane.{name}": stats["depth"] for name, stats in self.bot.lane_stats().items()})
+        with self._lock:
+            for name, depth in depths.items():
+                samples = self._depths.get(name)
+                if samples is None:
+                    samples = self._depths[name] = deque(maxlen=self.window)
+                samples.append(depth)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            spans = {name: h.snapshot() for name, h in sorted(self._spans.items())}
+            traces = {name: list(recent) for name, recent in self._traces.items()}
+            depths = {
+                name: {"now": samples[-1], "max": max(samples), "avg": round(sum(samples) / len(samples), 2)}
+                for name, samples in sorted(self._depths.items()) if samples
+            }
+        return {
+            "generated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "uptime_s": round(time.time() - self.started),
+            "loop_lag": self.loop_lag.snapshot(),
+            "spans": spans,
+            "traces": traces,
+            "queue_depths": depths,
+            "executors": executor_stats(),
+            "lanes": self.bot.lane_stats() if self.bot is not None else {},
+        }
+
+    def dump(self, path=None) -> Optional[str]:
+        """Write the snapshot as JSON (atomically); returns the path, or None if dumping is off or failed."""
+        path = cfg(path, "INSTRUMENTATION_DUMP_FILE", "logs/instrumentation.json")
+        if not path:
+            return None
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, indent=2, default=str)
+            os.replace(tmp, path)
+            return path
+        except Exception as e:
+            logger.warning(f"Instrumentation dump to {path} failed: {e}")
+            return None
+
+    async def monitor(self, interval=None, dump_seconds=None) -> None:
+        """Measure loop lag and sample queue depths every ``interval`` seconds; dump periodically."""
+        interval = float(cfg(interval, "INSTRUMENTATION_LAG_INTERVAL_SECONDS", 0.5))
+        dump_seconds = float(cfg(dump_seconds, "INSTRUMENTATION_DUMP_SECONDS", 60))
+        next_dump = time.monotonic() + dump_seconds
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(interval)
+            lag = time.monotonic() - started - interval
+            with self._lock:
+                self.loop_lag.add(max(0.0, lag))
+            self.sample_depths()
+            if dump_seconds > 0 and time.monotonic() >= next_dump:
+                next_dump = time.monotonic() + dump_seconds
+                self.dump()
+
+
+def _ms(value: float) -> str:
+    return f"{value / 1000:.1f}s" if value >= 1000 else f"{value:.0f}ms"
+
+
+def format_summary(snapshot: Dict, max_spans: int = 5) -> str:
+    """One chat-sized line: loop lag, slowest spans, the latest game-end / pregame breakdown, busy queues."""
+    lag = snapshot["loop_lag"]
+    parts = [f"loop lag p99 {_ms(lag['p99_ms'])} max {_ms(lag['max_ms'])}"]
+    slowest = sorted(
+        ((name, s) for name, s in snapshot["spans"].items() if s["count"]),
+        key=lambda item: item[1]["p90_ms"], reverse=True,
+    )[:max_spans]
+    if slowest:
+        parts.append("p90 " + ", ".join(f"{name} {_ms(s['p90_ms'])}" for name, s in slowest))
+    for name in ("game_end", "pregame"):
+        recent = snapshot["traces"].get(name)
+        if recent:
+            last = recent[-1]
+            stages = sorted(last["stages"], key=lambda stage: stage[1], reverse=True)[:4]
+            parts.append(f"last {name} {_ms(last['total_ms'])}: "
+                         + ", ".join(f"{stage} {_ms(ms)}" for stage, ms in stages))
+    busy = [f"{name} {d['now']} (max {d['max']})" for name, d in snapshot["queue_depths"].items() if d["max"]]
+    if busy:
+        parts.append("queues " + ", ".join(busy))
+    return " | ".join(parts)
+
+
+_instrumentation = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    return _instrumentation
+
+
+def span(name: str):
+    """Time a block into the ``name`` histogram (and the enclosing trace, if any)."""
+    return _instrumentation.span(name)
+
+
+def trace(name: str):
+    """Time a block and keep the breakdown of the spans inside it."""
+    return _instrumentation.trace(name)
+
+
+def record(name: str, seconds: float) -> None:
+    _instrumentation.record(name, seconds)
+
+
+def _decorator(name: str, make_cm):
+    def decorate(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with make_cm(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with make_cm(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def timed(name: str):
+    """Decorator form of ``span`` for sync and async functions."""
+    return _decorator(name, span)
+
+
+def traced(name: str):
+    """Decorator form of ``trace``. Wrap functions handed to an executor here, since context does not cross threads."""
+    return _decorator(name, trace)
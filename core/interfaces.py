@@ -36,8 +36,8 @@ class ILanguageModel(ABC):
         pass
 
     @abstractmethod
-    async def generate_raw(self, prompt: str) -> str:
-        """Generate a raw response without persona/system prompt injection"""
+    async def generate_raw(self, prompt: str, cache: Optional[str] = None) -> str:
+        """Generate a raw response without persona/system prompt injection (``cache``: prompt class to cache under)"""
         pass
 
 class IReplayRepository(ABC):
@@ -0,0 +1,209 @@
+"""Cache of LLM replies to prompts that are pure functions of database data.
+
+Career / head-to-head restatements, FSL fact formatting and wiki lookups get
+the same answer for the same data, so a viewer repeating the command should
+not pay for another completion. Replies are keyed by the normalized prompt
+(whitespace collapsed), the model, request options and an optional data
+fingerprint, and kept:
+
+- in memory, as an LRU of ``LLM_CACHE_MAX_ENTRIES`` replies;
+- optionally on disk under ``LLM_CACHE_DIR`` (one small JSON file per reply),
+  so a restart does not start cold.
+
+Each prompt class has its own time to live (``LLM_CACHE_TTL_SECONDS``, falling
+back to ``LLM_CACHE_DEFAULT_TTL_SECONDS``; 0 disables caching for the class).
+Caching is opt-in per call: only callers that pass a prompt class are cached,
+so persona-flavored replies (``process_ai_message``, ``generate_response``),
+whose mood and wording vary on purpose, always bypass it. Hits and misses are
+counted in ``bot_cache_requests_total{cache="llm"}`` and in ``stats()``.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import settings.config as config
+from core.config_utils import cfg
+from core.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".llm.json"
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(text: str) -> str:
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+class LLMResponseCache:
+    """In-memory LRU of replies with an optional on-disk store; safe to share across threads."""
+
+    def __init__(self, max_entries=None, directory=None, ttls=None, default_ttl=None):
+        self.max_entries = max(1, int(cfg(max_entries, "LLM_CACHE_MAX_ENTRIES", 512)))
+        self.directory = cfg(directory, "LLM_CACHE_DIR", None)
+        self.ttls: Dict[str, float] = dict(cfg(ttls, "LLM_CACHE_TTL_SECONDS", {}) or {})
+        self.default_ttl = float(cfg(default_ttl, "LLM_CACHE_DEFAULT_TTL_SECONDS", 300))
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def ttl_for(self, prompt_class: str) -> float:
+        return float(self.ttls.get(prompt_class, self.default_ttl))
+
+    @staticmethod
+    def key_for(prompt_class: str, prompt: str, model: Optional[str] = None, fingerprint: str = "") -> str:
+        raw = "\x1f".join((prompt_class, model or "", fingerprint or "", normalize_prompt(prompt)))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _count(self, prompt_class: str, result: str) -> None:
+        CACHE_REQUESTS.inc(cache="llm", result=result)
+        with self._lock:
+            counts = self._stats.setdefault(prompt_class, {"hit": 0, "miss": 0})
+            counts[result] += 1
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, str]]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._entry_path(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return float(data["stored_at"]), data["text"]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable LLM cache entry {key}: {e}")
+            self._remove(self._entry_path(key))
+            return None
+
+    def _write_disk(self, key: str, prompt_class: str, stored_at: float, text: str) -> None:
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"class": prompt_class, "stored_at": stored_at, "text": text}, f)
+            os.replace(tmp, self._entry_path(key))
+        except OSError as e:
+            logger.warning(f"Could not write LLM cache entry: {e}")
+            return
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % 100 == 0
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Remove on-disk replies older than the longest TTL (expired ones are otherwise only dropped on read)."""
+        cutoff = time.time() - max([self.default_ttl, *map(float, self.ttls.values())])
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith(_SUFFIX)]
+        except OSError:
+            return
+        for name in names:
+            full = os.path.join(self.directory, name)
+            try:
+                if os.stat(full).st_mtime < cutoff:
+                    self._remove(full)
+            except OSError:
+                pass
+
+    def get(self, prompt_class: str, key: str) -> Optional[str]:
+        ttl = self.ttl_for(prompt_class)
+        if ttl <= 0:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            entry = self._read_disk(key)
+            if entry is not None:
+                self._remember(key, entry)
+        if entry is not None and now - entry[0] > ttl:
+            self.invalidate(key)
+            entry = None
+        self._count(prompt_class, "hit" if entry is not None else "miss")
+        return entry[1] if entry is not None else None
+
+    def _remember(self, key: str, entry: Tuple[float, str]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def put(self, prompt_class: str, key: str, text: str) -> None:
+        if not text or self.ttl_for(prompt_class) <= 0:
+            return
+        stored_at = time.time()
+        self._remember(key, (stored_at, text))
+        self._write_disk(key, prompt_class, stored_at, text)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.directory:
+            self._remove(self._entry_path(key))
+
+    def get_or_compute(self, prompt_class: str, prompt: str, compute: Callable[[], str],
+                       model: Optional[str] = None, fingerprint: str = "",
+                       cacheable: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        Cached reply for ``prompt``, or ``compute()`` stored under it (sync callers, e.g. executors).
+        ``cacheable`` can reject results that must not be reused, such as error text.
+        """
+        key = self.key_for(prompt_class, prompt, model, fingerprint)
+        cached = self.get(prompt_class, key)
+        if cached is not None:
+            return cached
+        text = compute()
+        if cacheable is None or cacheable(text):
+            self.put(prompt_class, key, text)
+        return text
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "classes": {k: dict(v) for k, v in self._stats.items()}}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.directory and os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(_SUFFIX):
+                    self._remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Shared cache, or None when LLM_CACHE_ENABLED is False."""
+    global _cache
+    if not getattr(config, "LLM_CACHE_ENABLED", True):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache()
+        return _cache
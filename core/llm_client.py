@@ -0,0 +1,268 @@
+"""One long-lived, pooled OpenAI chat client shared by every LLM path.
+
+``send_prompt_to_openai`` used to build a new ``openai.OpenAI`` client (and TLS
+connection pool) per call, and ``OpenAIAdapter`` called it straight from async
+code, blocking the event loop for the whole completion. Now:
+
+- ``LLMClient`` owns a single async client (``openai.AsyncOpenAI`` on openai>=1,
+  ``ChatCompletion.acreate`` over one shared aiohttp session on 0.27) running
+  on its own background event loop, so connections are kept alive and reused;
+- every request has a timeout (``LLM_REQUEST_TIMEOUT_SECONDS``) and at most
+  ``LLM_MAX_CONCURRENCY`` completions are in flight;
+- requests are started through a token bucket (``LLM_REQUESTS_PER_MINUTE``,
+  bursts of ``LLM_BURST``): idle, a call goes out immediately; under a burst
+  the extra calls wait their turn instead of every call sleeping a fixed 5s;
+- async callers ``await client.complete(...)`` from any loop without blocking
+  it; legacy sync call sites (IRC thread, executors) use ``complete_sync``.
+
+``stream_sync`` yields the reply's text as it is generated (``stream=True``),
+for callers that post long replies to chat sentence by sentence.
+
+Callers whose prompt is a pure function of DB data pass a prompt class
+(``cache="career"``) to reuse a recent reply from ``core.llm_cache``; a hit
+returns without touching the network, rate limiter or client loop.
+
+Responses keep the SDK's shape (``completion.choices[0].message.content``).
+"""
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+
+import openai
+
+from core.config_utils import cfg
+from core.instrumentation import record, span
+from core.llm_cache import get_llm_cache
+from core.metrics import LLM_REQUEST_SECONDS
+from core.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class LLMClient:
+    """Pooled chat-completions client on a dedicated event loop thread."""
+
+    def __init__(self, api_key=None, model=None, timeout=None, max_concurrency=None, max_retries=None,
+                 requests_per_minute=None, burst=None):
+        self.api_key = cfg(api_key, "OPENAI_API_KEY", None)
+        self.model = cfg(model, "ENGINE", None)
+        self.timeout = float(cfg(timeout, "LLM_REQUEST_TIMEOUT_SECONDS", 30))
+        self.max_concurrency = max(1, int(cfg(max_concurrency, "LLM_MAX_CONCURRENCY", 4)))
+        self.max_retries = int(cfg(max_retries, "LLM_MAX_RETRIES", 1))
+        per_minute = float(cfg(requests_per_minute, "LLM_REQUESTS_PER_MINUTE", 30))
+        burst = float(cfg(burst, "LLM_BURST", 5))
+        # 0 turns rate limiting off (the concurrency cap still applies)
+        self.limiter = TokenBucket(per_minute / 60, max(1.0, burst)) if per_minute > 0 else None
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        # Created on the client loop, which they are bound to
+        self._client = None
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def _run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=_run, name="llm-client", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    async def _create(self, messages: List[Dict[str, str]], model: str, kwargs: Dict):
+        if hasattr(openai, "AsyncOpenAI"):
+            if self._client is None:
+                self._client = openai.AsyncOpenAI(api_key=self.api_key, timeout=self.timeout,
+                                                  max_retries=self.max_retries)
+            return await self._client.chat.completions.create(model=model, messages=messages, **kwargs)
+        # openai 0.27: acreate reuses the session set in this (task-local) context var
+        if self._session is None:
+            import aiohttp
+            self._session = aiohttp.ClientSession()
+        openai.aiosession.set(self._session)
+        return await openai.ChatCompletion.acreate(model=model, messages=messages, api_key=self.api_key,
+                                                   request_timeout=self.timeout, **kwargs)
+
+    async def _admit(self) -> asyncio.Semaphore:
+        """Wait for a rate-limit token; returns the concurrency semaphore to hold for the request."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.limiter is not None and self.limiter.try_acquire() > 0:
+            with span("openai.rate_limited"):
+                await self.limiter.acquire()
+        return self._semaphore
+
+    async def _request(self, messages: List[Dict[str, str]], call: str, model: Optional[str], kwargs: Dict):
+        async with await self._admit():
+            with span("openai.completion"), LLM_REQUEST_SECONDS.time(call=call):
+                return await asyncio.wait_for(self._create(messages, model or self.model, kwargs),
+                                              timeout=self.timeout)
+
+    async def _stream(self, messages: List[Dict[str, str]], call: str, model: Optional[str], kwargs: Dict, push):
+        async with await self._admit():
+            with span("openai.stream"), LLM_REQUEST_SECONDS.time(call=call):
+                started = time.perf_counter()
+                stream = await asyncio.wait_for(
+                    self._create(messages, model or self.model, dict(kwargs, stream=True)), timeout=self.timeout)
+                iterator = stream.__aiter__()
+                first = True
+                while True:
+                    try:
+                        # The timeout applies between chunks, so a long reply may take longer overall
+                        chunk = await asyncio.wait_for(iterator.__anext__(), timeout=self.timeout)
+                    except StopAsyncIteration:
+                        return
+                    text = _delta_text(chunk)
+                    if text:
+                        if first:
+                            record("openai.first_token", time.perf_counter() - started)
+                            first = False
+                        push(text)
+
+    def _submit(self, messages, call, model, kwargs):
+        # The caller's context (instrumentation trace) is copied into the request task
+        return asyncio.run_coroutine_threadsafe(self._request(messages, call, model, kwargs), self._ensure_loop())
+
+    def _cache_lookup(self, cache: Optional[str], fingerprint: str, messages, model, kwargs):
+        """(cached completion or None, store callback or None) for a call opted into the reply cache."""
+        store = get_llm_cache() if cache else None
+        if store is None:
+            return None, None
+        prompt = json.dumps([messages, kwargs], sort_keys=True, default=str)
+        key = store.key_for(cache, prompt, model or self.model, fingerprint)
+        text = store.get(cache, key)
+        if text is not None:
+            return _completion(text), None
+
+        def remember(completion):
+            try:
+                store.put(cache, key, completion.choices[0].message.content)
+            except (AttributeError, IndexError):
+                pass
+        return None, remember
+
+    async def complete(self, messages: List[Dict[str, str]], call: str = "raw", model: Optional[str] = None,
+                       cache: Optional[str] = None, fingerprint: str = "", **kwargs):
+        """
+        Chat completion, awaitable from any event loop without blocking it.
+        ``cache`` names the prompt class to look up / store the reply under (None bypasses the cache).
+        """
+        cached, remember = self._cache_lookup(cache, fingerprint, messages, model, kwargs)
+        if cached is not None:
+            return cached
+        completion = await asyncio.wrap_future(self._submit(messages, call, model, kwargs))
+        if remember is not None:
+            remember(completion)
+        return completion
+
+    def complete_sync(self, messages: List[Dict[str, str]], call: str = "raw", model: Optional[str] = None,
+                      cache: Optional[str] = None, fingerprint: str = "", **kwargs):
+        """Blocking shim for legacy sync call sites; must not be called on the client's own loop."""
+        cached, remember = self._cache_lookup(cache, fingerprint, messages, model, kwargs)
+        if cached is not None:
+            return cached
+        future = self._submit(messages, call, model, kwargs)
+        # A little longer than the request timeout so queueing for a slot (and a burst's worth
+        # of rate limiting) is covered too
+        backlog = self.limiter.capacity / self.limiter.rate if self.limiter is not None else 0
+        completion = future.result(timeout=self.timeout * 2 + 5 + backlog)
+        if remember is not None:
+            remember(completion)
+        return completion
+
+    def stream_sync(self, messages: List[Dict[str, str]], call: str = "stream", model: Optional[str] = None,
+                    **kwargs) -> Iterator[str]:
+        """
+        Blocking iterator over the reply's text deltas as they arrive, for legacy sync call sites.
+        Errors (including timeouts) are raised from the iterator; closing it early cancels the request.
+        """
+        deltas: "queue.Queue" = queue.Queue()
+        done = object()
+        future = asyncio.run_coroutine_threadsafe(
+            self._stream(messages, call, model, kwargs, deltas.put_nowait), self._ensure_loop())
+        future.add_done_callback(lambda _f: deltas.put_nowait(done))
+        backlog = self.limiter.capacity / self.limiter.rate if self.limiter is not None else 0
+        wait = self.timeout * 2 + 5 + backlog
+        try:
+            while True:
+                try:
+                    item = deltas.get(timeout=wait)
+                except queue.Empty:
+                    raise asyncio.TimeoutError(f"LLM stream stalled for {wait:.0f}s")
+                if item is done:
+                    future.result()  # re-raise a failed stream
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+    async def _aclose(self):
+        if self._client is not None:
+            await self._client.close()
+        if self._session is not None:
+            await self._session.close()
+        self._client = self._session = None
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._aclose(), loop).result(timeout=5)
+        except Exception as e:
+            logger.debug(f"LLM client close failed: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        loop.close()
+        self._semaphore = None
+
+
+def _delta_text(chunk) -> str:
+    """Text of one streamed chunk (openai>=1 objects and 0.27 OpenAIObjects both allow attribute access)."""
+    choices = getattr(chunk, "choices", None)
+    if not choices:
+        return ""
+    delta = getattr(choices[0], "delta", None)
+    return getattr(delta, "content", None) or ""
+
+
+def _completion(text: str):
+    """A cached reply in the SDK's response shape."""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text), finish_reason="stop")])
+
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """The process-wide client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = LLMClient()
+        return _client
+
+
+def close_llm_client() -> None:
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
@@ -0,0 +1,60 @@
+"""Turn a streamed completion into chat-sized messages as it is generated.
+
+Twitch replies used to wait for the whole completion and then be split into
+400-character chunks. ``sentence_chunks`` instead emits a message as soon as
+the buffered text ends a sentence (once it holds at least ``min_chars``), or
+when it would outgrow the ``max_bytes`` budget (split at the last space), so
+the first sentence reaches chat while the rest is still being written.
+"""
+import re
+from typing import Iterable, Iterator, Tuple
+
+# End of a sentence: terminal punctuation, optional closing quote/bracket, then whitespace
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s")
+
+
+def _utf8_len(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def _split_at_budget(text: str, max_bytes: int) -> int:
+    """Index to cut ``text`` at so the head fits ``max_bytes``: the last space that fits, else a hard cut."""
+    cut = len(text)
+    while cut > 0 and _utf8_len(text[:cut]) > max_bytes:
+        cut -= 1
+    space = text.rfind(" ", 0, cut + 1)
+    return space if space > 0 else max(cut, 1)
+
+
+def sentence_chunks(deltas: Iterable[str], min_chars: int = 150, max_bytes: int = 400) -> Iterator[Tuple[str, bool]]:
+    """
+    Yield ``(message, is_last)`` from text deltas. Messages end at sentence
+    boundaries, are at least ``min_chars`` long (except the last) and at most
+    ``max_bytes`` UTF-8 bytes. A reply no longer than ``min_chars`` comes out
+    as one last message.
+    """
+    buffer = ""
+    for delta in deltas:
+        buffer += delta
+        while True:
+            boundary = None
+            for match in _SENTENCE_END.finditer(buffer):
+                if _utf8_len(buffer[:match.end()]) > max_bytes:
+                    break
+                if match.end() >= min_chars:
+                    boundary = match.end()
+            if boundary is None and _utf8_len(buffer) > max_bytes:
+                boundary = _split_at_budget(buffer, max_bytes)
+            if boundary is None:
+                break
+            head, buffer = buffer[:boundary].strip(), buffer[boundary:].lstrip()
+            if head:
+                yield head, False
+    while buffer.strip():
+        if _utf8_len(buffer) <= max_bytes:
+            yield buffer.strip(), True
+            return
+        cut = _split_at_budget(buffer, max_bytes)
+        head, buffer = buffer[:cut].strip(), buffer[cut:].lstrip()
+        if head:
+            yield head, not buffer.strip()
@@ -0,0 +1,310 @@
+"""Prometheus-style runtime metrics served over local HTTP.
+
+With ``METRICS_ENABLED`` set, run_core serves ``GET /metrics`` on
+``METRICS_HOST:METRICS_PORT`` (127.0.0.1:9108 by default) in the Prometheus
+text format, so a local Prometheus / Grafana can chart a whole stream. Only the
+standard library is used; nothing is pushed anywhere.
+
+Counters and histograms are updated where things happen:
+
+- ``bot_events_processed_total{type}``: BotCore events by kind
+- ``bot_chat_messages_in_total{platform}`` / ``bot_chat_messages_out_total{platform}``
+- ``bot_llm_request_seconds{call}``: OpenAI completions (count and latency)
+- ``bot_executor_job_seconds{pool}``: jobs on the named executors; ``pool="db"``
+  is the repositories' and FSL database calls
+- ``bot_replay_parse_seconds``: replay parses
+- ``bot_cache_requests_total{cache,result}``: cache hits and misses
+- ``bot_sc2_polls_total{result}``: SC2 client polls (``ok``, ``no_game``, ``error``)
+- ``bot_stream_production_last_success_timestamp_seconds`` and
+  ``bot_stream_production_heartbeat_age_seconds``: stream-production poll freshness
+
+Queue depths, loop lag and the instrumentation spans are read at scrape time
+by collectors (see ``register_collector``).
+"""
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.config_utils import cfg
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# (metric name, type, help, [(sample name, labels, value), ...]) produced by a collector at scrape time
+Sample = Tuple[str, Dict[str, str], float]
+Family = Tuple[str, str, str, List[Sample]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self._labels(k))} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> (per-bucket counts incl. +Inf, sum)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block; also usable as a decorator on sync functions."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s)) for k, (c, s) in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bucket_labels = dict(labels, le=_format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics plus collectors evaluated on every scrape."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                logger.debug(f"Metrics collector {collector!r} failed: {e}")
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(f"{sample}{_format_labels(labels)} {_format_value(value)}"
+                             for sample, labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+EVENTS_PROCESSED = REGISTRY.counter("bot_events_processed_total", "BotCore events processed", ("type",))
+CHAT_MESSAGES_IN = REGISTRY.counter("bot_chat_messages_in_total", "Chat messages received", ("platform",))
+CHAT_MESSAGES_OUT = REGISTRY.counter("bot_chat_messages_out_total", "Chat messages sent", ("platform",))
+LLM_REQUEST_SECONDS = REGISTRY.histogram("bot_llm_request_seconds", "OpenAI completion latency", ("call",))
+EXECUTOR_JOB_SECONDS = REGISTRY.histogram("bot_executor_job_seconds", "Run time of executor jobs", ("pool",))
+REPLAY_PARSE_SECONDS = REGISTRY.histogram("bot_replay_parse_seconds", "Replay parse time",
+                                          buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0))
+CACHE_REQUESTS = REGISTRY.counter("bot_cache_requests_total", "Cache lookups", ("cache", "result"))
+SC2_POLLS = REGISTRY.counter("bot_sc2_polls_total", "SC2 client polls", ("result",))
+STREAM_PRODUCTION_LAST_SUCCESS = REGISTRY.gauge(
+    "bot_stream_production_last_success_timestamp_seconds", "Unix time of the last successful stream-production poll")
+STREAM_PRODUCTION_HEARTBEAT_AGE = REGISTRY.gauge(
+    "bot_stream_production_heartbeat_age_seconds", "Age of the stream-production heartbeat at the last poll")
+
+
+def _runtime_families() -> Iterable[Family]:
+    """Executor and instrumentation state at scrape time."""
+    from core.executors import executor_stats
+    from core.instrumentation import get_instrumentation
+
+    pools = executor_stats()
+    yield ("bot_executor_queued", "gauge", "Jobs waiting for an executor thread",
+           [("bot_executor_queued", {"pool": name}, s["queued"]) for name, s in pools.items()])
+    yield ("bot_executor_running", "gauge", "Jobs running on an executor",
+           [("bot_executor_running", {"pool": name}, s["running"]) for name, s in pools.items()])
+
+    snapshot = get_instrumentation().snapshot()
+    lag = snapshot["loop_lag"]
+    yield ("bot_event_loop_lag_seconds", "summary", "Event loop lag over the recent window",
+           _summary_samples("bot_event_loop_lag_seconds", {}, lag))
+    span_samples: List[Sample] = []
+    for name, stats in snapshot["spans"].items():
+        span_samples.extend(_summary_samples("bot_span_seconds", {"span": name}, stats))
+    yield ("bot_span_seconds", "summary", "Instrumented span durations over the recent window", span_samples)
+    lanes = snapshot["lanes"]
+    if lanes:
+        yield ("bot_lane_depth", "gauge", "Events waiting in a BotCore lane",
+               [("bot_lane_depth", {"lane": name}, s["depth"]) for name, s in lanes.items()])
+        yield ("bot_lane_dropped_total", "counter", "Chat events dropped or merged by lane overflow policy",
+               [("bot_lane_dropped_total", {"lane": name}, s["dropped"] + s["merged"])
+                for name, s in lanes.items()])
+
+
+def _summary_samples(name: str, labels: Dict[str, str], stats: Dict[str, float]) -> List[Sample]:
+    samples = [(name, dict(labels, quantile=q), stats[key] / 1000)
+               for q, key in (("0.5", "p50_ms"), ("0.9", "p90_ms"), ("0.99", "p99_ms"))]
+    # _count is the lifetime count; quantiles cover only the rolling window
+    samples.append((f"{name}_count", labels, stats["total"]))
+    return samples
+
+
+REGISTRY.register_collector(_runtime_families)
+
+
+def register_collector(collector: Callable[[], Iterable[Family]]) -> None:
+    REGISTRY.register_collector(collector)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.decode("latin-1").split()
+        path = parts[1].split("?", 1)[0] if len(parts) > 1 else ""
+        if len(parts) > 1 and parts[0] == "GET" and path in ("/", "/metrics"):
+            status, body = "200 OK", render().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            status, body, content_type = "404 Not Found", b"not found\n", "text/plain"
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    except Exception as e:
+        logger.debug(f"Metrics request failed: {e}")
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(host=None, port=None) -> Optional[asyncio.AbstractServer]:
+    """Serve /metrics on the running loop; returns the server, or None if it could not bind."""
+    host = cfg(host, "METRICS_HOST", "127.0.0.1")
+    port = int(cfg(port, "METRICS_PORT", 9108))
+    try:
+        server = await asyncio.start_server(_handle, host, port)
+    except OSError as e:
+        logger.error(f"Metrics endpoint could not listen on {host}:{port}: {e}")
+        return None
+    logger.info(f"Metrics endpoint on http://{host}:{port}/metrics")
+    return server
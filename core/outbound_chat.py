@@ -0,0 +1,192 @@
+"""Single rate-limited send queue for Twitch chat.
+
+Every outbound Twitch line (``msgToChannel``, ``TwitchAdapter.send_message``,
+FSL voting notices, the post-game pattern-learning lines) goes through one
+``OutboundChatQueue`` per bot instead of calling ``connection.privmsg`` from
+whichever thread or task produced it:
+
+- a token bucket keeps us inside Twitch's per-30-second message budget
+  (``TWITCH_SEND_MESSAGES_PER_WINDOW`` / ``TWITCH_SEND_WINDOW_SECONDS``), so
+  the server never silently drops a line;
+- lines waiting on the budget are packed: consecutive messages for the same
+  channel are joined with `` | `` into one PRIVMSG while they fit in
+  ``TWITCH_CHAT_BYTE_LIMIT`` bytes, and messages over the limit are split on
+  word (never UTF-8 character) boundaries;
+- game-critical lines jump the queue. Callers pass ``priority=True``, or run
+  inside ``game_critical_chat`` (GameResultService's game-end flow).
+
+Until ``run()`` is started on the event loop, ``send`` writes straight to IRC
+(split to the byte limit), which keeps the legacy standalone bot unchanged.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import re
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+from core.config_utils import cfg
+from core.metrics import CHAT_MESSAGES_OUT
+from core.rate_limit import TokenBucket
+from utils import tokensArray
+
+logger = logging.getLogger(__name__)
+
+SEPARATOR = " | "
+
+game_critical = contextvars.ContextVar("game_critical_chat", default=False)
+
+
+def game_critical_chat(fn):
+    """Decorate an async function so chat it sends (directly or via awaited calls) is sent with priority."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        token = game_critical.set(True)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            game_critical.reset(token)
+    return wrapper
+
+
+def truncate_utf8(text: str, byte_limit: int) -> str:
+    """Longest prefix of text that encodes to at most byte_limit bytes."""
+    return text.encode("utf-8")[:byte_limit].decode("utf-8", errors="ignore")
+
+
+def split_for_chat(text: str, byte_limit: int) -> List[str]:
+    """Split text into lines of at most byte_limit UTF-8 bytes, breaking between words where possible."""
+    chunks: List[str] = []
+    current = ""
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if len(candidate.encode("utf-8")) <= byte_limit:
+            current = candidate
+            continue
+        if current:
+            chunks.append(current)
+        # A single word over the limit is cut on character boundaries
+        while len(word.encode("utf-8")) > byte_limit:
+            head = truncate_utf8(word, byte_limit)
+            chunks.append(head)
+            word = word[len(head):]
+        current = word
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class OutboundChatQueue:
+    """Token-bucket limited, packing send queue in front of one IRC connection."""
+
+    def __init__(self, send_raw: Callable[[str, str], None], byte_limit=None, messages_per_window=None,
+                 window_seconds=None, burst=None, separator: str = SEPARATOR):
+        self.send_raw = send_raw
+        self.byte_limit = int(cfg(byte_limit, "TWITCH_CHAT_BYTE_LIMIT", 450))
+        limit = max(1, int(cfg(messages_per_window, "TWITCH_SEND_MESSAGES_PER_WINDOW", 20)))
+        window = float(cfg(window_seconds, "TWITCH_SEND_WINDOW_SECONDS", 30))
+        burst = max(1, min(limit, int(cfg(burst, "TWITCH_SEND_BURST", 5))))
+        # burst + refill over one window stays within the server's budget for any window
+        self.bucket = TokenBucket(rate=max(limit - burst, 1) / window, capacity=burst)
+        self.separator = separator
+        self._urgent: Deque[Tuple[str, str]] = deque()
+        self._normal: Deque[Tuple[str, str]] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running = False
+        self.sent = 0
+        self.packed = 0
+
+    def send(self, channel: str, text: str, priority: bool = False) -> None:
+        """Queue a chat line (safe to call from any thread)."""
+        # IRC PRIVMSG must not contain CR/LF (Twitch: "Carriage returns not allowed")
+        text = re.sub(r"[\r\n]+", SEPARATOR, text or "").strip()
+        if not text:
+            return
+        priority = priority or game_critical.get()
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            for chunk in split_for_chat(text, self.byte_limit):
+                self._send_now(channel, chunk)
+            return
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        if current is loop:
+            self._enqueue(channel, text, priority)
+        else:
+            loop.call_soon_threadsafe(self._enqueue, channel, text, priority)
+
+    def _enqueue(self, channel: str, text: str, priority: bool) -> None:
+        (self._urgent if priority else self._normal).append((channel, text))
+        self._wakeup.set()
+
+    def pending(self) -> int:
+        return len(self._urgent) + len(self._normal)
+
+    def stats(self) -> dict:
+        return {"pending": self.pending(), "sent": self.sent, "packed": self.packed,
+                "tokens": round(self.bucket.tokens, 2)}
+
+    def _next_line(self) -> Tuple[str, str]:
+        """Pop one PRIVMSG worth of text: the next message, plus any followers that fit."""
+        lane = self._urgent if self._urgent else self._normal
+        channel, text = lane.popleft()
+        chunks = split_for_chat(text, self.byte_limit)
+        line = chunks[0]
+        # The remainder of a long message stays at the front so its order is kept
+        for rest in reversed(chunks[1:]):
+            lane.appendleft((channel, rest))
+        if len(chunks) > 1:
+            return channel, line
+        size = len(line.encode("utf-8"))
+        sep_size = len(self.separator.encode("utf-8"))
+        while lane and lane[0][0] == channel:
+            follower = lane[0][1]
+            follower_size = len(follower.encode("utf-8"))
+            if size + sep_size + follower_size > self.byte_limit:
+                break
+            lane.popleft()
+            line = f"{line}{self.separator}{follower}"
+            size += sep_size + follower_size
+            self.packed += 1
+        return channel, line
+
+    def _send_now(self, channel: str, line: str) -> None:
+        try:
+            self.send_raw(channel, line)
+            self.sent += 1
+            CHAT_MESSAGES_OUT.inc(platform="twitch")
+            logger.info(f"Sent to Twitch: {tokensArray.replace_non_ascii(line, replacement='?')}")
+        except Exception as e:
+            logger.error(f"Failed to send message to Twitch: {e}")
+
+    async def run(self) -> None:
+        """Drain the queue on the current loop until stop() is called."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._running = True
+        logger.info("Outbound Twitch chat queue started")
+        try:
+            while self._running:
+                if not self.pending():
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                wait = self.bucket.try_acquire()
+                if wait > 0:
+                    # Lines arriving meanwhile are packed into the next PRIVMSG
+                    await asyncio.sleep(wait)
+                    continue
+                self._send_now(*self._next_line())
+        finally:
+            self._loop = None
+            if self.pending():
+                logger.warning(f"Outbound Twitch chat queue stopped with {self.pending()} unsent line(s)")
+
+    def stop(self) -> None:
+        self._running = False
+        if self._wakeup is not None and self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
@@ -0,0 +1,124 @@
+"""
+One completion for all of a known-opponent pregame's LLM lines.
+
+run_known_opponent_pregame can need several last_time_played completions before
+the game starts: the last-meeting recap, one build-order line per archived
+opening (when the deterministic opening suffix is off) and the Random GLHF
+restate. Each one resends the full last_time_played system prompt and waits its
+own round trip. When there is more than one, the composer sends them together —
+one system prompt, each segment's user message under a labeled heading — and asks
+for a JSON object of label → message. Every reply then goes through the usual
+processMessageForOpenAI pipeline (filters, suffix, truncation, chat) in the
+original order; any segment missing from the JSON (or the whole batch, if the
+call or parse fails) falls back to its own completion.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from settings import config
+from core.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+COMPOSER_INSTRUCTIONS = (
+    "You will receive several independent Twitch chat messages to write, each under a heading "
+    "'=== SEGMENT <label> ==='. Write each one exactly as you would if it were the only request, "
+    "following the rules above and only the facts in its own segment.\n"
+    "Reply with ONLY a JSON object mapping every label to its message text, e.g. "
+    '{"last_meeting": "...", "build_order_1": "..."}. No markdown, no commentary.'
+)
+
+_JSON_OBJECT = re.compile(r"\{.*\}", re.DOTALL)
+
+
+@dataclass
+class PregameSegment:
+    """One pregame chat line the LLM writes (a last_time_played user message)."""
+
+    label: str
+    message: str
+    response_suffix: str = ""
+
+
+def compose_user_message(segments: List[PregameSegment]) -> str:
+    return "\n\n".join(f"=== SEGMENT {s.label} ===\n{s.message}" for s in segments)
+
+
+def parse_segment_replies(text: str, labels: List[str]) -> Dict[str, str]:
+    """Label → reply for the labels present (as non-empty strings) in the model's JSON answer."""
+    match = _JSON_OBJECT.search(text or "")
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        label: data[label].strip()
+        for label in labels
+        if isinstance(data.get(label), str) and data[label].strip()
+    }
+
+
+def compose_pregame_segments(segments: List[PregameSegment], log=None) -> Dict[str, str]:
+    """One structured completion for all segments; {} if it fails."""
+    from api.chat_utils import (
+        LAST_TIME_PLAYED_INSTRUCTIONS,
+        LAST_TIME_PLAYED_SYSTEM_SUFFIX,
+        send_prompt_to_openai_system_user,
+    )
+
+    log = log or logger
+    system_msg = (
+        LAST_TIME_PLAYED_INSTRUCTIONS + "\n\n" + LAST_TIME_PLAYED_SYSTEM_SUFFIX + "\n\n" + COMPOSER_INSTRUCTIONS
+    )
+    labels = [s.label for s in segments]
+    try:
+        with span("pregame.composer"):
+            completion = send_prompt_to_openai_system_user(system_msg, compose_user_message(segments))
+        replies = parse_segment_replies(completion.choices[0].message.content, labels)
+    except Exception as e:
+        log.warning("[pregame] composer call failed, falling back to one call per segment: %s", e)
+        return {}
+    missing = [label for label in labels if label not in replies]
+    if missing:
+        log.info("[pregame] composer reply missing segments %s; those use their own call", missing)
+    return replies
+
+
+def emit_pregame_segments(
+    bot,
+    segments: List[PregameSegment],
+    log,
+    context_history: list,
+    process: Callable,
+    *,
+    suppress_last_time_sc2_alias_substitution: bool = False,
+) -> None:
+    """
+    Send the segments to chat in order through ``process`` (processMessageForOpenAI),
+    with one composed completion for all of them when there is more than one.
+    """
+    replies: Dict[str, str] = {}
+    if len(segments) > 1 and getattr(config, "PREGAME_SINGLE_CALL", True):
+        replies = compose_pregame_segments(segments, log)
+    for segment in segments:
+        reply: Optional[str] = replies.get(segment.label)
+        kwargs = {"precomputed_reply": reply} if reply is not None else {}
+        process(
+            bot,
+            segment.message,
+            "last_time_played",
+            log,
+            context_history,
+            response_suffix=segment.response_suffix,
+            suppress_last_time_sc2_alias_substitution=suppress_last_time_sc2_alias_substitution,
+            **kwargs,
+        )
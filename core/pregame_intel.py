@@ -2,6 +2,7 @@
 Pre-game intel: gather facts into PreGameBrief, then run_known_opponent_pregame executes
 saved-notes formatting → pattern/ML check (always when DB available) → ML chat line only if no formatted notes
 → last-meeting LLM → optional DB build LLM (skipped when notes or strong pattern/learning intel) → optional GLHF line → record.
+When more than one LLM line is needed they are written by a single composed completion (core.pregame_composer).
 
 Uses conversation_mode \"last_time_played\" for factual OpenAI lines (no mood/perspective).
 """
@@ -20,6 +21,7 @@ from api.chat_utils import (
     substitute_streamer_aliases_for_chat_display,
     twitch_notes_from_saved_comments,
 )
+from core.pregame_composer import PregameSegment, emit_pregame_segments
 
 
 def _co_cast_guest_ladder_names_lower() -> set:
@@ -92,6 +94,7 @@ def compute_suppress_last_time_sc2_alias_substitution(
     )
     return suppress
 from api.ml_opponent_analyzer import get_ml_analyzer
+from core.instrumentation import span
 from utils.time_utils import parse_game_duration_seconds_from_summary
 
 
@@ -944,14 +947,15 @@ def run_known_opponent_pregame(
             last_ad: Optional[Dict[str, Any]] = None
             max_sim = 0.0
             for race, db_row, _, _ in brief.random_race_intel:
-                per = analyzer.analyze_opponent_for_chat(
-                    brief.opponent_display_name,
-                    race,
-                    log,
-                    db,
-                    db_row,
-                    prefer_learning_data=False,
-                )
+                with span("pregame.ml_analysis"):
+                    per = analyzer.analyze_opponent_for_chat(
+                        brief.opponent_display_name,
+                        race,
+                        log,
+                        db,
+                        db_row,
+                        prefer_learning_data=False,
+                    )
                 if not per:
                     continue
                 last_ad = per
@@ -996,14 +1000,15 @@ def run_known_opponent_pregame(
                 ml_supersedes_build_intel,
             )
         elif db is not None:
-            analysis_data = analyzer.analyze_opponent_for_chat(
-                brief.opponent_display_name,
-                brief.opponent_race,
-                log,
-                db,
-                None,
-                prefer_learning_data=True,
-            )
+            with span("pregame.ml_analysis"):
+                analysis_data = analyzer.analyze_opponent_for_chat(
+                    brief.opponent_display_name,
+                    brief.opponent_race,
+                    log,
+                    db,
+                    None,
+                    prefer_learning_data=True,
+                )
             atype = (analysis_data or {}).get("analysis_type")
             max_sim = 0.0
             if analysis_data and atype == "pattern_matching":
@@ -1160,19 +1165,11 @@ def run_known_opponent_pregame(
         )
 
     opening_suffix = deterministic_opponent_opening_suffix(brief) if use_det_opening else ""
+    suppress_alias = getattr(brief, "suppress_last_time_sc2_alias_substitution", False)
 
-    processMessageForOpenAI(
-        bot,
-        lm,
-        "last_time_played",
-        logger,
-        context_history,
-        response_suffix=opening_suffix,
-        suppress_last_time_sc2_alias_substitution=getattr(
-            brief, "suppress_last_time_sc2_alias_substitution", False
-        ),
-    )
-
+    # LLM lines in send order; emit_pregame_segments writes them with one completion when there are several
+    segments = [PregameSegment("last_meeting", lm, response_suffix=opening_suffix)]
+    glhf_line = None
     if (
         build_blocks
         and not ml_analysis_ran
@@ -1180,17 +1177,8 @@ def run_known_opponent_pregame(
         and not ml_supersedes_build_intel
         and not use_det_opening
     ):
-        for block in build_blocks:
-            processMessageForOpenAI(
-                bot,
-                block,
-                "last_time_played",
-                logger,
-                context_history,
-                suppress_last_time_sc2_alias_substitution=getattr(
-                    brief, "suppress_last_time_sc2_alias_substitution", False
-                ),
-            )
+        for i, block in enumerate(build_blocks, start=1):
+            segments.append(PregameSegment(f"build_order_{i}", block))
     elif not build_blocks:
         if quiet_when_no_build_extract:
             pass
@@ -1201,23 +1189,21 @@ def run_known_opponent_pregame(
                 f"restate this:  good luck playing {brief.opponent_display_name} in this "
                 f"{brief.streamer_current_race} versus {brief.opponent_race} matchup.  Random is tricky."
             )
-            processMessageForOpenAI(
-                bot,
-                msg,
-                "last_time_played",
-                logger,
-                context_history,
-                suppress_last_time_sc2_alias_substitution=getattr(
-                    brief, "suppress_last_time_sc2_alias_substitution", False
-                ),
-            )
+            segments.append(PregameSegment("glhf", msg))
         else:
             glhf_phrase = getattr(config, "PREGAME_GLHF_PHRASE", "GLHFGG")
-            msgToChannel(
-                bot,
-                f"{glhf_phrase} vs {brief.opponent_display_name} ({brief.opponent_race}).",
-                logger,
-            )
+            glhf_line = f"{glhf_phrase} vs {brief.opponent_display_name} ({brief.opponent_race})."
+
+    emit_pregame_segments(
+        bot,
+        segments,
+        logger,
+        context_history,
+        processMessageForOpenAI,
+        suppress_last_time_sc2_alias_substitution=suppress_alias,
+    )
+    if glhf_line:
+        msgToChannel(bot, glhf_line, logger)
 
     line = (
         format_record_line(brief.record_vs, brief.opponent_display_name)
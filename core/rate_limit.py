@@ -0,0 +1,52 @@
+"""Token-bucket rate limiting shared by outbound chat and other budgeted calls."""
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    ``capacity`` tokens refilled continuously at ``rate`` tokens per second.
+
+    Thread-safe: ``try_acquire`` can be called from executor threads and the
+    event loop alike. Over any window of W seconds at most
+    ``capacity + rate * W`` tokens are handed out.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("TokenBucket rate and capacity must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens and return 0.0, or take nothing and return the seconds until they are available."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait (without blocking the loop) until tokens can be taken."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
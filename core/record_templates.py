@@ -0,0 +1,186 @@
+"""Deterministic chat lines for the record-restatement commands.
+
+``career``, ``history`` and ``head to head`` used to hand the DB rows to the
+LLM with a few-shot example just to get them reformatted ("overall: 425-394,
+each matchup: PvP 15-51 ..."). These templates build the same lines directly
+from the strings the Database methods return:
+
+- W-L compression ("12 wins - 7 losses" -> "12-7") and overall totals;
+- matchup abbreviations ("Zerg vs Protoss" -> "ZvP");
+- packing into as few messages as fit ``TWITCH_CHAT_BYTE_LIMIT``, splitting
+  only between items.
+
+A formatter returns None when the data is not in the expected shape, and the
+caller falls back to the LLM prompt. With ``RECORD_TEMPLATE_FLOURISH`` on, a
+short LLM comment follows as a separate message after the facts are sent.
+"""
+import logging
+import re
+from typing import Iterable, List, Optional, Tuple
+
+import settings.config as config
+
+logger = logging.getLogger(__name__)
+
+RACE_INITIALS = {"protoss": "P", "terran": "T", "zerg": "Z", "random": "R"}
+
+_WINS_LOSSES = re.compile(r"(\d+)\s+wins?\s*-\s*(\d+)\s+loss(?:es)?", re.IGNORECASE)
+_RACE = r"(Protoss|Terran|Zerg|Random)"
+_RACE_MATCHUP = re.compile(
+    _RACE + r"\s+vs\s+" + _RACE + r":\s*(\d+)\s+wins?\s*-\s*(\d+)\s+loss(?:es)?", re.IGNORECASE)
+_HISTORY_ROW = re.compile(r"^(.+?),\s*(.+?),\s*(\d+)\s+wins?,\s*(\d+)\s+loss(?:es)?$", re.IGNORECASE)
+_H2H_ROW = re.compile(
+    r"^(.+?)\s+\((\w+)\)\s+vs\s+(.+?)\s+\((\w+)\),\s*(\d+)\s+wins?\s*-\s*(\d+)\s+wins?$", re.IGNORECASE)
+
+
+def _byte_limit(max_bytes: Optional[int]) -> int:
+    return int(max_bytes if max_bytes is not None else getattr(config, "TWITCH_CHAT_BYTE_LIMIT", 450))
+
+
+def _utf8_len(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def matchup_abbreviation(race: str, opponent_race: str) -> Optional[str]:
+    """"Zerg", "Protoss" -> "ZvP"; None for unknown races."""
+    first = RACE_INITIALS.get((race or "").strip().lower())
+    second = RACE_INITIALS.get((opponent_race or "").strip().lower())
+    if not first or not second:
+        return None
+    return f"{first}v{second}"
+
+
+def pack_messages(prefix: str, items: Iterable[str], separator: str = ", ", suffix: str = "",
+                  max_bytes: Optional[int] = None) -> List[str]:
+    """
+    ``prefix`` + items joined by ``separator`` (+ ``suffix`` on the last message), in as
+    few messages of at most ``max_bytes`` UTF-8 bytes as possible; continuation
+    messages carry the items only. An item too long for a message on its own is cut.
+    """
+    limit = _byte_limit(max_bytes)
+    messages: List[str] = []
+    current = prefix
+    has_items = False
+    for item in items:
+        candidate = current + (separator if has_items else "") + item
+        if _utf8_len(candidate) <= limit:
+            current, has_items = candidate, True
+            continue
+        if has_items or current:
+            messages.append(current.rstrip())
+        current, has_items = item, True
+        while _utf8_len(current) > limit:
+            cut = limit
+            while _utf8_len(current[:cut]) > limit:
+                cut -= 1
+            messages.append(current[:cut])
+            current = current[cut:]
+    if suffix and _utf8_len(current + suffix) > limit:
+        messages.append(current.rstrip())
+        current = suffix.strip()
+    else:
+        current += suffix
+    if current.strip():
+        messages.append(current.rstrip())
+    return messages
+
+
+def format_career(player_name: str, overall: Optional[str], matchups: Optional[str],
+                  max_bytes: Optional[int] = None) -> Optional[List[str]]:
+    """
+    "Overall matchup records for X: 425 wins - 394 losses" + "Race matchup records ... Zerg vs
+    Protoss: 170 wins - 137 losses ..." -> "X overall: 425-394, each matchup: ZvP 170-137, ...".
+    """
+    rows: List[Tuple[str, int, int]] = []
+    for race, opponent_race, wins, losses in _RACE_MATCHUP.findall(matchups or ""):
+        abbreviation = matchup_abbreviation(race, opponent_race)
+        if abbreviation is None:
+            return None
+        rows.append((abbreviation, int(wins), int(losses)))
+    totals = _WINS_LOSSES.findall(overall or "")
+    if totals:
+        total_wins = sum(int(w) for w, _ in totals)
+        total_losses = sum(int(l) for _, l in totals)
+    elif rows:
+        total_wins = sum(w for _, w, _ in rows)
+        total_losses = sum(l for _, _, l in rows)
+    else:
+        return None
+    if not rows:
+        return [f"{player_name} overall: {total_wins}-{total_losses}."]
+    return pack_messages(
+        f"{player_name} overall: {total_wins}-{total_losses}, each matchup: ",
+        (f"{abbreviation} {wins}-{losses}" for abbreviation, wins, losses in rows),
+        suffix=".", max_bytes=max_bytes,
+    )
+
+
+def format_history(player_name: str, records: List[str], max_bytes: Optional[int] = None) -> Optional[List[str]]:
+    """["X, Opponent, 3 wins, 1 losses", ...] -> "X's record by opponent: Opponent 3-1, ..."."""
+    items = []
+    for record in records:
+        match = _HISTORY_ROW.match((record or "").strip())
+        if not match:
+            return None
+        _, opponent, wins, losses = match.groups()
+        items.append(f"{opponent} {int(wins)}-{int(losses)}")
+    if not items:
+        return None
+    return pack_messages(f"{player_name}'s record by opponent: ", items, suffix=".", max_bytes=max_bytes)
+
+
+def format_head_to_head(player1: str, player2: str, records: List[str],
+                        max_bytes: Optional[int] = None) -> Optional[List[str]]:
+    """
+    ["A (Terran) vs B (Zerg), 29 wins - 7 wins", ...] ->
+    "A vs B overall: 50-24, each matchup: TvZ 29-7, ..." (from A's side).
+    """
+    rows = []
+    for record in records:
+        match = _H2H_ROW.match((record or "").strip())
+        if not match:
+            return None
+        _, race, _, opponent_race, wins, opponent_wins = match.groups()
+        abbreviation = matchup_abbreviation(race, opponent_race)
+        if abbreviation is None:
+            return None
+        rows.append((abbreviation, int(wins), int(opponent_wins)))
+    if not rows:
+        return None
+    total_wins = sum(w for _, w, _ in rows)
+    total_losses = sum(l for _, _, l in rows)
+    return pack_messages(
+        f"{player1} vs {player2} overall: {total_wins}-{total_losses}, each matchup: ",
+        (f"{abbreviation} {wins}-{losses}" for abbreviation, wins, losses in rows),
+        suffix=".", max_bytes=max_bytes,
+    )
+
+
+def templates_enabled() -> bool:
+    return bool(getattr(config, "RECORD_TEMPLATES_ENABLED", True))
+
+
+def flourish_enabled() -> bool:
+    return bool(getattr(config, "RECORD_TEMPLATE_FLOURISH", False))
+
+
+def flourish_prompt(facts: List[str]) -> str:
+    return (
+        "In at most 10 words, add one casual comment for Twitch chat about this StarCraft 2 record. "
+        "Do not repeat the numbers. Record: " + " ".join(facts)
+    )
+
+
+async def send_with_flourish(context, llm, lines: List[str], prompt_class: str) -> None:
+    """Send the template lines, then (if enabled) a short LLM comment as its own message."""
+    for line in lines:
+        await context.chat_service.send_message(context.channel, line)
+    if not flourish_enabled():
+        return
+    try:
+        comment = (await llm.generate_raw(flourish_prompt(lines), cache=prompt_class) or "").strip()
+    except Exception as e:
+        logger.debug(f"Record flourish skipped: {e}")
+        return
+    if comment:
+        await context.chat_service.send_message(context.channel, comment)
@@ -0,0 +1,102 @@
+"""Tiered, lazily upgraded access to a single replay file.
+
+Most interactions only need a fraction of what a full spawningtool parse produces:
+
+- ``HEADER``: players (name, pick/played race, result), map, region, game type,
+  timestamp and length. Read from the replay's details/init data only; no event
+  streams are decoded.
+- ``FULL``: the regular ``replay_parser_pool.parse_replay`` result (worker pool +
+  parsed-replay cache), identical to what game end stores.
+
+Both tiers are read in the replay parser pool's worker processes (when enabled),
+so the per-parse timeout, memory cap and crash isolation apply to header reads
+too. A ``LazyReplay`` keeps only the highest tier it has loaded and answers the
+header from a full parse, so asking for the header after a full parse costs
+nothing, and asking for more upgrades on demand.
+"""
+import logging
+from enum import IntEnum
+from typing import Dict, Optional
+
+from core import replay_parser_pool
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayTier(IntEnum):
+    HEADER = 1
+    FULL = 2
+
+
+def read_header(path: str) -> Dict:
+    """
+    Spawningtool-shaped replay_data without build orders, from details/init data only.
+    Runs sc2reader in the calling process: use ``replay_parser_pool.parse_header`` (workers) instead.
+    """
+    import sc2reader
+    from spawningtool import hots_constants, lotv_constants
+
+    replay = sc2reader.load_replay(path, load_level=2)
+    fps = lotv_constants.FRAMES_PER_SECOND if replay.expansion == 'LotV' else hots_constants.FRAMES_PER_SECOND
+    return {
+        'unix_timestamp': replay.unix_timestamp,
+        'frames': replay.frames,
+        'frames_per_second': fps,
+        'game_type': replay.real_type,
+        'region': replay.region,
+        'map': replay.map_name,
+        'build': replay.build,
+        'expansion': replay.expansion,
+        'players': {
+            key: {
+                'name': player.name,
+                'pick_race': player.pick_race,
+                'race': player.play_race,
+                'is_winner': player.team.result == 'Win',
+                'result': player.team.result,
+                'is_human': player.is_human,
+                'uid': player.toon_id,
+                'region': player.region,
+                'team': player.team.number,
+            } for key, player in replay.player.items()
+        },
+    }
+
+
+def _strip_to_header(replay_data: Dict) -> Dict:
+    header = {k: v for k, v in replay_data.items() if k != 'players'}
+    header['players'] = {
+        key: {k: v for k, v in player.items() if k not in ('buildOrder', 'unitsLost', 'abilities', 'supply')}
+        for key, player in (replay_data.get('players') or {}).items()
+    }
+    return header
+
+
+class LazyReplay:
+    """One replay file; each accessor loads the cheapest tier that can answer it."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tier: Optional[ReplayTier] = None
+        self._data: Optional[Dict] = None
+
+    def _load(self, tier: ReplayTier) -> None:
+        if self.tier is not None and self.tier >= tier:
+            return
+        if tier == ReplayTier.HEADER:
+            self._data = replay_parser_pool.parse_header(self.path)
+        else:
+            self._data = replay_parser_pool.parse_replay(self.path)
+        logger.debug(f"Replay {self.path} loaded at tier {tier.name}")
+        self.tier = tier
+
+    def header(self) -> Dict:
+        self._load(ReplayTier.HEADER)
+        return self._data if self.tier == ReplayTier.HEADER else _strip_to_header(self._data)
+
+    def full(self) -> Dict:
+        self._load(ReplayTier.FULL)
+        return self._data
+
+    def get(self, tier: ReplayTier) -> Dict:
+        return {ReplayTier.HEADER: self.header, ReplayTier.FULL: self.full}[tier]()
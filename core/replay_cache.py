@@ -0,0 +1,164 @@
+"""Content-addressed on-disk cache of parsed replay output.
+
+Retries ('please retry', 'please replay', the deferred unlock retry) usually
+re-parse a replay that was parsed moments earlier. Entries are keyed by the
+SHA-256 of the replay bytes plus the parser versions, so a renamed/copied file
+still hits and a spawningtool/sc2reader upgrade naturally invalidates old data.
+
+Entries are zlib-compressed pickles. Recency is the entry file's mtime (touched
+on every hit); when the directory grows past the size budget the least recently
+used entries are evicted.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import zlib
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Callable, Optional
+
+import settings.config as config
+from core.config_utils import cfg
+from core.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".replay.zpkl"
+
+
+def parser_version() -> str:
+    """Version tag of the parsing stack; part of every cache key."""
+    parts = []
+    for package in ("spawningtool", "sc2reader"):
+        try:
+            parts.append(f"{package}-{version(package)}")
+        except PackageNotFoundError:
+            parts.append(f"{package}-unknown")
+    return "+".join(parts)
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ParsedReplayCache:
+    """Size-bounded LRU cache of parsed replays on disk; safe to share across threads."""
+
+    def __init__(self, directory=None, max_mb=None, parser_tag=None):
+        self.directory = cfg(directory, "REPLAY_CACHE_DIR", os.path.join("temp", "replay_cache"))
+        self.max_bytes = int(float(cfg(max_mb, "REPLAY_CACHE_MAX_MB", 200)) * 1024 * 1024)
+        self.version = parser_tag or parser_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key_for(self, path: str) -> str:
+        version_tag = hashlib.sha256(self.version.encode("utf-8")).hexdigest()[:12]
+        return f"{file_digest(path)}-{version_tag}"
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entry_path(key)
+        try:
+            with open(entry, "rb") as f:
+                data = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            self.misses += 1
+            CACHE_REQUESTS.inc(cache="replay", result="miss")
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable replay cache entry {entry}: {e}")
+            self._remove(entry)
+            self.misses += 1
+            CACHE_REQUESTS.inc(cache="replay", result="miss")
+            return None
+        try:
+            os.utime(entry, None)
+        except OSError:
+            pass
+        self.hits += 1
+        CACHE_REQUESTS.inc(cache="replay", result="hit")
+        return data
+
+    def put(self, key: str, replay_data: Any) -> None:
+        blob = zlib.compress(pickle.dumps(replay_data, protocol=pickle.HIGHEST_PROTOCOL), 6)
+        if len(blob) > self.max_bytes:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, self._entry_path(key))
+        except OSError as e:
+            logger.warning(f"Could not write replay cache entry: {e}")
+            self._remove(tmp)
+            return
+        self._evict()
+
+    def get_or_parse(self, path: str, parse: Callable[[str], Any]) -> Any:
+        """Return the cached parse of ``path`` or run ``parse(path)`` and store it."""
+        try:
+            key = self.key_for(path)
+        except OSError as e:
+            logger.debug(f"Replay cache bypassed (cannot hash {path}): {e}")
+            return parse(path)
+        cached = self.get(key)
+        if cached is not None:
+            logger.debug(f"Replay cache hit: {path}")
+            return cached
+        replay_data = parse(path)
+        if replay_data is not None:
+            self.put(key, replay_data)
+        return replay_data
+
+    def _evict(self) -> None:
+        with self._lock:
+            try:
+                entries = []
+                for name in os.listdir(self.directory):
+                    if not name.endswith(_SUFFIX):
+                        continue
+                    full = os.path.join(self.directory, name)
+                    st = os.stat(full)
+                    entries.append((st.st_mtime, st.st_size, full))
+            except OSError:
+                return
+            total = sum(size for _mtime, size, _path in entries)
+            if total <= self.max_bytes:
+                return
+            for _mtime, size, full in sorted(entries):
+                self._remove(full)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_cache: Optional[ParsedReplayCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_parsed_replay_cache() -> Optional[ParsedReplayCache]:
+    """Shared cache, or None when ENABLE_REPLAY_CACHE is False."""
+    global _cache
+    if not getattr(config, "ENABLE_REPLAY_CACHE", True):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ParsedReplayCache()
+        return _cache
@@ -0,0 +1,273 @@
+"""Isolated, warm subprocess workers for spawningtool replay parsing.
+
+spawningtool/sc2reader run native-heavy code that can segfault on a corrupt file,
+and every in-process parse competes for the GIL with the chat and monitoring
+threads. Each worker here is a long-lived ``python -m core.replay_parser_pool``
+child that imports the parser once, so a crash only takes down the worker.
+
+Protocol: 4-byte big-endian length + pickle frame in both directions
+(``(kind, path)`` in, where kind is ``"full"`` for a spawningtool parse or
+``"header"`` for ``replay_access.read_header``; ``("ok", replay_data)`` /
+``("error", message)`` out). A per-parse timer kills
+a hung worker; dead workers are respawned on the next request. The memory cap
+uses RLIMIT_AS where available (POSIX); on Windows only timeout/crash isolation apply.
+"""
+import logging
+import os
+import pickle
+import queue
+import struct
+import subprocess
+import sys
+import threading
+from typing import Optional
+
+import settings.config as config
+from core.config_utils import cfg
+from core.replay_cache import get_parsed_replay_cache
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">I")
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+class ReplayParseError(Exception):
+    """Raised when a worker fails, times out, or crashes while parsing a replay."""
+
+
+def _write_frame(stream, obj) -> None:
+    data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(_HEADER.pack(len(data)))
+    stream.write(data)
+    stream.flush()
+
+
+def _read_exact(stream, n: int) -> bytes:
+    buf = b""
+    while len(buf) < n:
+        chunk = stream.read(n - len(buf))
+        if not chunk:
+            raise EOFError("replay parser worker closed the pipe")
+        buf += chunk
+    return buf
+
+
+def _read_frame(stream):
+    (length,) = _HEADER.unpack(_read_exact(stream, _HEADER.size))
+    return pickle.loads(_read_exact(stream, length))
+
+
+class _Worker:
+    """One parser subprocess plus its pipes."""
+
+    def __init__(self, memory_limit_mb: int):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "core.replay_parser_pool", str(int(memory_limit_mb or 0))],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=_PROJECT_ROOT,
+        )
+        self.killed = False
+
+    def alive(self) -> bool:
+        return not self.killed and self.process.poll() is None
+
+    def kill(self) -> None:
+        self.killed = True
+        try:
+            self.process.kill()
+        except OSError:
+            pass
+
+    def reap(self) -> None:
+        """Release the pipes of a dead worker."""
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def close(self) -> None:
+        try:
+            _write_frame(self.process.stdin, None)
+            self.process.wait(timeout=2)
+        except Exception:
+            self.kill()
+        self.reap()
+
+
+class ReplayParserPool:
+    """Small pool of warm parser subprocesses; ``parse`` is blocking and thread-safe."""
+
+    def __init__(self, size=None, timeout=None, memory_limit_mb=None):
+        self.size = max(1, int(cfg(size, "REPLAY_PARSER_WORKERS", 1)))
+        self.timeout = float(cfg(timeout, "REPLAY_PARSE_TIMEOUT_SECONDS", 90))
+        self.memory_limit_mb = int(cfg(memory_limit_mb, "REPLAY_PARSER_MEMORY_LIMIT_MB", 2048))
+        self._idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self) -> None:
+        """Spawn the workers up front so the first game-end parse is warm."""
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                self._idle.put(_Worker(self.memory_limit_mb))
+            self._started = True
+        logger.info(f"Replay parser pool started with {self.size} worker(s)")
+
+    def parse(self, path: str, kind: str = "full") -> dict:
+        """Run a ``"full"`` parse or a ``"header"`` read of ``path`` on a worker."""
+        self.start()
+        worker = self._idle.get()
+        try:
+            if worker is None or not worker.alive():
+                logger.warning("Replay parser worker was not running; respawning")
+                if worker is not None:
+                    worker.reap()
+                    worker = None
+                worker = _Worker(self.memory_limit_mb)
+            return self._parse_with(worker, path, kind)
+        finally:
+            if worker is not None and not worker.alive():
+                worker.reap()
+                worker = self._respawn()
+            # Always return the slot (None = respawn on next use), or later parses block forever
+            self._idle.put(worker)
+
+    def _respawn(self) -> Optional[_Worker]:
+        """A fresh worker, or None if it cannot be started now (the original error still propagates)."""
+        try:
+            return _Worker(self.memory_limit_mb)
+        except Exception as e:
+            logger.error(f"Could not respawn replay parser worker: {e}")
+            return None
+
+    def _parse_with(self, worker: _Worker, path: str, kind: str) -> dict:
+        timed_out = threading.Event()
+
+        def _on_timeout():
+            timed_out.set()
+            worker.kill()
+
+        timer = threading.Timer(self.timeout, _on_timeout)
+        timer.daemon = True
+        timer.start()
+        try:
+            _write_frame(worker.process.stdin, (kind, path))
+            status, payload = _read_frame(worker.process.stdout)
+        except (EOFError, OSError, struct.error, pickle.UnpicklingError) as e:
+            worker.kill()
+            if timed_out.is_set():
+                raise ReplayParseError(f"Replay parse timed out after {self.timeout:.0f}s: {path}") from e
+            code = worker.process.poll()
+            raise ReplayParseError(f"Replay parser worker crashed (exit code {code}) on {path}") from e
+        finally:
+            timer.cancel()
+        if status != "ok":
+            raise ReplayParseError(payload)
+        return payload
+
+    def shutdown(self) -> None:
+        with self._lock:
+            while True:
+                try:
+                    worker = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                if worker is not None:
+                    worker.close()
+            self._started = False
+
+
+_pool: Optional[ReplayParserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_replay_parser_pool() -> Optional[ReplayParserPool]:
+    """Shared pool, or None when REPLAY_PARSER_WORKERS is 0 (parse in-process)."""
+    global _pool
+    if int(getattr(config, "REPLAY_PARSER_WORKERS", 1) or 0) <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ReplayParserPool()
+        return _pool
+
+
+def _parse_uncached(path: str) -> dict:
+    pool = get_replay_parser_pool()
+    if pool is not None:
+        return pool.parse(path)
+    import spawningtool.parser
+    return spawningtool.parser.parse_replay(path)
+
+
+def parse_header(path: str) -> dict:
+    """Header-only replay_data (players, races, map, timing) via the worker pool when enabled, else in-process."""
+    pool = get_replay_parser_pool()
+    if pool is not None:
+        return pool.parse(path, kind="header")
+    from core.replay_access import read_header
+    return read_header(path)
+
+
+def parse_replay(path: str) -> dict:
+    """Parse via the content-addressed cache, then the worker pool when enabled, else in-process."""
+    cache = get_parsed_replay_cache()
+    if cache is not None:
+        return cache.get_or_parse(path, _parse_uncached)
+    return _parse_uncached(path)
+
+
+def _limit_memory(limit_mb: int) -> None:
+    if limit_mb <= 0:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    limit = limit_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+
+def _worker_main(memory_limit_mb: int) -> None:
+    inp = sys.stdin.buffer
+    out = sys.stdout.buffer
+    # Anything the parser prints must not corrupt the frame stream.
+    sys.stdout = sys.stderr
+    _limit_memory(memory_limit_mb)
+    import spawningtool.parser
+    from core.replay_access import read_header
+
+    while True:
+        try:
+            request = _read_frame(inp)
+        except EOFError:
+            return
+        if request is None:
+            return
+        kind, path = request
+        try:
+            if kind == "header":
+                result = ("ok", read_header(path))
+            else:
+                result = ("ok", spawningtool.parser.parse_replay(path))
+        except MemoryError:
+            result = ("error", f"Replay parse exceeded memory cap ({memory_limit_mb} MB): {path}")
+        except Exception as e:
+            result = ("error", f"{type(e).__name__}: {e}")
+        _write_frame(out, result)
+
+
+if __name__ == "__main__":
+    _worker_main(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
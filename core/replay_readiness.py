@@ -0,0 +1,143 @@
+"""Event-driven detection of "the new replay file is complete".
+
+SC2 writes the .SC2Replay at the score screen and may keep it open for a moment
+(or much longer while the streamer watches the replay). Instead of fixed sleeps,
+a watcher polls the file at a short interval and sets a ready event as soon as
+the size has held steady for a configurable window and the file can be opened.
+
+Stability is counted in consecutive polls (window / interval) rather than wall
+time, so the watcher stays deterministic under a patched asyncio.sleep in tests.
+"""
+import asyncio
+import logging
+import math
+import os
+from typing import Callable, Dict, Optional
+
+from core.config_utils import cfg
+from core.executors import get_executor
+
+logger = logging.getLogger(__name__)
+
+READY = "ready"
+LOCKED = "locked"
+EMPTY = "empty"
+MISSING = "missing"
+
+
+class ReplayReadinessDetector:
+    """Watches for a new replay and signals when it is safe to parse."""
+
+    def __init__(self, poll_interval=None, stable_window=None, find_deadline=None, ready_deadline=None):
+        self.poll_interval = float(cfg(poll_interval, "REPLAY_READY_POLL_SECONDS", 0.25))
+        self.stable_window = float(cfg(stable_window, "REPLAY_READY_STABLE_SECONDS", 0.75))
+        self.find_deadline = float(cfg(find_deadline, "REPLAY_FIND_DEADLINE_SECONDS", 15))
+        self.ready_deadline = float(cfg(ready_deadline, "REPLAY_READY_DEADLINE_SECONDS", 20))
+        self._events: Dict[str, asyncio.Event] = {}
+        self._status: Dict[str, str] = {}
+        self._watchers: Dict[str, asyncio.Task] = {}
+
+    def _max_polls(self, deadline: float) -> int:
+        return max(1, int(math.ceil(deadline / max(self.poll_interval, 0.01))))
+
+    def _stable_polls_required(self) -> int:
+        return max(1, int(math.ceil(self.stable_window / max(self.poll_interval, 0.01))))
+
+    async def wait_for_new_replay(self, find_file: Callable[[], Optional[str]], exclude: Optional[str] = None) -> Optional[str]:
+        """Poll ``find_file`` (run in the executor) until it returns a path other than ``exclude``."""
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + self.find_deadline
+        for _ in range(self._max_polls(self.find_deadline)):
+            try:
+                path = await loop.run_in_executor(get_executor("parse"), find_file)
+                if path and path != exclude:
+                    return path
+            except Exception as e:
+                logger.debug(f"Replay search attempt failed: {e}")
+            if loop.time() >= give_up_at:
+                break
+            await asyncio.sleep(self.poll_interval)
+        return None
+
+    def ready_event(self, path: str) -> asyncio.Event:
+        """Event that is set once ``path`` has been declared ready."""
+        event = self._events.get(path)
+        if event is None:
+            event = asyncio.Event()
+            self._events[path] = event
+        return event
+
+    def status(self, path: str) -> Optional[str]:
+        """Last observed status for ``path`` (READY / LOCKED / EMPTY / MISSING), or None."""
+        return self._status.get(path)
+
+    def watch(self, path: str) -> asyncio.Task:
+        """Start (or reuse) the background watcher for ``path``; the task returns the final status."""
+        task = self._watchers.get(path)
+        if task is None or task.done():
+            self.ready_event(path).clear()
+            task = asyncio.create_task(self._watch(path))
+            self._watchers[path] = task
+        return task
+
+    async def wait_until_ready(self, path: str) -> str:
+        """Await the ready event for ``path`` with an overall deadline; returns the final status."""
+        task = self.watch(path)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=self.ready_deadline)
+        except asyncio.TimeoutError:
+            task.cancel()
+            return self._status.get(path) or LOCKED
+        finally:
+            if task.done():
+                self._watchers.pop(path, None)
+
+    async def _watch(self, path: str) -> str:
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + self.ready_deadline
+        required = self._stable_polls_required()
+        last_size = None
+        stable_polls = 0
+        self._status[path] = LOCKED
+
+        for _ in range(self._max_polls(self.ready_deadline)):
+            status, size = self._observe(path)
+            if status == MISSING:
+                self._status[path] = MISSING
+                return MISSING
+
+            if status == READY and size == last_size:
+                stable_polls += 1
+            else:
+                stable_polls = 0
+            last_size = size
+
+            if status == READY and stable_polls >= required:
+                self._status[path] = READY
+                logger.info(f"Replay file is ready: {path} ({size} bytes)")
+                self.ready_event(path).set()
+                return READY
+
+            self._status[path] = EMPTY if status == EMPTY else LOCKED
+            if loop.time() >= give_up_at:
+                break
+            await asyncio.sleep(self.poll_interval)
+
+        logger.warning(f"Replay file not ready before deadline ({self._status[path]}): {path}")
+        return self._status[path]
+
+    def _observe(self, path: str):
+        """One non-blocking sample: (status, size) from a size read plus an open-for-append lock probe."""
+        if not os.path.exists(path):
+            return MISSING, None
+        size = None
+        try:
+            size = os.path.getsize(path)
+            if size == 0:
+                return EMPTY, size
+            # SC2 holds the file open while writing / while the replay is being watched.
+            with open(path, 'a+b'):
+                pass
+            return READY, size
+        except (IOError, OSError, PermissionError):
+            return LOCKED, size
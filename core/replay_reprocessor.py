@@ -0,0 +1,283 @@
+"""Batch reprocessing of historical replays already stored in the database.
+
+Rows are paired with replay files on disk through their ``UnixTimestamp`` (the
+same value spawningtool/sc2reader report for the file), re-parsed in parallel
+through the parser worker pool and parsed-replay cache, and the recomputed
+fields are written back in batched transactions:
+
+- ``Replay_Summary`` regenerated by the current ``GameSummarizer``
+- ``PlayerN_PickRace`` from the lobby pick (so Random is finally recorded) and
+  ``PlayerN_Race`` from the race actually played
+
+Dry runs log a unified diff instead of writing. Progress is checkpointed by
+ReplayId so an interrupted run resumes where it stopped, and database calls are
+spaced out when talking to the remote API.
+"""
+import difflib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from settings import config
+from core.config_utils import cfg
+from core.game_summarizer import GameSummarizer
+from core.replay_cache import get_parsed_replay_cache
+from core.replay_parser_pool import ReplayParserPool
+
+logger = logging.getLogger(__name__)
+
+
+def read_replay_timestamp(path: str) -> Optional[int]:
+    """UnixTimestamp of a replay from its header only (no event decoding)."""
+    import sc2reader
+    try:
+        return int(sc2reader.load_replay(path, load_level=1).unix_timestamp)
+    except Exception as e:
+        logger.debug(f"Could not read replay header {path}: {e}")
+        return None
+
+
+class ReplayTimestampIndex:
+    """UnixTimestamp -> replay path for every .SC2Replay under a folder.
+
+    Header reads are cached on disk keyed by (path, mtime, size), so only new or
+    changed files are opened again on later runs.
+    """
+
+    def __init__(self, folder: str, cache_file: Optional[str] = None,
+                 read_timestamp: Callable[[str], Optional[int]] = read_replay_timestamp):
+        self.folder = folder
+        self.cache_file = cache_file
+        self._read_timestamp = read_timestamp
+        self.by_timestamp: Dict[int, str] = {}
+
+    def _load_cache(self) -> Dict[str, list]:
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable replay index cache {self.cache_file}: {e}")
+            return {}
+
+    def _save_cache(self, entries: Dict[str, list]) -> None:
+        if not self.cache_file:
+            return
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        tmp = self.cache_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp, self.cache_file)
+
+    def build(self, executor: Optional[ThreadPoolExecutor] = None) -> Dict[int, str]:
+        cached = self._load_cache()
+        entries: Dict[str, list] = {}
+        pending: List[tuple] = []
+        for root, _dirs, files in os.walk(self.folder):
+            for name in files:
+                if not name.endswith(".SC2Replay"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                hit = cached.get(path)
+                if hit and hit[0] == st.st_mtime and hit[1] == st.st_size:
+                    entries[path] = hit
+                else:
+                    pending.append((path, st.st_mtime, st.st_size))
+
+        mapper = executor.map if executor is not None else map
+        for (path, mtime, size), ts in zip(pending, mapper(self._read_timestamp, [p[0] for p in pending])):
+            entries[path] = [mtime, size, ts]
+
+        self.by_timestamp = {}
+        for path, (_mtime, _size, ts) in entries.items():
+            if ts is not None:
+                self.by_timestamp.setdefault(int(ts), path)
+        self._save_cache(entries)
+        logger.info(f"Replay index: {len(self.by_timestamp)} files ({len(pending)} headers read)")
+        return self.by_timestamp
+
+    def get(self, unix_timestamp) -> Optional[str]:
+        try:
+            return self.by_timestamp.get(int(unix_timestamp))
+        except (TypeError, ValueError):
+            return None
+
+
+@dataclass
+class ReprocessStats:
+    scanned: int = 0
+    missing_file: int = 0
+    parse_errors: int = 0
+    unchanged: int = 0
+    changed: int = 0
+    updated: int = 0
+    diffs: List[str] = field(default_factory=list)
+
+
+def _display_name(name: str) -> str:
+    accounts = [a.lower() for a in getattr(config, "SC2_PLAYER_ACCOUNTS", [])]
+    return config.STREAMER_NICKNAME if name.lower() in accounts else name
+
+
+def compute_fields(row: Dict, replay_data: Dict) -> Dict[str, str]:
+    """Recomputed column values for one DB row from freshly parsed replay data."""
+    players = replay_data.get("players") or {}
+    winners = ", ".join(_display_name(p["name"]) for p in players.values() if p.get("is_winner"))
+    losers = ", ".join(_display_name(p["name"]) for p in players.values() if not p.get("is_winner"))
+    fields = {"Replay_Summary": GameSummarizer.generate_summary(replay_data, winners, losers)}
+
+    by_name = {_display_name(p["name"]).lower(): p for p in players.values()}
+    for slot in (1, 2):
+        player = by_name.get(str(row.get(f"Player{slot}_Name") or "").lower())
+        if player is None:
+            continue
+        fields[f"Player{slot}_Race"] = player.get("race") or "Unknown"
+        fields[f"Player{slot}_PickRace"] = player.get("pick_race") or player.get("race") or "Unknown"
+    return fields
+
+
+def changed_fields(row: Dict, fields: Dict[str, str]) -> Dict[str, str]:
+    return {col: val for col, val in fields.items() if (row.get(col) or "") != val}
+
+
+def render_diff(row: Dict, changes: Dict[str, str]) -> str:
+    lines = [f"ReplayId {row.get('ReplayId')} (UnixTimestamp {row.get('UnixTimestamp')})"]
+    for col, new in changes.items():
+        old = str(row.get(col) or "")
+        if col == "Replay_Summary":
+            lines.extend(difflib.unified_diff(
+                old.splitlines(), new.splitlines(), fromfile=f"{col} (db)", tofile=f"{col} (new)", lineterm=""))
+        else:
+            lines.append(f"{col}: {old or '(empty)'} -> {new}")
+    return "\n".join(lines)
+
+
+class ReplayReprocessor:
+    """Pairs DB rows with replay files, re-parses in parallel, and writes batched updates."""
+
+    def __init__(self, db, replays_folder=None, workers=None, batch_size=None, dry_run=False,
+                 checkpoint_file=None, index_file=None, min_db_interval=None,
+                 parse: Optional[Callable[[str], Dict]] = None,
+                 index: Optional[ReplayTimestampIndex] = None):
+        self.db = db
+        self.workers = max(1, int(cfg(workers, "REPROCESS_WORKERS", 4)))
+        self.batch_size = max(1, int(cfg(batch_size, "REPROCESS_BATCH_SIZE", 200)))
+        self.dry_run = dry_run
+        self.checkpoint_file = cfg(checkpoint_file, "REPROCESS_CHECKPOINT_FILE",
+                                    os.path.join("temp", "reprocess_checkpoint.json"))
+        if min_db_interval is None:
+            # Only the remote API needs pacing; a local MySQL connection takes batches as fast as we send them.
+            api_mode = str(getattr(config, "DB_MODE", "local")).lower() == "api"
+            min_db_interval = getattr(config, "REPROCESS_API_MIN_INTERVAL_SECONDS", 0.5) if api_mode else 0
+        self.min_db_interval = float(min_db_interval)
+        self.index = index or ReplayTimestampIndex(
+            cfg(replays_folder, "REPLAYS_FOLDER", "."),
+            cfg(index_file, "REPROCESS_INDEX_FILE", os.path.join("temp", "replay_timestamp_index.json")))
+        self._parse = parse
+        self._pool: Optional[ReplayParserPool] = None
+        self._last_db_call = 0.0
+
+    # -- checkpoint -------------------------------------------------------
+
+    def load_checkpoint(self) -> int:
+        try:
+            with open(self.checkpoint_file, "r", encoding="utf-8") as f:
+                return int(json.load(f).get("last_replay_id", 0))
+        except (OSError, ValueError, TypeError):
+            return 0
+
+    def save_checkpoint(self, last_replay_id: int) -> None:
+        if self.dry_run:
+            return
+        os.makedirs(os.path.dirname(self.checkpoint_file) or ".", exist_ok=True)
+        tmp = self.checkpoint_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"last_replay_id": last_replay_id, "saved_at": int(time.time())}, f)
+        os.replace(tmp, self.checkpoint_file)
+
+    # -- db / parsing -----------------------------------------------------
+
+    def _throttle(self) -> None:
+        wait = self._last_db_call + self.min_db_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_db_call = time.monotonic()
+
+    def _parse_file(self, path: str) -> Dict:
+        if self._parse is not None:
+            return self._parse(path)
+        cache = get_parsed_replay_cache()
+        if cache is not None:
+            return cache.get_or_parse(path, self._pool.parse)
+        return self._pool.parse(path)
+
+    def _reprocess_row(self, row: Dict):
+        """(outcome, update) for one row; runs on executor threads, so it touches no shared state."""
+        path = self.index.get(row.get("UnixTimestamp"))
+        if path is None:
+            return "missing_file", None
+        try:
+            replay_data = self._parse_file(path)
+        except Exception as e:
+            logger.warning(f"ReplayId {row.get('ReplayId')}: failed to parse {path}: {e}")
+            return "parse_errors", None
+        changes = changed_fields(row, compute_fields(row, replay_data))
+        if not changes:
+            return "unchanged", None
+        return "changed", {"replay_id": row["ReplayId"], "fields": changes}
+
+    def _process_page(self, rows: List[Dict], executor: ThreadPoolExecutor, stats: ReprocessStats) -> List[Dict]:
+        stats.scanned += len(rows)
+        updates = []
+        for row, (outcome, update) in zip(rows, executor.map(self._reprocess_row, rows)):
+            setattr(stats, outcome, getattr(stats, outcome) + 1)
+            if update is None:
+                continue
+            if self.dry_run:
+                diff = render_diff(row, update["fields"])
+                stats.diffs.append(diff)
+                logger.info(diff)
+            updates.append(update)
+        return updates
+
+    # -- driver -----------------------------------------------------------
+
+    def run(self, restart: bool = False) -> ReprocessStats:
+        stats = ReprocessStats()
+        after_id = 0 if restart else self.load_checkpoint()
+        if after_id:
+            logger.info(f"Resuming reprocessing after ReplayId {after_id}")
+
+        if self._parse is None:
+            self._pool = ReplayParserPool(size=self.workers)
+            self._pool.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="reprocess") as executor:
+                self.index.build(executor)
+                while True:
+                    self._throttle()
+                    rows = self.db.get_replays_for_reprocessing(after_id, self.batch_size)
+                    if not rows:
+                        break
+                    updates = self._process_page(rows, executor, stats)
+                    if updates and not self.dry_run:
+                        self._throttle()
+                        stats.updated += self.db.update_replays_batch(updates)
+                    after_id = max(int(r["ReplayId"]) for r in rows)
+                    self.save_checkpoint(after_id)
+                    logger.info(f"Reprocessed through ReplayId {after_id}: {stats.changed} changed, "
+                                f"{stats.missing_file} without file, {stats.parse_errors} parse errors")
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+        return stats
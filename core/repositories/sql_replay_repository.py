@@ -1,6 +1,7 @@
 import logging
 import asyncio
 from typing import Any, Optional
+from core.executors import get_executor
 from core.interfaces import IReplayRepository
 
 logger = logging.getLogger(__name__)
@@ -14,7 +15,7 @@ class SqlReplayRepository(IReplayRepository):
         """Get the last inserted replay"""
         try:
             loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(None, self.db.get_latest_replay)
+            return await loop.run_in_executor(get_executor("db"), self.db.get_latest_replay)
         except Exception as e:
             logger.error(f"Error getting latest replay: {e}")
             return None
@@ -24,7 +25,7 @@ class SqlReplayRepository(IReplayRepository):
         try:
             loop = asyncio.get_running_loop()
             # Legacy insert_replay_info returns truthy on success
-            return await loop.run_in_executor(None, self.db.insert_replay_info, replay_data)
+            return await loop.run_in_executor(get_executor("db"), self.db.insert_replay_info, replay_data)
         except Exception as e:
             logger.error(f"Error saving replay: {e}")
             return False
@@ -33,7 +34,7 @@ class SqlReplayRepository(IReplayRepository):
         """Update player comment for the last replay"""
         try:
             loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(None, self.db.update_player_comments_in_last_replay, comment)
+            return await loop.run_in_executor(get_executor("db"), self.db.update_player_comments_in_last_replay, comment)
         except Exception as e:
             logger.error(f"Error updating comment: {e}")
             return False
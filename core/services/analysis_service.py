@@ -1,6 +1,7 @@
 import asyncio
 import logging
 from typing import Any, Optional
+from core.executors import get_executor
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,7 @@ class AnalysisService:
         loop = asyncio.get_running_loop()
         try:
             return await loop.run_in_executor(
-                None, 
+                get_executor("db"), 
                 self.analyzer.analyze_opponent_for_chat,
                 opponent_name,
                 opponent_race,
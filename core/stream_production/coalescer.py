@@ -10,7 +10,7 @@ real clocks or network: the adapter calls add() then poll() each cycle.
 import logging
 from typing import List, Optional
 
-import settings.config as config
+from core.config_utils import cfg
 from core.stream_production.models import StatusSnapshot, StreamEvent
 
 logger = logging.getLogger(__name__)
@@ -21,12 +21,6 @@ _NOISE_TYPES = {"connect", "music"}
 _DEFAULT_MEANINGFUL_SCENES = ["pog", "scoreboard", "custom-scoreboard"]
 
 
-def _cfg(explicit, key, default):
-    if explicit is not None:
-        return explicit
-    return getattr(config, key, default)
-
-
 def _last_of(events: List[StreamEvent], type_: str) -> Optional[StreamEvent]:
     for e in reversed(events):
         if e.type == type_:
@@ -56,7 +50,7 @@ class Reducer:
 
     def __init__(self, meaningful_scenes=None):
         self.meaningful_scenes = set(
-            _cfg(meaningful_scenes, "STREAM_PRODUCTION_MEANINGFUL_SCENES", _DEFAULT_MEANINGFUL_SCENES)
+            cfg(meaningful_scenes, "STREAM_PRODUCTION_MEANINGFUL_SCENES", _DEFAULT_MEANINGFUL_SCENES)
         )
 
     def reduce(self, events: List[StreamEvent], snapshot: StatusSnapshot) -> List[str]:
@@ -199,10 +193,10 @@ class EventCoalescer:
 
     def __init__(self, reducer=None, quiet=None, max_window=None, winner_quiet=None, cooldown=None):
         self.reducer = reducer or Reducer()
-        self.quiet = _cfg(quiet, "STREAM_PRODUCTION_QUIET_WINDOW_SECONDS", 20)
-        self.max_window = _cfg(max_window, "STREAM_PRODUCTION_MAX_WINDOW_SECONDS", 60)
-        self.winner_quiet = _cfg(winner_quiet, "STREAM_PRODUCTION_WINNER_QUIET_WINDOW_SECONDS", 5)
-        self.cooldown = _cfg(cooldown, "STREAM_PRODUCTION_COOLDOWN_SECONDS", 30)
+        self.quiet = cfg(quiet, "STREAM_PRODUCTION_QUIET_WINDOW_SECONDS", 20)
+        self.max_window = cfg(max_window, "STREAM_PRODUCTION_MAX_WINDOW_SECONDS", 60)
+        self.winner_quiet = cfg(winner_quiet, "STREAM_PRODUCTION_WINNER_QUIET_WINDOW_SECONDS", 5)
+        self.cooldown = cfg(cooldown, "STREAM_PRODUCTION_COOLDOWN_SECONDS", 30)
         self._pending: List[StreamEvent] = []
         self._first_at: Optional[float] = None
         self._last_at: Optional[float] = None
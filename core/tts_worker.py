@@ -0,0 +1,257 @@
+"""Text-to-speech on one long-lived worker thread.
+
+``speak_text`` used to create a new pyttsx3 engine for every line and speak on
+the calling thread (the IRC handler), and ``msgToChannel`` first spent an
+OpenAI completion on "add commas, period and other appropriate punctuation".
+Now:
+
+- ``restore_punctuation`` fixes up the text locally with a few rules
+  (sentence capitals, "I", commas before "but"/"however", a final period or
+  question mark), which is all the TTS voice needs for pauses and intonation;
+- ``TTSWorker`` creates the engine once on its own thread and speaks queued
+  lines one after another (through the audio scheduler, so it still waits for
+  a playing intro); callers return as soon as the line is queued, or wait for
+  it when they have to (speech prompts before recording the answer);
+- short lines that repeat are rendered to a wav file under
+  ``TTS_PHRASE_CACHE_DIR`` and played from there afterwards. The first time a
+  line is heard it is spoken straight through the engine; it is rendered
+  only when it comes round again (and the queue is idle), or up front for
+  the fixed prompts in ``TTS_PHRASE_CACHE_PHRASES`` (voice-command replies,
+  the "player comments" prompts). At most ``TTS_PHRASE_CACHE_MAX_FILES``
+  renders are kept, least recently played first out.
+"""
+import hashlib
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+from settings import config
+from core.config_utils import cfg
+from core.audio_scheduler import get_audio_scheduler
+from core.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_SPACE_BEFORE_PUNCT = re.compile(r"\s+([,.!?;:])")
+_SENTENCE_START = re.compile(r"(^|[.!?]\s+)([a-z])")
+_LONE_I = re.compile(r"\bi\b(?=\s|'|$)")
+_CONJUNCTION_COMMA = re.compile(r"(?<=[A-Za-z0-9])\s+(but|however|although)\b", re.IGNORECASE)
+_INTERJECTION_COMMA = re.compile(r"^(well|yeah|ok|okay|oh|hey|anyway|actually|honestly|wow)\b(?![,.!?])",
+                                 re.IGNORECASE)
+_QUESTION_WORDS = {"who", "what", "when", "where", "why", "how", "which", "is", "are", "was", "were",
+                   "do", "does", "did", "can", "could", "would", "will", "should", "shall", "have", "has"}
+_LAST_SENTENCE = re.compile(r"(?:^|[.!?]\s+)([^.!?]*)$")
+
+
+def restore_punctuation(text: str) -> str:
+    """Punctuate chat text for speech: capitals, commas at obvious pauses, terminal punctuation."""
+    text = _WHITESPACE.sub(" ", text or "").strip()
+    if not text:
+        return ""
+    text = _SPACE_BEFORE_PUNCT.sub(r"\1", text)
+    text = _INTERJECTION_COMMA.sub(r"\1,", text)
+    text = _CONJUNCTION_COMMA.sub(r", \1", text)
+    text = _LONE_I.sub("I", text)
+    text = _SENTENCE_START.sub(lambda m: m.group(1) + m.group(2).upper(), text)
+    if text[-1] not in ".!?":
+        text = text.rstrip(",;:")
+        last = _LAST_SENTENCE.search(text)
+        first_word = (last.group(1).split() or [""])[0].lower() if last else ""
+        text += "?" if first_word in _QUESTION_WORDS else "."
+    return text
+
+
+class PhraseAudioCache:
+    """Rendered speech for short, repeated lines: one wav per (voice mode, text) under ``directory``."""
+
+    def __init__(self, directory=None, max_chars=None, max_files=None, phrases: Optional[Iterable[str]] = None):
+        self.directory = cfg(directory, "TTS_PHRASE_CACHE_DIR", None)
+        self.max_chars = int(cfg(max_chars, "TTS_PHRASE_CACHE_MAX_CHARS", 80))
+        self.max_files = max(1, int(cfg(max_files, "TTS_PHRASE_CACHE_MAX_FILES", 200)))
+        self.phrases = tuple(cfg(phrases, "TTS_PHRASE_CACHE_PHRASES", ()) or ())
+        # Keys of lines heard once; a second occurrence is what earns a render
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+
+    def cacheable(self, text: str) -> bool:
+        return bool(self.directory) and 0 < len(text) <= self.max_chars
+
+    def path_for(self, text: str, mode: int) -> str:
+        key = hashlib.sha256(f"{mode}\x1f{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key + ".wav")
+
+    def lookup(self, text: str, mode: int) -> Optional[str]:
+        """Path of the rendered phrase, or None (counted as a miss) if it has not been rendered yet."""
+        path = self.path_for(text, mode)
+        hit = os.path.isfile(path)
+        CACHE_REQUESTS.inc(cache="tts", result="hit" if hit else "miss")
+        if not hit:
+            return None
+        try:
+            os.utime(path)  # recency for eviction
+        except OSError:
+            pass
+        return path
+
+    def worth_rendering(self, text: str, mode: int) -> bool:
+        """True for allowlisted phrases and for lines heard before; otherwise remembers this one."""
+        if text in self.phrases:
+            return True
+        key = self.path_for(text, mode)
+        if key in self._seen:
+            return True
+        self._seen[key] = None
+        while len(self._seen) > self.max_files * 5:
+            self._seen.popitem(last=False)
+        return False
+
+    def evict(self) -> None:
+        """Drop the least recently played renders past ``max_files``."""
+        try:
+            entries = [os.path.join(self.directory, n) for n in os.listdir(self.directory) if n.endswith(".wav")]
+            entries.sort(key=os.path.getmtime)
+        except OSError:
+            return
+        for path in entries[:max(0, len(entries) - self.max_files)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def play_audio_file(path: str) -> bool:
+    """Play a rendered phrase through pygame and block until it ends; False if it cannot be played."""
+    try:
+        import pygame
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        sound = pygame.mixer.Sound(path)
+        sound.set_volume(float(getattr(config, "SOUND_VOLUME", 0.7)))
+        sound.play()
+        time.sleep(sound.get_length())
+        return True
+    except Exception as e:
+        logger.debug(f"Could not play cached phrase {path}: {e}")
+        return False
+
+
+class TTSWorker:
+    """One engine, one thread, one line at a time from a bounded queue."""
+
+    def __init__(self, engine_factory: Callable, configure: Optional[Callable] = None,
+                 phrase_cache: Optional[PhraseAudioCache] = None, play_file: Optional[Callable[[str], bool]] = None,
+                 scheduler=None, max_queue=None):
+        self.engine_factory = engine_factory
+        self.configure = configure
+        self.phrase_cache = phrase_cache
+        self.play_file = play_file or play_audio_file
+        self.scheduler = scheduler or get_audio_scheduler()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, int(cfg(max_queue, "TTS_QUEUE_SIZE", 20))))
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._engine = None
+        self._mode = None
+
+    def start(self) -> None:
+        """Start the thread and create the engine on it (pyttsx3 engines belong to the thread that made them)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="tts-worker", daemon=True)
+            self._thread.start()
+
+    def speak(self, text: str, mode: int = 1, wait: bool = False, timeout=None) -> threading.Event:
+        """
+        Queue ``text``; returns an event set once it has been spoken (or dropped).
+        ``wait`` blocks until then, at most ``timeout`` (``TTS_SPEAK_WAIT_SECONDS``).
+        """
+        done = threading.Event()
+        self.start()
+        try:
+            self._queue.put_nowait((text, mode, done))
+        except queue.Full:
+            logger.warning(f"TTS queue full, dropping line: {text[:60]}")
+            done.set()
+        if wait:
+            done.wait(float(cfg(timeout, "TTS_SPEAK_WAIT_SECONDS", 60)))
+        return done
+
+    def stop(self, timeout: float = 5) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout=timeout)
+
+    def _run(self) -> None:
+        try:
+            self._engine = self.engine_factory()
+        except Exception as e:
+            logger.error(f"TTS engine failed to initialize, speech disabled: {e}")
+            self._engine = None
+        if self._engine is not None:
+            self._prerender_phrases()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            text, mode, done = item
+            try:
+                if self._engine is not None:
+                    self._speak_one(text, mode)
+            except Exception as e:
+                logger.error(f"Error in text-to-speech: {e}")
+            finally:
+                done.set()
+
+    def _use_mode(self, mode: int) -> None:
+        if self.configure is not None and mode != self._mode:
+            self.configure(self._engine, mode)
+            self._mode = mode
+
+    def _prerender_phrases(self, mode: int = 1) -> None:
+        """Render the allowlisted prompts that are not on disk yet, before the first line is queued."""
+        cache = self.phrase_cache
+        if cache is None or not cache.directory:
+            return
+        self._use_mode(mode)
+        for phrase in cache.phrases:
+            if cache.cacheable(phrase) and not os.path.isfile(cache.path_for(phrase, mode)):
+                self._render(phrase, cache.path_for(phrase, mode))
+
+    def _speak_one(self, text: str, mode: int) -> None:
+        self._use_mode(mode)
+        cache = self.phrase_cache
+        cacheable = cache is not None and cache.cacheable(text)
+        path = cache.lookup(text, mode) if cacheable else None
+        # Wait only while an intro or other sound is still playing
+        with self.scheduler.speaking():
+            if path is not None and self.play_file(path):
+                return
+            self._engine.say(text)
+            self._engine.runAndWait()
+        # A miss is spoken first; a line that repeats is rendered afterwards, only while nothing is waiting
+        if cacheable and path is None and cache.worth_rendering(text, mode) and self._queue.empty():
+            self._render(text, cache.path_for(text, mode))
+
+    def _render(self, text: str, path: str) -> Optional[str]:
+        tmp = path + ".tmp.wav"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._engine.save_to_file(text, tmp)
+            self._engine.runAndWait()
+            if not os.path.isfile(tmp) or os.path.getsize(tmp) == 0:
+                return None
+            os.replace(tmp, path)
+            if self.phrase_cache is not None:
+                self.phrase_cache.evict()
+            return path
+        except Exception as e:
+            logger.debug(f"Could not render TTS phrase: {e}")
+            return None
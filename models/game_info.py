@@ -29,6 +29,7 @@ class GameInfo:
     # TODO: fix the replay parser as support for Random is not provided
     # hence the DB has never saved race as Random period
     # then we will need to rerun all the replays to fix old data as well
+    # (reprocess_replays.py rewrites PickRace from the replay's lobby pick for rows already stored)
     RACE_MAPPING = {
         'terr': 'Terran',
         'prot': 'Protoss',
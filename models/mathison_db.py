@@ -328,6 +328,63 @@ class Database:
             self.logger.error(f"SQL Error updating replay {replay_id}: {e}")
             raise
 
+    # Columns the historical reprocessing job is allowed to rewrite.
+    REPROCESS_UPDATABLE_COLUMNS = (
+        "Replay_Summary", "Player1_PickRace", "Player2_PickRace", "Player1_Race", "Player2_Race",
+    )
+
+    def get_replays_for_reprocessing(self, after_replay_id=0, limit=500):
+        """Keyset page of replays (ReplayId > after_replay_id, ascending) with the columns reprocessing compares."""
+        try:
+            self.ensure_connection()
+            self.cursor.reset()
+            sql = """
+                SELECT r.ReplayId, r.UnixTimestamp, r.Player1_PickRace, r.Player2_PickRace,
+                       r.Player1_Race, r.Player2_Race, r.Replay_Summary,
+                       p1.SC2_UserId as Player1_Name, p2.SC2_UserId as Player2_Name
+                FROM Replays r
+                LEFT JOIN Players p1 ON r.Player1_Id = p1.Id
+                LEFT JOIN Players p2 ON r.Player2_Id = p2.Id
+                WHERE r.ReplayId > %s
+                ORDER BY r.ReplayId ASC
+                LIMIT %s
+            """
+            self.cursor.execute(sql, (int(after_replay_id), int(limit)))
+            return self.cursor.fetchall() or []
+        except Exception as e:
+            # An empty page means "done"; a failed read must stop the job so the checkpoint is resumed
+            self.logger.error(f"Error fetching replays for reprocessing after {after_replay_id}: {e}")
+            raise
+
+    def update_replays_batch(self, updates):
+        """Apply [{'replay_id': id, 'fields': {column: value}}] in a single transaction; returns rows updated."""
+        try:
+            self.ensure_connection()
+            self.cursor.reset()
+            updated = 0
+            for update in updates:
+                fields = {
+                    col: val for col, val in (update.get('fields') or {}).items()
+                    if col in self.REPROCESS_UPDATABLE_COLUMNS
+                }
+                if not fields:
+                    continue
+                assignments = ", ".join(f"{col} = %s" for col in fields)
+                self.cursor.execute(
+                    f"UPDATE Replays SET {assignments} WHERE ReplayId = %s",
+                    (*fields.values(), int(update['replay_id']))
+                )
+                updated += self.cursor.rowcount
+            self.connection.commit()
+            return updated
+        except Exception as e:
+            try:
+                self.connection.rollback()
+            except Exception:
+                pass
+            self.logger.error(f"SQL Error applying replay update batch: {e}")
+            raise
+
     def _streamer_account_names_lower(self):
         """Lowercase SC2 ladder ids for the streamer (accounts + barcodes)."""
         from settings import config
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded chat/SC2 input stream through BotCore with mocked LLM, DB and chat, and print latency percentiles.
+Record a stream by setting EVENT_RECORD_FILE in settings/config.py before running run_core.py.
+Usage: python replay_latency.py RECORDING [--speed X] [--llm-delay S] [--db-delay S] [--as-platform NAME] [--json]
+Example: python replay_latency.py logs/events_stream_night.jsonl --speed 10 --llm-delay 1.5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.event_recorder import load_recording
+from tests.perf.latency_harness import LatencyHarness, format_report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure end-to-end bot latency on a recorded input stream.")
+    parser.add_argument("recording", help="JSON-lines file written by EVENT_RECORD_FILE")
+    parser.add_argument("--speed", type=float, default=1.0, help="time acceleration (1 = real time, 0 = no waiting)")
+    parser.add_argument("--llm-delay", type=float, default=0.0, help="simulated seconds per LLM completion")
+    parser.add_argument("--db-delay", type=float, default=0.0, help="simulated seconds per DB query")
+    parser.add_argument("--as-platform", default=None,
+                        help="replay every chat line as this platform (e.g. discord, so plain chat gets LLM replies)")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s:%(levelname)s:%(name)s: %(message)s")
+    records = load_recording(args.recording)
+    harness = LatencyHarness(llm_delay=args.llm_delay, db_delay=args.db_delay, as_platform=args.as_platform)
+    report = asyncio.run(harness.replay(records, speed=args.speed))
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Reprocess historical replays already in the database (summaries, pick/played races).
+Usage: python reprocess_replays.py [--dry-run] [--workers N] [--batch-size N] [--restart] [--folder PATH]
+Example: python reprocess_replays.py --dry-run --batch-size 50
+"""
+
+import argparse
+import logging
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from adapters.database.database_client_factory import create_database_client
+from core.replay_reprocessor import ReplayReprocessor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-parse stored replays and fix their DB rows in batches.")
+    parser.add_argument("--dry-run", action="store_true", help="print diffs instead of writing")
+    parser.add_argument("--workers", type=int, default=None, help="parallel parser workers (REPROCESS_WORKERS)")
+    parser.add_argument("--batch-size", type=int, default=None, help="rows per page/transaction (REPROCESS_BATCH_SIZE)")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first replay")
+    parser.add_argument("--folder", default=None, help="replay folder to index (defaults to REPLAYS_FOLDER)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s:%(levelname)s:%(name)s: %(message)s")
+    reprocessor = ReplayReprocessor(
+        create_database_client(),
+        replays_folder=args.folder,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+    stats = reprocessor.run(restart=args.restart)
+
+    print("=" * 60)
+    print(f"Scanned: {stats.scanned}  Changed: {stats.changed}  Unchanged: {stats.unchanged}")
+    print(f"No replay file: {stats.missing_file}  Parse errors: {stats.parse_errors}")
+    print(f"Rows updated: {stats.updated}" + ("  (dry run - nothing written)" if args.dry_run else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -54,6 +54,12 @@ from core.services.analysis_service import AnalysisService
 from core.pattern_learning_service import PatternLearningService
 from core.command_service import CommandService
 from core.game_result_service import GameResultService
+from core.replay_parser_pool import get_replay_parser_pool
+from core.executors import shutdown_executors
+from core.event_recorder import EventRecorder
+from core.instrumentation import get_instrumentation
+from core.metrics import start_metrics_server
+from core.llm_client import close_llm_client
 
 # Import Handlers
 from core.handlers.wiki_handler import WikiHandler
@@ -68,6 +74,7 @@ from core.handlers.head_to_head_handler import HeadToHeadHandler
 from core.handlers.retry_processing_handler import RetryProcessingHandler
 from core.handlers.replay_test_handler import ReplayTestHandler
 from core.handlers.preview_handler import PreviewHandler
+from core.handlers.perf_handler import PerfHandler
 from core.handlers.accept_ratings_handler import (
     AcceptRatingsHandler,
     EndRatingsHandler,
@@ -233,6 +240,12 @@ async def main():
     # Inject CommandService into Core
     bot_core.command_service = command_service
 
+    # Optional: capture the input stream for offline latency benchmarks (replay_latency.py)
+    event_recorder = None
+    if getattr(config, "EVENT_RECORD_FILE", None):
+        event_recorder = EventRecorder(config.EVENT_RECORD_FILE)
+        bot_core.recorder = event_recorder
+
     # Optional: @mention → LLM router → FSL HTTP API (requires OPENAI + DB_MODE=api + api-server FSL)
     if getattr(config, "ENABLE_FSL_ASK", False):
         bot_core.fsl_ask_assistant = FslAskAssistant(llm, twitch_bot_legacy.db)
@@ -247,6 +260,14 @@ async def main():
         pattern_learner=getattr(twitch_bot_legacy, 'pattern_learner', None)
     )
     
+    # Spawn the replay parser workers now so the first game-end parse is warm
+    replay_parser_pool = get_replay_parser_pool()
+    if replay_parser_pool:
+        try:
+            replay_parser_pool.start()
+        except Exception as e:
+            logger.error(f"Failed to start replay parser pool: {e}")
+    
     # Register retry processing handler (must be after game_result_service is created)
     retry_handler = RetryProcessingHandler(game_result_service)
     command_service.register_handler("please retry", retry_handler)
@@ -261,6 +282,9 @@ async def main():
     command_service.register_handler("please preview", preview_handler)
     command_service.register_handler("please review", preview_handler)  # Alias
     
+    # Owner-only timing summary (loop lag, slow spans, last game-end / pregame breakdown)
+    command_service.register_handler("please perf", PerfHandler())
+    
     # SC2 Adapter with GameResultService
     sc2_adapter = SC2Adapter(bot_core, game_result_service)
     
@@ -294,6 +318,20 @@ async def main():
     # A) Bot Core Event Loop
     tasks.append(asyncio.create_task(bot_core.start()))
     
+    # A2) Outbound Twitch chat queue (rate limit + packing for every legacy/core send)
+    tasks.append(asyncio.create_task(twitch_bot_legacy.outbound.run()))
+    
+    # A3) Loop lag / queue depth sampling and the periodic timing dump (INSTRUMENTATION_*)
+    instrumentation = get_instrumentation()
+    instrumentation.bot = bot_core
+    instrumentation_task = asyncio.create_task(instrumentation.monitor())
+    tasks.append(instrumentation_task)
+    
+    # A4) Optional local Prometheus-style /metrics endpoint (METRICS_*)
+    metrics_server = None
+    if getattr(config, "METRICS_ENABLED", False):
+        metrics_server = await start_metrics_server()
+    
     # B) SC2 Monitoring Loop (New Adapter)
     if config.ENABLE_SC2_MONITORING:
         tasks.append(asyncio.create_task(sc2_adapter.start_monitoring()))
@@ -365,6 +403,7 @@ async def main():
         
         # 2. Stop BotCore (stops event processing)
         bot_core.stop()
+        twitch_bot_legacy.outbound.stop()
         
         # 3. Stop SC2 Adapter (stops monitoring loop)
         sc2_adapter.stop()
@@ -373,6 +412,20 @@ async def main():
         if stream_production_adapter:
             stream_production_adapter.stop()
         
+        # 3c. Stop replay parser workers
+        if replay_parser_pool:
+            replay_parser_pool.shutdown()
+        
+        # 3d. Stop the per-workload thread pools (queued jobs are cancelled)
+        shutdown_executors()
+        if event_recorder:
+            event_recorder.close()
+        instrumentation_task.cancel()
+        instrumentation.dump()
+        close_llm_client()
+        if metrics_server:
+            metrics_server.close()
+        
         # 4. Cleanly close Discord
         if config.DISCORD_ENABLED and not discord_bot_legacy.is_closed():
              try:
@@ -39,6 +39,9 @@ URL = f"https://api.twitch.tv/kraken/users?login={USERNAME}"
 HEADERS = {"Client-ID": CLIENT_ID,
            "Accept": "application/vnd.twitchtv.v5+json"}
 TWITCH_CHAT_BYTE_LIMIT = 450 #512 but to account for overhead
+TWITCH_SEND_MESSAGES_PER_WINDOW = 20  # Twitch chat budget: 20 per 30s for regular accounts, 100 if the bot is a moderator
+TWITCH_SEND_WINDOW_SECONDS = 30
+TWITCH_SEND_BURST = 5  # lines that may go out back to back; the rest of the budget is spread over the window
 
 # Discord normal message limit (chars); FSL @-ask truncation on Discord uses this instead of Twitch byte cap
 DISCORD_MESSAGE_CHAR_LIMIT = 2000
@@ -62,6 +65,9 @@ DISCORD_DICE_RESPONSE_PROBABILITY = 0.35  # Half of RESPONSE_PROBABILITY for dic
 DISCORD_LAST_WORD_ENABLED = True  # Reply to messages with no replies after timeout (improved: only replies to most recent)
 DISCORD_LAST_WORD_TIMEOUT_HOURS = 3  # Hours to wait before replying to unreplied messages
 DISCORD_LAST_WORD_CHECK_FREQUENCY_HOURS = 1  # How often to check for unreplied messages (recommended: 0.5-2 hours)
+DISCORD_MIRROR_BATCH_SECONDS = 0.5  # mirrored Twitch lines arriving this close together are combined into one Discord post
+DISCORD_MIRROR_MESSAGES_PER_SECOND = 1.0  # steady mirror post rate (Discord allows about 5 posts per 5s per channel)
+DISCORD_MIRROR_BURST = 5
 
 """
 |   OpenAI Settings
@@ -132,6 +138,9 @@ PREGAME_OPENING_SUFFIX_MAX_CHARS = 220
 PREGAME_SEND_SEPARATE_GLHF_LINE = False
 # Word used instead of literal "GLHF" when separate line is enabled (your ladder tag / habit).
 PREGAME_GLHF_PHRASE = "GLHFGG"
+# When a known-opponent pregame needs several LLM lines (last meeting + build blocks / Random GLHF), write them
+# with one JSON-structured completion instead of one call each (falls back per line if the reply is unusable).
+PREGAME_SINGLE_CALL = True
 # Hard cap for full last_time_played Twitch line after LLM + deterministic suffix (word-trimmed; adds ' [etc]').
 LAST_TIME_TWITCH_REPLY_MAX_CHARS = 380
 # Lower = stabler factual replies for last-meeting opponent lines (None = API default / global TEMPERATURE)
@@ -168,10 +177,78 @@ IGNORE = ["psistorm_mathison", "psi_mathison", "Streamelements", "StreamElements
 RESPONSE_PROBABILITY = 0.2  # how often to respond? 1.0 = 100%  0.7 = 70%
 # sleep time between execution, any less than 7 risks new replay not done yet
 MONITOR_GAME_SLEEP_SECONDS = 5
+BOT_CORE_WORKERS = 4  # events for different chat authors / game state are handled concurrently by this many workers
+BOT_CORE_CHAT_QUEUE_MAX = 200  # waiting chat events before the overflow policy kicks in (0 = unbounded)
+BOT_CORE_CHAT_OVERFLOW_POLICY = "drop_oldest"  # "drop_oldest", "drop_non_commands" or "merge_duplicates"
+EXECUTOR_DB_WORKERS = 4     # threads for database / FSL queries
+EXECUTOR_LLM_WORKERS = 4    # threads for OpenAI calls and the legacy game start/end pipelines
+EXECUTOR_PARSE_WORKERS = 2  # threads for replay lookup and parsing
+EXECUTOR_POLL_WORKERS = 2   # threads for SC2 client and stream-production polling (kept free of background load)
+LLM_REQUEST_TIMEOUT_SECONDS = 30  # per OpenAI completion (shared pooled client, core/llm_client.py)
+LLM_MAX_CONCURRENCY = 4  # completions in flight at once; further calls wait for a slot
+LLM_MAX_RETRIES = 1  # SDK-level retries on connection errors / 5xx (openai>=1 only)
+LLM_REQUESTS_PER_MINUTE = 30  # token-bucket rate for OpenAI calls (0 = no limit); idle calls go out immediately
+LLM_BURST = 5  # calls allowed back to back before the rate above applies
+AUDIO_IDLE_POLL_SECONDS = 0.1  # TTS checks this often whether an intro / game sound is still playing
+AUDIO_MAX_WAIT_SECONDS = 15  # longest TTS waits for a playing sound before speaking anyway
+TTS_QUEUE_SIZE = 20  # lines waiting for the TTS worker; further lines are dropped
+TTS_SPEAK_WAIT_SECONDS = 60  # longest a caller that needs the line spoken first (speech prompts) waits
+TTS_PHRASE_CACHE_DIR = "temp/tts_cache"  # rendered audio for short repeated lines (None = always synthesize)
+TTS_PHRASE_CACHE_MAX_CHARS = 80  # only lines up to this long are cached (rendered when heard a second time)
+TTS_PHRASE_CACHE_MAX_FILES = 200  # rendered phrases kept on disk; least recently played are removed first
+TTS_PHRASE_CACHE_PHRASES = (  # fixed prompts rendered when the TTS worker starts
+    "Did you want to give your own comments about that player and last game?",
+    "Your comment has been added.",
+    "No recent replays found to update.",
+    "Comment not added.",
+    "Failed to add your comment due to a system error.",
+    "yes?",
+    "I didn't understand that.",
+)
+LLM_CACHE_ENABLED = True  # reuse replies to prompts that are pure functions of DB data (career, head to head, FSL facts, wiki)
+LLM_CACHE_MAX_ENTRIES = 512  # in-memory LRU size
+LLM_CACHE_DIR = None  # e.g. "temp/llm_cache" to also keep replies on disk across restarts
+LLM_CACHE_DEFAULT_TTL_SECONDS = 300
+# per prompt class; the prompt embeds the records, so new games change the key anyway (0 = never cache the class)
+LLM_CACHE_TTL_SECONDS = {"career": 3600, "head_to_head": 3600, "fsl_answer": 900, "wiki": 86400}
+LLM_STREAMING = False  # stream chat replies and post each sentence as soon as it is generated
+LLM_STREAM_MODES = ("normal", "helpful", "in_game", "replay_analysis")  # last_time_played is deliberately not streamed: its alias/style pipeline rewrites the whole reply
+LLM_STREAM_MIN_CHUNK_CHARS = 150  # don't post fragments shorter than this (short replies stay one message, and get spoken)
+LLM_STREAM_CHUNK_BYTES = 400  # a message is cut at the last space before this many bytes if no sentence ends first
+RECORD_TEMPLATES_ENABLED = True  # career / history / head to head answers are formatted from the DB rows, no LLM round trip
+RECORD_TEMPLATE_FLOURISH = False  # follow those facts with a short LLM comment (sent after the facts)
+EVENT_RECORD_FILE = None  # e.g. "logs/events.jsonl": record chat/game events and SC2 snapshots for replay_latency.py
+INSTRUMENTATION_WINDOW = 500  # samples kept per timing histogram (loop lag, spans, queue depths)
+INSTRUMENTATION_TRACE_HISTORY = 5  # recent game-end / pregame stage breakdowns kept
+INSTRUMENTATION_LAG_INTERVAL_SECONDS = 0.5  # how often event-loop lag and queue depths are sampled
+INSTRUMENTATION_DUMP_FILE = "logs/instrumentation.json"  # JSON timing snapshot ("please perf dump"); None = off
+INSTRUMENTATION_DUMP_SECONDS = 60  # how often the snapshot is rewritten (0 = only on demand / at shutdown)
+METRICS_ENABLED = False  # serve Prometheus-style metrics at http://METRICS_HOST:METRICS_PORT/metrics
+METRICS_HOST = "127.0.0.1"  # keep local; nothing is pushed to outside services
+METRICS_PORT = 9108
 # When the replay file is still locked at game end (e.g. you're watching the replay), keep retrying
 # in the background until it unlocks, so the post-game comment prompt still fires without "please retry".
 LOCKED_REPLAY_RETRY_INTERVAL_SECONDS = 15  # how often to re-check a locked replay file
 LOCKED_REPLAY_RETRY_MAX_ATTEMPTS = 24      # ~6 minutes total at 15s intervals
+# Game-end replay readiness: parse as soon as the new replay's size holds steady and it can be opened.
+REPLAY_READY_POLL_SECONDS = 0.25      # how often the new replay file is sampled
+REPLAY_READY_STABLE_SECONDS = 0.75    # size must be unchanged this long before it counts as complete
+REPLAY_FIND_DEADLINE_SECONDS = 15     # give up looking for a new replay file after this long
+REPLAY_READY_DEADLINE_SECONDS = 20    # after this long a still-busy file is treated as locked
+# Replay parsing runs in warm subprocess workers so a corrupt file can't crash the bot (0 = parse in-process)
+REPLAY_PARSER_WORKERS = 1
+REPLAY_PARSE_TIMEOUT_SECONDS = 90     # a worker stuck longer than this is killed and respawned
+REPLAY_PARSER_MEMORY_LIMIT_MB = 2048  # per-worker address-space cap (POSIX only; 0 = no cap)
+# Parsed-replay cache keyed by file content hash + parser version; makes retries near-instant
+ENABLE_REPLAY_CACHE = True
+REPLAY_CACHE_DIR = "temp/replay_cache"
+REPLAY_CACHE_MAX_MB = 200             # least recently used entries are evicted past this size
+# Historical reprocessing (python reprocess_replays.py): re-parse stored replays and fix their DB rows
+REPROCESS_WORKERS = 4
+REPROCESS_BATCH_SIZE = 200                  # rows per page and per update transaction
+REPROCESS_API_MIN_INTERVAL_SECONDS = 0.5    # spacing between DB calls when DB_MODE is "api"
+REPROCESS_CHECKPOINT_FILE = "temp/reprocess_checkpoint.json"
+REPROCESS_INDEX_FILE = "temp/replay_timestamp_index.json"  # cached UnixTimestamp -> file lookups
 GREETINGS_LIST_FROM_OTHERS = ['HeyGuys', 'Hello']  # Mathison will say hi
 # override any delays/blocks and Mathison will respond
 OPEN_SESAME_SUBSTITUTES = "open sesame"
@@ -0,0 +1,26 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+import api.discord_bot as discord_module
+from api.discord_bot import DiscordBot
+
+
+@pytest.mark.asyncio
+async def test_mirrored_burst_is_batched_into_one_post(monkeypatch):
+    monkeypatch.setattr(discord_module.config, "DISCORD_MIRROR_BATCH_SECONDS", 0.02, raising=False)
+    monkeypatch.setattr(discord_module.config, "DISCORD_MESSAGE_CHAR_LIMIT", 30, raising=False)
+    bot = DiscordBot()
+    bot.send_message_to_discord = AsyncMock()
+    task = asyncio.create_task(bot.process_message_queue())
+    await asyncio.sleep(0)
+
+    for line in ["gg wp", "nice\nmacro", "x" * 25]:
+        bot.enqueue_mirror(line)
+    await asyncio.sleep(0.1)
+
+    posts = [call.args[0] for call in bot.send_message_to_discord.await_args_list]
+    assert posts == ["gg wp\nnicemacro", "x" * 25]
+    task.cancel()
+    await task
@@ -0,0 +1,106 @@
+import gzip
+import struct
+
+import pytest
+
+from api import sgreplay_pb2
+from api.stormgate import (
+    RECORD_CHAT,
+    RECORD_PLAYER_DETAILS,
+    SGReplayError,
+    SGReplayReader,
+    build_replay_summary,
+    peek_frame,
+    summarize_replay,
+)
+
+
+def _varint(n):
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+
+def _frame(timestamp, player_id, fill):
+    msg = sgreplay_pb2.ReplayStreamRecordHeader()
+    msg.Timestamp = timestamp
+    msg.PlayerId = player_id
+    fill(msg.Data.Record)
+    data = msg.SerializeToString()
+    return _varint(len(data)) + data
+
+
+def _write_replay(path, frames, compress=True):
+    payload = b"".join(frames)
+    if compress:
+        payload = gzip.compress(payload)
+    path.write_bytes(struct.pack("<4I", 0x12345678, 0, 44821, 0) + payload)
+    return str(path)
+
+
+def _sample_frames(command_count=3):
+    frames = [
+        _frame(0, 0, lambda r: setattr(r.MapDetailsRecord, "MapName", "Boulder Bay")),
+        _frame(10, 1, lambda r: (setattr(r.PlayerDetailsRecord, "PlayerIndex", 1),
+                                 setattr(r.PlayerDetailsRecord.PlayerIdentifier, "Name", "KJ"))),
+        _frame(12, 2, lambda r: (setattr(r.PlayerDetailsRecord, "PlayerIndex", 2),
+                                 setattr(r.PlayerDetailsRecord.PlayerIdentifier, "Name", "Rival"))),
+    ]
+    for i in range(command_count):
+        frames.append(_frame(100 + i, 1, lambda r: r.PlayerCommandRecord.PlayerCommandSelection.SelectedEntities.append(7)))
+    frames.append(_frame(2048, 2, lambda r: setattr(r.ChatRecord, "Message", "gg")))
+    frames.append(_frame(61440, 0, lambda r: r.EndOfReplayRecord.SetInParent()))
+    return frames
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_frames_stream_all_records(tmp_path, compress):
+    path = _write_replay(tmp_path / "CL44821-2024.02.07-16.55.SGReplay", _sample_frames(), compress)
+    with SGReplayReader(path) as reader:
+        assert reader.header()["build"] == 44821
+        kinds = [peek_frame(f)[1] for f in reader.frames()]
+    assert kinds[0] == "MapDetailsRecord"
+    assert kinds.count("PlayerCommandRecord") == 3
+    assert kinds[-1] == "EndOfReplayRecord"
+
+
+def test_type_filters_only_decode_matching_records(tmp_path):
+    path = _write_replay(tmp_path / "r.SGReplay", _sample_frames(command_count=500))
+    with SGReplayReader(path) as reader:
+        chat = [r.Data.Record.ChatRecord.Message for r in reader.chat()]
+        joins = [r.Data.Record.PlayerDetailsRecord.PlayerIdentifier.Name for r in reader.player_joins()]
+        mixed = list(reader.records([RECORD_CHAT, RECORD_PLAYER_DETAILS]))
+    assert chat == ["gg"]
+    assert joins == ["KJ", "Rival"]
+    assert len(mixed) == 3
+
+
+def test_summary_matches_sc2_pipeline_shape(tmp_path):
+    path = _write_replay(tmp_path / "CL44821-2024.02.07-16.55.SGReplay", _sample_frames())
+    data = summarize_replay(path)
+    assert data["map"] == "Boulder Bay"
+    assert sorted(p["name"] for p in data["players"].values()) == ["KJ", "Rival"]
+    assert data["frames"] / data["frames_per_second"] == 60
+    assert data["game_type"] == "1v1"
+
+    summary = build_replay_summary(path, "KJ", "Rival")
+    assert "Players: " in summary
+    assert "Map: Boulder Bay\n" in summary
+    assert "Game Duration: 1m 0s\n" in summary
+    assert f"Timestamp: {data['unix_timestamp']}\n" in summary
+
+
+def test_truncated_file_raises(tmp_path):
+    frames = _sample_frames()
+    path = _write_replay(tmp_path / "cut.SGReplay", frames, compress=False)
+    with open(path, "r+b") as f:
+        f.truncate(len(open(path, "rb").read()) - 3)
+    with SGReplayReader(path) as reader:
+        with pytest.raises(SGReplayError):
+            list(reader.frames())
@@ -1,6 +1,6 @@
 import asyncio
 from typing import List, Optional
-from core.interfaces import IChatService, IGameStateProvider, ILanguageModel
+from core.interfaces import IChatService, IGameStateProvider, ILanguageModel, IPlayerRepository
 from core.events import BaseEvent, MessageEvent, GameStateEvent
 
 class MockChatService(IChatService):
@@ -29,18 +29,23 @@ class MockGameStateProvider(IGameStateProvider):
         self.current_state = state
 
 class MockLanguageModel(ILanguageModel):
-    def __init__(self):
+    def __init__(self, delay: float = 0.0):
         self.responses = {}
         self.default_response = "I am a mock AI."
+        self.delay = delay  # simulated completion time in seconds
 
     async def generate_response(self, prompt: str, context: List[str] = None) -> str:
+        if self.delay:
+            await asyncio.sleep(self.delay)
         for key, response in self.responses.items():
             if key in prompt:
                 return response
         return self.default_response
 
-    async def generate_raw(self, prompt: str) -> str:
+    async def generate_raw(self, prompt: str, cache: Optional[str] = None) -> str:
         """Mock implementation of generate_raw"""
+        if self.delay:
+            await asyncio.sleep(self.delay)
         for key, response in self.responses.items():
             if key in prompt:
                 return response
@@ -50,3 +55,23 @@ class MockLanguageModel(ILanguageModel):
         self.responses[trigger] = response
 
 
+class MockPlayerRepository(IPlayerRepository):
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay  # simulated query time in seconds
+        self.stats = "Overall matchup records for player: 10 wins - 8 losses"
+        self.records = []
+
+    async def get_player_stats(self, player_name: str) -> Optional[str]:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.stats
+
+    async def get_matchup_stats(self, player_name: str) -> Optional[str]:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return None
+
+    async def get_player_records(self, player_name: str) -> List[str]:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return list(self.records)
@@ -0,0 +1,262 @@
+"""Synthetic Twitch chat flood against TwitchAdapter and BotCore, with mocks.
+
+A dedicated thread stands in for the IRC reactor and calls ``TwitchBot.on_pubmsg``
+at a fixed rate with a weighted mix of:
+
+- ``chat``: plain viewer chat (goes to the legacy path)
+- ``command``: ``career`` / ``history`` lookups handled by CommandService
+- ``vote``: FSL voting tokens (``mic1 clut`` ...) while a voting session is open
+- ``mention``: ``@OWNER ...`` lines
+
+Everything after ``on_pubmsg`` is the real code: TwitchAdapter, BotCore's lanes
+and workers, CommandService with the career/history handlers, the FSL voting
+session and the outbound Twitch queue (with a recording ``send_raw`` instead of
+IRC). The LLM and database are tests/mocks with configurable delays. The legacy
+``process_pubmsg`` needs a live database and OpenAI, so it is replaced by a
+counter that blocks the IRC thread for ``legacy_cost`` seconds per line, which
+is what the real one does to ingest.
+
+The report has ingest throughput, ``on_pubmsg`` call times, BotCore throughput,
+queue growth (chat lane depth and outbound lines waiting on the Twitch budget,
+sampled over the run) and queued -> done latency percentiles per line kind.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+from unittest import mock
+
+from irc.client import Event
+
+from settings import config
+from adapters.twitch_adapter import TwitchAdapter
+from core.bot import BotCore
+from core.command_service import CommandService
+from core.fsl_chat_voting import FSLChatVotingSession, VOTE_TOKEN_MAP
+from core.handlers.career_handler import CareerHandler
+from core.handlers.history_handler import HistoryHandler
+from tests.perf.latency_harness import bot_idle, summarize, time_events
+from core.outbound_chat import OutboundChatQueue
+from tests.mocks.all_mocks import MockGameStateProvider, MockLanguageModel, MockPlayerRepository
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("chat", "command", "vote", "mention")
+DEFAULT_MIX = {"chat": 70, "command": 10, "vote": 15, "mention": 5}
+
+_CHAT_LINES = ("gg", "nice build", "LUL", "what league is this", "that drop was clean",
+               "is this ranked?", "hi chat", "Pog", "he's going to lose that army", "o7")
+_PLAYERS = ("Serral", "Maru", "Clem", "Reynor", "Dark", "herO")
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """``chat=70,command=10,...`` -> weights; unknown kinds raise ValueError."""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in KINDS:
+            raise ValueError(f"Unknown line kind {kind!r} (expected one of {', '.join(KINDS)})")
+        mix[kind] = float(weight)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Mix needs at least one positive weight")
+    return mix
+
+
+class ChatFloodGenerator:
+    """Drive on_pubmsg from a stand-in IRC thread and measure how the core keeps up."""
+
+    def __init__(self, rate: float = 20.0, duration: float = 10.0, mix: Optional[Dict[str, float]] = None,
+                 viewers: int = 200, llm_delay: float = 0.5, db_delay: float = 0.02,
+                 legacy_cost: float = 0.0, sample_interval: float = 0.1, seed: int = 0):
+        self.rate = float(rate)
+        self.duration = float(duration)
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.viewers = max(1, int(viewers))
+        self.llm_delay = llm_delay
+        self.db_delay = db_delay
+        self.legacy_cost = legacy_cost
+        self.sample_interval = sample_interval
+        self.rng = random.Random(seed)
+        self.channel = "#" + str(getattr(config, "PAGE", "channel") or "channel").lower()
+        self.owner = str(getattr(config, "OWNER", "streamer") or "streamer")
+        self._kind_of: Dict[str, str] = {}
+        self.call_times: List[float] = []
+        self.max_behind = 0.0
+        self.legacy_calls = 0
+        self.sent: List[Tuple[float, str]] = []
+        self.queue_samples: List[Dict[str, float]] = []
+
+    def make_line(self, kind: str) -> Tuple[str, str]:
+        """(author, text) for one line of the given kind."""
+        author = f"viewer{self.rng.randrange(self.viewers)}"
+        if kind == "command":
+            text = f"{self.rng.choice(('career', 'history'))} {self.rng.choice(_PLAYERS)}"
+        elif kind == "vote":
+            text = " ".join(self.rng.sample(sorted(VOTE_TOKEN_MAP), self.rng.randint(1, 3)))
+        elif kind == "mention":
+            text = f"@{self.owner} {self.rng.choice(_CHAT_LINES)}"
+        else:
+            text = self.rng.choice(_CHAT_LINES)
+        self._kind_of.setdefault(text, kind)
+        return author, text
+
+    def make_lines(self) -> List[Tuple[str, str, str]]:
+        kinds = list(self.mix)
+        weights = [self.mix[k] for k in kinds]
+        count = max(1, int(self.rate * self.duration))
+        return [(kind, *self.make_line(kind)) for kind in self.rng.choices(kinds, weights, k=count)]
+
+    def _build(self):
+        from api.twitch_bot import TwitchBot
+
+        # Only the attributes on_pubmsg and the send path touch; no IRC connection is made
+        twitch_bot = TwitchBot.__new__(TwitchBot)
+        twitch_bot.username = "flood_bot"
+        twitch_bot.channel = self.channel
+        twitch_bot.connection = None
+        twitch_bot.pending_player_comment = None
+        twitch_bot.outbound = OutboundChatQueue(lambda channel, line: self.sent.append((time.monotonic(), line)))
+
+        llm = MockLanguageModel(delay=self.llm_delay)
+        players = MockPlayerRepository(delay=self.db_delay)
+        adapter = TwitchAdapter(None, twitch_bot)
+        command_service = CommandService([adapter])
+        command_service.register_handler("career", CareerHandler(players, llm))
+        command_service.register_handler("history", HistoryHandler(players, llm))
+        bot = BotCore([adapter], MockGameStateProvider(), llm, command_service=command_service)
+        adapter.bot_core = bot
+        twitch_bot.message_handler = adapter.on_message
+        twitch_bot.fsl_voting_session = None
+        if self.mix.get("vote"):
+            twitch_bot.fsl_voting_session = FSLChatVotingSession(
+                fsl_match_id=0, session_id=0, expires_at_iso="2099-01-01T00:00:00Z",
+                player1_name="Player1", player2_name="Player2", twitch_bot=twitch_bot,
+            )
+        return twitch_bot, bot
+
+    def _legacy_pubmsg(self, twitch_bot, event, logger, context_history) -> None:
+        self.legacy_calls += 1
+        if self.legacy_cost > 0:
+            time.sleep(self.legacy_cost)
+
+    def _drive(self, twitch_bot, lines) -> float:
+        """The IRC thread: deliver lines on schedule; returns the seconds it took."""
+        started = time.monotonic()
+        for i, (_, author, text) in enumerate(lines):
+            due = started + i / self.rate
+            now = time.monotonic()
+            if due > now:
+                time.sleep(due - now)
+            else:
+                self.max_behind = max(self.max_behind, now - due)
+            event = Event("pubmsg", f"{author}!{author}@{author}.tmi.twitch.tv", self.channel, [text])
+            call_started = time.monotonic()
+            twitch_bot.on_pubmsg(None, event)
+            self.call_times.append(time.monotonic() - call_started)
+        return time.monotonic() - started
+
+    async def _sample_queues(self, bot: BotCore, outbound: OutboundChatQueue, started: float) -> None:
+        while True:
+            chat = bot.lane_stats()["chat"]
+            self.queue_samples.append({
+                "t": round(time.monotonic() - started, 2),
+                "ingress": bot.event_queue.qsize(),
+                "chat_depth": chat["depth"],
+                "chat_running": chat["running"],
+                "outbound_pending": outbound.pending(),
+            })
+            await asyncio.sleep(self.sample_interval)
+
+    async def run(self, drain_timeout: float = 30.0) -> Dict:
+        """Flood the bot and return the report."""
+        import api.twitch_bot as twitch_bot_module
+
+        lines = self.make_lines()
+        twitch_bot, bot = self._build()
+        samples = time_events(bot, lambda event: self._kind_of.get(getattr(event, "content", ""), "chat"))
+        bot_task = asyncio.create_task(bot.start())
+        outbound_task = asyncio.create_task(twitch_bot.outbound.run())
+        started = time.monotonic()
+        sampler = asyncio.create_task(self._sample_queues(bot, twitch_bot.outbound, started))
+        try:
+            with mock.patch.object(twitch_bot_module, "process_pubmsg", self._legacy_pubmsg):
+                ingest_elapsed = await asyncio.to_thread(self._drive, twitch_bot, lines)
+            at_feed_end = dict(self.queue_samples[-1]) if self.queue_samples else {}
+            deadline = time.monotonic() + drain_timeout
+            while not bot_idle(bot) and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+            core_elapsed = time.monotonic() - started
+        finally:
+            sampler.cancel()
+            bot.stop()
+            twitch_bot.outbound.stop()
+            await asyncio.gather(bot_task, outbound_task, sampler, return_exceptions=True)
+            if twitch_bot.fsl_voting_session is not None:
+                twitch_bot.fsl_voting_session.cancel_timer()
+        return self.report(lines, samples, bot, twitch_bot.outbound, ingest_elapsed, core_elapsed, at_feed_end)
+
+    def report(self, lines, samples, bot: BotCore, outbound: OutboundChatQueue,
+               ingest_elapsed: float, core_elapsed: float, at_feed_end: Dict) -> Dict:
+        offered = {kind: sum(1 for line in lines if line[0] == kind) for kind in KINDS}
+        processed = [s for s in samples if s.done_at is not None]
+        latency = {}
+        for kind in KINDS:
+            of_kind = [s for s in samples if s.label == kind]
+            if of_kind:
+                latency[kind] = {
+                    "done": summarize([s.done_at - s.queued_at for s in of_kind if s.done_at is not None]),
+                    "not_processed": sum(1 for s in of_kind if s.done_at is None),
+                }
+        return {
+            "lines": len(lines),
+            "offered": {k: v for k, v in offered.items() if v},
+            "offered_rate": self.rate,
+            "ingest": {
+                "elapsed_s": round(ingest_elapsed, 2),
+                "lines_per_s": round(len(lines) / ingest_elapsed, 1) if ingest_elapsed else 0.0,
+                "max_behind_ms": round(self.max_behind * 1000, 1),
+                "on_pubmsg": summarize(self.call_times),
+                "legacy_calls": self.legacy_calls,
+            },
+            "core": {
+                "events": len(samples),
+                "processed": len(processed),
+                "elapsed_s": round(core_elapsed, 2),
+                "events_per_s": round(len(processed) / core_elapsed, 1) if core_elapsed else 0.0,
+                "lanes": bot.lane_stats(),
+            },
+            "queues": {
+                "peak_chat_depth": max((q["chat_depth"] for q in self.queue_samples), default=0),
+                "peak_outbound_pending": max((q["outbound_pending"] for q in self.queue_samples), default=0),
+                "at_feed_end": at_feed_end,
+                "samples": self.queue_samples,
+            },
+            "outbound": outbound.stats(),
+            "latency": latency,
+        }
+
+
+def format_report(report: Dict) -> str:
+    ingest, core, queues = report["ingest"], report["core"], report["queues"]
+    call = ingest["on_pubmsg"]
+    lines = [
+        f"{report['lines']} lines offered at {report['offered_rate']}/s "
+        f"({', '.join(f'{k} {v}' for k, v in report['offered'].items())})",
+        f"ingest: {ingest['lines_per_s']} lines/s over {ingest['elapsed_s']}s, "
+        f"max {ingest['max_behind_ms']}ms behind schedule, {ingest['legacy_calls']} reached legacy",
+        f"on_pubmsg: p50 {call['p50_ms']}ms p99 {call['p99_ms']}ms max {call['max_ms']}ms",
+        f"core: {core['processed']}/{core['events']} events processed, {core['events_per_s']}/s, "
+        f"chat lane dropped {core['lanes']['chat']['dropped']} merged {core['lanes']['chat']['merged']}",
+        f"queues: peak chat depth {queues['peak_chat_depth']}, peak outbound {queues['peak_outbound_pending']}, "
+        f"at feed end {queues['at_feed_end']}",
+        f"outbound: {report['outbound']['sent']} PRIVMSG sent, {report['outbound']['packed']} lines packed, "
+        f"{report['outbound']['pending']} unsent",
+        f"{'kind':<12}{'n':>6}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  (ms, queued -> done)",
+    ]
+    for kind, stats in report["latency"].items():
+        s = stats["done"]
+        lines.append(f"{kind:<12}{s['count']:>6}{s['p50_ms']:>10}{s['p90_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}"
+                     + (f"  ({stats['not_processed']} not processed)" if stats["not_processed"] else ""))
+    return "\n".join(lines)
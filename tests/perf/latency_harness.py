@@ -0,0 +1,191 @@
+"""Replay a recorded input stream through BotCore with mocks and report end-to-end latency.
+
+The harness wires the same pieces run_core does for chat and game state (BotCore
+with its lanes and workers, CommandService with the career/history handlers, and
+SC2Adapter state detection) but with tests/mocks in place of OpenAI, the
+database and the chat platforms. Each input is timed from the moment it is
+queued (chat line added, or SC2 snapshot fed to the adapter) to:
+
+- ``done``: BotCore finished processing it
+- ``reply``: the first chat message it caused was sent (if any)
+
+Records are fed at their recorded offsets divided by ``speed``; ``speed=0``
+feeds them back to back. Game-end replay parsing is not part of the harness
+(SC2Adapter runs without a GameResultService).
+"""
+import asyncio
+import contextvars
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from core.bot import BotCore
+from core.command_service import CommandService
+from core.event_recorder import KIND_GAME_STATE, KIND_MESSAGE, KIND_SC2
+from core.events import BaseEvent, GameStateEvent, MessageEvent
+from core.handlers.career_handler import CareerHandler
+from core.handlers.history_handler import HistoryHandler
+from core.instrumentation import percentile, summarize  # noqa: F401 (re-exported)
+from tests.mocks.all_mocks import (
+    MockChatService,
+    MockGameStateProvider,
+    MockLanguageModel,
+    MockPlayerRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+_current_sample = contextvars.ContextVar("latency_sample", default=None)
+
+
+@dataclass
+class LatencySample:
+    label: str
+    queued_at: float
+    done_at: Optional[float] = None
+    first_reply_at: Optional[float] = None
+
+
+class _TimedChatService(MockChatService):
+    """Mock chat that stamps the first reply time on the event being processed."""
+
+    async def send_message(self, channel: str, message: str) -> None:
+        await super().send_message(channel, message)
+        sample = _current_sample.get()
+        if sample is not None and sample.first_reply_at is None:
+            sample.first_reply_at = time.monotonic()
+
+
+def time_events(bot: BotCore, label: Callable[[BaseEvent], str]) -> List[LatencySample]:
+    """
+    Wrap bot.add_event/process_event so every event gets a LatencySample; chat
+    sent while an event is processed stamps its first_reply_at (see _TimedChatService).
+    Returns the live list of samples.
+    """
+    samples: List[LatencySample] = []
+    by_event: Dict[int, LatencySample] = {}
+    add_event, process_event = bot.add_event, bot.process_event
+
+    def timed_add(event: BaseEvent):
+        sample = LatencySample(label(event), time.monotonic())
+        samples.append(sample)
+        by_event[id(event)] = sample
+        add_event(event)
+
+    async def timed_process(event: BaseEvent):
+        sample = by_event.pop(id(event), None)
+        token = _current_sample.set(sample)
+        try:
+            await process_event(event)
+        finally:
+            _current_sample.reset(token)
+            if sample is not None:
+                sample.done_at = time.monotonic()
+
+    bot.add_event = timed_add
+    bot.process_event = timed_process
+    return samples
+
+
+def bot_idle(bot: BotCore) -> bool:
+    """Nothing queued, waiting or running in any lane."""
+    lanes = bot.lane_stats().values()
+    return bot.event_queue.empty() and all(l["depth"] == 0 and l["running"] == 0 for l in lanes)
+
+
+class LatencyHarness:
+    """BotCore + CommandService + SC2Adapter over mocks, with per-event timing."""
+
+    def __init__(self, llm_delay: float = 0.0, db_delay: float = 0.0, as_platform: Optional[str] = None):
+        from adapters.sc2_adapter import SC2Adapter
+
+        self.as_platform = as_platform
+        self.chats = {name: _TimedChatService(name) for name in ("twitch", "discord")}
+        self.llm = MockLanguageModel(delay=llm_delay)
+        players = MockPlayerRepository(delay=db_delay)
+        self.command_service = CommandService(list(self.chats.values()))
+        self.command_service.register_handler("career", CareerHandler(players, self.llm))
+        self.command_service.register_handler("history", HistoryHandler(players, self.llm))
+        self.bot = BotCore(list(self.chats.values()), MockGameStateProvider(), self.llm,
+                           command_service=self.command_service)
+        self.sc2 = SC2Adapter(self.bot)
+        self.samples = time_events(self.bot, self._label)
+
+    def _label(self, event: BaseEvent) -> str:
+        if isinstance(event, GameStateEvent):
+            return f"game:{event.event_type}"
+        if isinstance(event, MessageEvent):
+            kind = "command" if self.command_service.is_command(event.content) else "chat"
+            return f"{event.platform}:{kind}"
+        return type(event).__name__
+
+    async def _feed(self, record: Dict, replay_game_states: bool) -> None:
+        kind, data = record.get("kind"), record.get("data") or {}
+        if kind == KIND_MESSAGE:
+            self.bot.add_event(MessageEvent(
+                platform=self.as_platform or data.get("platform", "twitch"),
+                channel=data.get("channel", "channel"),
+                author=data.get("author", "viewer"),
+                content=data.get("content", ""),
+            ))
+        elif kind == KIND_SC2:
+            from models.game_info import GameInfo
+            await self.sc2.process_snapshot(GameInfo(data))
+        elif kind == KIND_GAME_STATE and replay_game_states:
+            self.bot.add_event(GameStateEvent(event_type=data.get("event_type", "status_change")))
+
+    async def replay(self, records: List[Dict], speed: float = 1.0, drain_timeout: float = 30.0) -> Dict:
+        """Feed records through the bot and return the latency report."""
+        # Recorded game_state lines duplicate what SC2Adapter derives from the snapshots
+        replay_game_states = not any(r.get("kind") == KIND_SC2 for r in records)
+        bot_task = asyncio.create_task(self.bot.start())
+        started = time.monotonic()
+        try:
+            for record in records:
+                if speed > 0:
+                    delay = started + float(record.get("t", 0)) / speed - time.monotonic()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                await self._feed(record, replay_game_states)
+                await asyncio.sleep(0)
+            deadline = time.monotonic() + drain_timeout
+            while not bot_idle(self.bot) and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+        finally:
+            self.bot.stop()
+            await bot_task
+        return self.report(time.monotonic() - started)
+
+    def report(self, elapsed: float) -> Dict:
+        labels = sorted({s.label for s in self.samples})
+        by_label = {}
+        for label in labels:
+            samples = [s for s in self.samples if s.label == label]
+            by_label[label] = {
+                "done": summarize([s.done_at - s.queued_at for s in samples if s.done_at is not None]),
+                "reply": summarize([s.first_reply_at - s.queued_at for s in samples if s.first_reply_at is not None]),
+                "not_processed": sum(1 for s in samples if s.done_at is None),
+            }
+        return {
+            "events": len(self.samples),
+            "elapsed_s": round(elapsed, 2),
+            "messages_sent": sum(len(c.sent_messages) for c in self.chats.values()),
+            "lanes": self.bot.lane_stats(),
+            "latency": by_label,
+        }
+
+
+def format_report(report: Dict) -> str:
+    lines = [f"{report['events']} events in {report['elapsed_s']}s, {report['messages_sent']} messages sent"]
+    lines.append(f"{'event':<24}{'n':>6}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}  (ms, queued -> done / first reply)")
+    for label, stats in report["latency"].items():
+        for phase in ("done", "reply"):
+            s = stats[phase]
+            if s["count"]:
+                lines.append(f"{label + ' ' + phase:<24}{s['count']:>6}{s['p50_ms']:>10}{s['p90_ms']:>10}"
+                             f"{s['p99_ms']:>10}{s['max_ms']:>10}")
+        if stats["not_processed"]:
+            # Dropped or merged by the chat lane's overflow policy
+            lines.append(f"{label + ' not processed':<24}{stats['not_processed']:>6}")
+    return "\n".join(lines)
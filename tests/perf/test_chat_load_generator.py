@@ -0,0 +1,32 @@
+import pytest
+
+from tests.perf.chat_load_generator import ChatFloodGenerator, format_report, parse_mix
+from settings import config
+
+
+def test_parse_mix():
+    assert parse_mix("chat=3, vote=1") == {"chat": 3.0, "vote": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("spam=1")
+    with pytest.raises(ValueError):
+        parse_mix("chat=0")
+
+
+@pytest.mark.asyncio
+async def test_flood_reports_throughput_queues_and_latency(monkeypatch):
+    monkeypatch.setattr(config, "ENABLE_FSL_ASK", False, raising=False)
+    generator = ChatFloodGenerator(rate=200, duration=0.3, llm_delay=0.0, db_delay=0.0, seed=1,
+                                   mix={"chat": 4, "command": 2, "vote": 2, "mention": 1})
+    report = await generator.run(drain_timeout=5)
+
+    offered = report["offered"]
+    assert report["lines"] == 60 == sum(offered.values())
+    # Every line reaches BotCore; votes are consumed and commands skip the legacy path
+    assert report["core"]["events"] == report["core"]["processed"] == 60
+    assert report["ingest"]["legacy_calls"] == offered["chat"] + offered["mention"]
+    assert report["ingest"]["on_pubmsg"]["count"] == 60
+    assert report["latency"]["command"]["done"]["count"] == offered["command"]
+    assert report["queues"]["samples"]
+    # Command replies went through the outbound Twitch queue
+    assert report["outbound"]["sent"] + report["outbound"]["pending"] > 0
+    assert "queued -> done" in format_report(report)
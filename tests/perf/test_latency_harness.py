@@ -0,0 +1,45 @@
+import pytest
+
+from core.event_recorder import EventRecorder, load_recording
+from core.events import MessageEvent
+from tests.perf.latency_harness import LatencyHarness, format_report, percentile
+from models.game_info import GameInfo
+
+
+def _snapshot(mine, theirs):
+    return GameInfo({"isReplay": False, "displayTime": 5.0, "players": [
+        {"id": 1, "name": "Streamer", "type": "user", "race": "Zerg", "result": mine},
+        {"id": 2, "name": "Rival", "type": "user", "race": "Terran", "result": theirs},
+    ]})
+
+
+def test_percentile_nearest_rank():
+    values = sorted(float(v) for v in range(1, 101))
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 90) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_recorded_stream_replays_with_latency_report(tmp_path):
+    path = tmp_path / "events.jsonl"
+    recorder = EventRecorder(str(path))
+    recorder.record_sc2_snapshot(_snapshot("Undecided", "Undecided"))
+    recorder.record_event(MessageEvent(platform="twitch", channel="c", author="a", content="!career Rival"))
+    recorder.record_event(MessageEvent(platform="twitch", channel="c", author="b", content="hello bot"))
+    recorder.record_sc2_snapshot(_snapshot("Victory", "Defeat"))
+    recorder.close()
+
+    records = load_recording(str(path))
+    assert [r["kind"] for r in records] == ["sc2", "message", "message", "sc2"]
+
+    # !career is answered from a record template (no completion), so its latency is the two DB queries
+    harness = LatencyHarness(llm_delay=0.01, db_delay=0.005, as_platform="discord")
+    report = await harness.replay(records, speed=0)
+
+    latency = report["latency"]
+    assert set(latency) == {"game:game_started", "game:game_ended", "discord:command", "discord:chat"}
+    assert latency["discord:command"]["reply"]["count"] == 1
+    assert latency["discord:command"]["reply"]["p50_ms"] >= 10
+    assert latency["discord:chat"]["done"]["count"] == 1
+    assert "discord:command reply" in format_report(report)
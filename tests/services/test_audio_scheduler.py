@@ -0,0 +1,48 @@
+import threading
+import time
+
+from core.audio_scheduler import AudioScheduler
+
+
+def test_speaks_immediately_when_nothing_is_playing():
+    scheduler = AudioScheduler(is_busy=lambda: False, poll_interval=0.01, max_wait=5)
+    started = time.monotonic()
+    with scheduler.speaking():
+        pass
+    assert time.monotonic() - started < 0.05
+
+
+def test_waits_only_while_a_sound_is_playing():
+    until = time.monotonic() + 0.1
+    scheduler = AudioScheduler(is_busy=lambda: time.monotonic() < until, poll_interval=0.01, max_wait=5)
+    waited = scheduler.wait_until_idle()
+    assert 0.08 <= waited < 0.5
+
+
+def test_gives_up_after_max_wait():
+    scheduler = AudioScheduler(is_busy=lambda: True, poll_interval=0.01, max_wait=0.05)
+    waited = scheduler.wait_until_idle()
+    assert 0.05 <= waited < 0.3
+
+
+def test_lines_are_spoken_one_at_a_time():
+    scheduler = AudioScheduler(is_busy=lambda: False, poll_interval=0.01, max_wait=5)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def speak():
+        nonlocal active, peak
+        with scheduler.speaking():
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=speak) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == 1
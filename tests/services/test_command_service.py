@@ -80,3 +80,31 @@ async def test_longest_match_wins(mock_chat_service):
     
     player_comment_handler.handle_mock.assert_called_once()
     player_handler.handle_mock.assert_not_called()
+
+
+def test_matcher_follows_dispatch_rules():
+    from core.command_service import CommandMatcher
+    matcher = CommandMatcher(["fsl", "fsl_review", "history", "head to head", "player comment", "wiki"])
+
+    assert matcher.match("fsl_review") == ("fsl_review", "")
+    assert matcher.match("!FSL stats") == ("fsl", "stats")
+    assert matcher.match("!wiki") == ("wiki", "")
+    assert matcher.match("wiki  Zerg Rush") == ("wiki", "Zerg Rush")
+    assert matcher.match("wikipedia says") is None
+    assert matcher.match("my history") is None
+    # "contains" keywords match anywhere, and beat a shorter prefix keyword
+    assert matcher.match("history head to head") == ("head to head", "history head to head")
+    assert matcher.match("so, Head To Head?") == ("head to head", "so, Head To Head?")
+    assert matcher.match("player comment cheese") == ("player comment", "cheese")
+
+
+def test_matcher_mentions_is_loose_and_recompiled_on_register():
+    from core.command_service import CommandMatcher
+    assert CommandMatcher(["please retry", "!ratings"]).mentions("ok please retry now")
+    assert not CommandMatcher(["please retry", "!ratings"]).mentions("ratings are in")
+    assert not CommandMatcher([]).mentions("anything")
+
+    service = CommandService([])
+    assert not service.is_command("wiki zerg")
+    service.register_handler("Wiki", MockHandler())
+    assert service.is_command("  WIKI zerg ")
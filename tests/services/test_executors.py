@@ -0,0 +1,48 @@
+import asyncio
+import threading
+
+import pytest
+
+from core import executors
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pools():
+    executors.shutdown_executors(wait=True)
+    yield
+    executors.shutdown_executors(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_saturated_llm_pool_does_not_delay_poll(monkeypatch):
+    monkeypatch.setattr(executors.config, "EXECUTOR_LLM_WORKERS", 2, raising=False)
+    release = threading.Event()
+    loop = asyncio.get_running_loop()
+
+    slow = [loop.run_in_executor(executors.get_executor("llm"), release.wait) for _ in range(6)]
+    poll = await asyncio.wait_for(
+        loop.run_in_executor(executors.get_executor("poll"), lambda: "IN_PROGRESS"), timeout=1
+    )
+    assert poll == "IN_PROGRESS"
+
+    stats = executors.executor_stats()
+    assert stats["llm"]["workers"] == 2
+    assert stats["llm"]["running"] == 2 and stats["llm"]["queued"] == 4
+    assert stats["poll"]["completed"] == 1
+
+    release.set()
+    await asyncio.gather(*slow)
+    stats = executors.get_executor("llm").stats()
+    assert stats["completed"] == 6 and stats["queued"] == 0 and stats["max_wait_ms"] > 0
+
+
+def test_failures_are_counted_and_pools_are_shared():
+    pool = executors.get_executor("db")
+    assert executors.get_executor("db") is pool
+
+    def boom():
+        raise ValueError("down")
+
+    with pytest.raises(ValueError):
+        pool.submit(boom).result()
+    assert pool.stats()["failed"] == 1 and pool.stats()["running"] == 0
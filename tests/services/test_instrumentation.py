@@ -0,0 +1,77 @@
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.command_service import CommandContext
+from core.handlers.perf_handler import PerfHandler
+from core.instrumentation import Instrumentation, format_summary
+from settings import config
+
+
+def test_span_histogram_and_trace_breakdown():
+    inst = Instrumentation(window=3, trace_history=2)
+    with inst.trace("game_end"):
+        with inst.span("game_end.parse"):
+            time.sleep(0.01)
+        with inst.span("game_end.save"):
+            pass
+    for _ in range(5):
+        inst.record("event.chat", 0.002)
+
+    snap = inst.snapshot()
+    assert snap["spans"]["event.chat"]["count"] == 3  # rolling window
+    assert snap["spans"]["event.chat"]["total"] == 5
+    trace = snap["traces"]["game_end"][-1]
+    assert [stage for stage, _ in trace["stages"]] == ["game_end.parse", "game_end.save"]
+    assert trace["total_ms"] >= trace["stages"][0][1] >= 10
+    assert "last game_end" in format_summary(snap)
+
+
+@pytest.mark.asyncio
+async def test_trace_ignores_spans_from_other_tasks():
+    inst = Instrumentation()
+
+    async def other():
+        with inst.span("event.twitch_message"):
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(other())
+    with inst.trace("pregame"):
+        with inst.span("pregame.records"):
+            await asyncio.sleep(0.02)
+        await task
+    assert [s for s, _ in inst.snapshot()["traces"]["pregame"][0]["stages"]] == ["pregame.records"]
+
+
+@pytest.mark.asyncio
+async def test_monitor_measures_loop_lag_and_dumps(tmp_path):
+    inst = Instrumentation()
+    path = tmp_path / "perf.json"
+    task = asyncio.create_task(inst.monitor(interval=0.01, dump_seconds=0))
+    await asyncio.sleep(0.02)
+    time.sleep(0.05)  # block the loop
+    await asyncio.sleep(0.03)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert inst.loop_lag.snapshot()["max_ms"] >= 30
+    assert inst.dump(str(path)) == str(path)
+    assert json.loads(path.read_text())["loop_lag"]["count"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_perf_command_is_owner_only(monkeypatch):
+    monkeypatch.setattr(config, "PAGE", "streamer", raising=False)
+    monkeypatch.setattr(config, "OWNER", "owner", raising=False)
+    chat = MagicMock()
+    chat.send_message = AsyncMock()
+    handler = PerfHandler()
+
+    await handler.handle(CommandContext("please perf", "c", "viewer", "twitch", chat), "")
+    chat.send_message.assert_not_called()
+
+    await handler.handle(CommandContext("please perf", "c", "Owner", "twitch", chat), "")
+    assert "loop lag" in chat.send_message.call_args[0][1]
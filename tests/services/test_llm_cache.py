@@ -0,0 +1,89 @@
+from unittest import mock
+
+import pytest
+
+from core.llm_cache import LLMResponseCache
+from tests.services.test_llm_client import _FakeClient
+
+
+def test_normalized_prompt_hits_and_classes_are_separate():
+    cache = LLMResponseCache(max_entries=10, ttls={"career": 60})
+    key = cache.key_for("career", "records for  KJ:\n 10-5", "m")
+    cache.put("career", key, "overall: 10-5")
+
+    assert cache.get("career", cache.key_for("career", "records for KJ: 10-5", "m")) == "overall: 10-5"
+    assert cache.get("career", cache.key_for("career", "records for KJ: 10-6", "m")) is None
+    assert cache.get("career", cache.key_for("career", "records for KJ: 10-5", "other-model")) is None
+    assert cache.get("wiki", cache.key_for("wiki", "records for KJ: 10-5", "m")) is None
+    assert cache.stats()["classes"]["career"] == {"hit": 1, "miss": 2}
+
+
+def test_ttl_per_class_and_zero_disables():
+    cache = LLMResponseCache(ttls={"career": 60, "off": 0})
+    with mock.patch("core.llm_cache.time.time", return_value=1000.0):
+        cache.put("career", "k", "reply")
+        cache.put("off", "k2", "reply")
+    with mock.patch("core.llm_cache.time.time", return_value=1059.0):
+        assert cache.get("career", "k") == "reply"
+    with mock.patch("core.llm_cache.time.time", return_value=1061.0):
+        assert cache.get("career", "k") is None
+    assert cache.get("off", "k2") is None
+
+
+def test_lru_eviction():
+    cache = LLMResponseCache(max_entries=2, default_ttl=60)
+    cache.put("c", "a", "A")
+    cache.put("c", "b", "B")
+    assert cache.get("c", "a") == "A"  # a is now most recent
+    cache.put("c", "c", "C")
+    assert cache.get("c", "b") is None
+    assert cache.get("c", "a") == "A"
+
+
+def test_disk_store_survives_a_new_instance(tmp_path):
+    first = LLMResponseCache(directory=str(tmp_path), default_ttl=60)
+    first.put("wiki", "k", "zerglings are fast")
+    second = LLMResponseCache(directory=str(tmp_path), default_ttl=60)
+    assert second.get("wiki", "k") == "zerglings are fast"
+
+
+def test_get_or_compute_skips_uncacheable_results():
+    cache = LLMResponseCache(default_ttl=60)
+    calls = []
+
+    def lookup():
+        calls.append(1)
+        return "Error searching wiki: offline"
+
+    for _ in range(2):
+        cache.get_or_compute("wiki", "q", lookup, cacheable=lambda text: not text.startswith("Error"))
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_client_serves_repeats_from_cache_and_bypasses_without_class():
+    client = _FakeClient(delay=0.0)
+    created = []
+    create = client._create
+
+    async def counting_create(messages, model, kwargs):
+        created.append(messages)
+        return await create(messages, model, kwargs)
+
+    client._create = counting_create
+    try:
+        with mock.patch("core.llm_client.get_llm_cache", return_value=LLMResponseCache(default_ttl=60)):
+            messages = [{"role": "user", "content": "career KJ 10-5"}]
+            first = await client.complete(messages, cache="career")
+            second = await client.complete(messages, cache="career")
+            assert second.choices[0].message.content == first.choices[0].message.content
+            assert len(created) == 1
+
+            assert client.complete_sync(messages, cache="career").choices[0].message.content == \
+                first.choices[0].message.content
+            assert len(created) == 1
+
+            await client.complete(messages)  # persona-style call: no class, no cache
+            assert len(created) == 2
+    finally:
+        client.close()
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from core.llm_client import LLMClient
+
+
+class _FakeClient(LLMClient):
+    """LLMClient with the SDK call replaced by a delayed echo."""
+
+    def __init__(self, delay=0.05, **kwargs):
+        super().__init__(api_key="test", model="test-model", **kwargs)
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.loops = set()
+
+    async def _create(self, messages, model, kwargs):
+        self.loops.add(id(asyncio.get_running_loop()))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        message = SimpleNamespace(content=f"{model}: {messages[-1]['content']}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.mark.asyncio
+async def test_async_calls_do_not_block_the_loop_and_are_bounded():
+    client = _FakeClient(delay=0.05, max_concurrency=2)
+    try:
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        tick_task = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(client.complete([{"role": "user", "content": str(i)}]) for i in range(6)))
+        tick_task.cancel()
+
+        assert [r.choices[0].message.content for r in results] == [f"test-model: {i}" for i in range(6)]
+        assert client.peak == 2
+        assert ticks >= 10  # the caller's loop kept running during ~150ms of completions
+        assert len(client.loops) == 1 and id(asyncio.get_running_loop()) not in client.loops
+    finally:
+        client.close()
+
+
+def test_sync_shim_from_threads_shares_one_client_loop():
+    client = _FakeClient(delay=0.01)
+    try:
+        out = []
+        threads = [threading.Thread(target=lambda i=i: out.append(
+            client.complete_sync([{"role": "user", "content": str(i)}]).choices[0].message.content))
+            for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(out) == [f"test-model: {i}" for i in range(4)]
+        assert len(client.loops) == 1
+    finally:
+        client.close()
+
+
+def test_request_timeout():
+    client = _FakeClient(delay=1.0, timeout=0.05)
+    try:
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            client.complete_sync([{"role": "user", "content": "slow"}])
+        assert time.monotonic() - started < 0.5
+    finally:
+        client.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_calls_go_out_immediately_and_bursts_are_throttled():
+    # 1200/min = one call per 50ms after a burst of 2
+    client = _FakeClient(delay=0.0, requests_per_minute=1200, burst=2)
+    try:
+        started = time.monotonic()
+        await client.complete([{"role": "user", "content": "idle"}])
+        assert time.monotonic() - started < 0.05
+
+        started = time.monotonic()
+        await asyncio.gather(*(client.complete([{"role": "user", "content": str(i)}]) for i in range(4)))
+        # One token left from the burst, then three more at 50ms each
+        assert 0.12 <= time.monotonic() - started < 0.5
+    finally:
+        client.close()
+
+
+def test_rate_limit_can_be_disabled():
+    client = _FakeClient(requests_per_minute=0)
+    try:
+        assert client.limiter is None
+        assert client.complete_sync([{"role": "user", "content": "x"}]).choices[0].message.content == "test-model: x"
+    finally:
+        client.close()
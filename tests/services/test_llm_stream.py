@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+import api.chat_utils as chat_utils
+from core.llm_client import LLMClient
+from core.llm_stream import sentence_chunks
+
+
+def test_short_reply_is_one_last_message():
+    assert list(sentence_chunks(["Nice ", "build. ", "GG"], min_chars=150)) == [("Nice build. GG", True)]
+
+
+def test_flushes_at_sentence_boundaries_once_long_enough():
+    sentence = "Zerglings are fast and cheap units. "
+    deltas = list(sentence * 3) + list("Last bit")
+    out = list(sentence_chunks(deltas, min_chars=60, max_bytes=400))
+    # A sentence shorter than min_chars waits for the next one (or the end of the reply)
+    assert out == [
+        ((sentence * 2).strip(), False),
+        (sentence + "Last bit", True),
+    ]
+
+
+def test_byte_budget_splits_at_last_space():
+    words = ["word"] * 60
+    out = list(sentence_chunks([" ".join(words)], min_chars=10, max_bytes=50))
+    assert all(len(text.encode("utf-8")) <= 50 for text, _ in out)
+    assert " ".join(text for text, _ in out) == " ".join(words)
+    assert [last for _, last in out] == [False] * (len(out) - 1) + [True]
+
+
+class _StreamingClient(LLMClient):
+    """Streams the reply word by word with a delay between chunks."""
+
+    def __init__(self, reply, delay=0.0, **kwargs):
+        super().__init__(api_key="test", model="test-model", requests_per_minute=0, **kwargs)
+        self.reply = reply
+        self.delay = delay
+
+    async def _create(self, messages, model, kwargs):
+        assert kwargs.get("stream") is True
+
+        async def chunks():
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None))])  # role-only chunk
+            for word in self.reply.split(" "):
+                await asyncio.sleep(self.delay)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word + " "))])
+        return chunks()
+
+
+def test_stream_sync_yields_deltas_as_they_arrive():
+    client = _StreamingClient("one two three", delay=0.01)
+    try:
+        assert "".join(client.stream_sync([{"role": "user", "content": "x"}])) == "one two three "
+    finally:
+        client.close()
+
+
+def test_stream_sync_stalled_stream_times_out():
+    client = _StreamingClient("one two", delay=1.0, timeout=0.05)
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            list(client.stream_sync([{"role": "user", "content": "x"}]))
+    finally:
+        client.close()
+
+
+def test_process_message_streams_sentences_to_chat():
+    reply = ("Zerg has the faster early game in this matchup. " * 4).strip()
+    client = _StreamingClient(reply)
+    sent = []
+    config = SimpleNamespace(**{k: getattr(chat_utils.config, k) for k in dir(chat_utils.config) if k.isupper()})
+    config.LLM_STREAMING = True
+    config.LLM_STREAM_MIN_CHUNK_CHARS = 60
+    try:
+        with mock.patch.object(chat_utils, "config", config), \
+             mock.patch.object(chat_utils, "get_llm_client", return_value=client), \
+             mock.patch.object(chat_utils, "get_random_emote", return_value="GG"), \
+             mock.patch.object(chat_utils.tokensArray, "num_tokens_from_string", return_value=10), \
+             mock.patch.object(chat_utils, "msgToChannel",
+                               side_effect=lambda self, text, logger, **kw: sent.append(text)):
+            chat_utils.processMessageForOpenAI(None, "who wins?", "in_game", logging.getLogger("t"), [])
+    finally:
+        client.close()
+    assert len(sent) == 2
+    assert " ".join(sent).replace(" GG", "") == reply
+
+
+def _stream_replay_analysis(reply):
+    client = _StreamingClient(reply)
+    sent = []
+    config = SimpleNamespace(**{k: getattr(chat_utils.config, k) for k in dir(chat_utils.config) if k.isupper()})
+    config.LLM_STREAMING = True
+    config.LLM_STREAM_MIN_CHUNK_CHARS = 60
+    config.LLM_STREAM_MODES = ("replay_analysis",)
+    summary = "Players: Winner, Loser\nMap: Altitude LE\nWinners: Winner\nLosers: Loser\n"
+    try:
+        with mock.patch.object(chat_utils, "config", config), \
+             mock.patch.object(chat_utils, "get_llm_client", return_value=client), \
+             mock.patch.object(chat_utils, "get_random_emote", return_value="GG"), \
+             mock.patch.object(chat_utils.tokensArray, "num_tokens_from_string", return_value=10), \
+             mock.patch.object(chat_utils, "msgToChannel",
+                               side_effect=lambda self, text, logger, **kw: sent.append(text)):
+            chat_utils.processMessageForOpenAI(None, summary, "replay_analysis", logging.getLogger("t"), [])
+    finally:
+        client.close()
+    return sent
+
+
+def test_replay_analysis_streams_with_winner_corrections():
+    sent = _stream_replay_analysis(
+        "Loser took the win and sealed the victory with great macro over the whole game. "
+        "Winner played a long game but the defensive positioning was not enough this time.")
+    assert len(sent) == 2
+    assert sent[0].startswith("Winner took the win")
+    assert "Loser took" not in " ".join(sent)
+
+
+def test_replay_analysis_correction_judged_on_reply_so_far():
+    # "win" and "victory" land in different messages; neither trips the check on its own
+    sent = _stream_replay_analysis(
+        "Loser had the win in sight after holding the early pressure on both bases. "
+        "In the end Loser won with a clean victory after a long and patient late game.")
+    assert len(sent) == 2
+    assert "Winner won with a clean victory" in sent[1]
+    assert "Loser won" not in sent[1]
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from core.metrics import MetricsRegistry, start_metrics_server
+
+
+def test_counter_gauge_histogram_text_format():
+    registry = MetricsRegistry()
+    events = registry.counter("t_events_total", "events", ("type",))
+    fresh = registry.gauge("t_fresh", "freshness")
+    latency = registry.histogram("t_latency_seconds", "latency", ("call",), buckets=(0.1, 1.0))
+    events.inc(type="game_started")
+    events.inc(2, type="game_started")
+    fresh.set(12.5)
+    latency.observe(0.05, call="prompt")
+    latency.observe(0.5, call="prompt")
+    latency.observe(5, call="prompt")
+    with pytest.raises(ValueError):
+        events.inc(kind="x")
+
+    text = registry.render()
+    assert "# TYPE t_events_total counter" in text
+    assert 't_events_total{type="game_started"} 3' in text
+    assert "t_fresh 12.5" in text
+    assert 't_latency_seconds_bucket{call="prompt",le="0.1"} 1' in text
+    assert 't_latency_seconds_bucket{call="prompt",le="1"} 2' in text
+    assert 't_latency_seconds_bucket{call="prompt",le="+Inf"} 3' in text
+    assert 't_latency_seconds_count{call="prompt"} 3' in text
+
+
+def test_histogram_time_decorates_functions():
+    registry = MetricsRegistry()
+    latency = registry.histogram("t_parse_seconds", "parse")
+
+    @latency.time()
+    def parse():
+        return "ok"
+
+    assert parse() == "ok" and parse() == "ok"
+    assert latency.count() == 2
+
+
+def test_collectors_run_at_scrape_and_failures_are_skipped():
+    registry = MetricsRegistry()
+    registry.register_collector(lambda: [("t_depth", "gauge", "depth", [("t_depth", {"lane": "chat"}, 4)])])
+    registry.register_collector(lambda: 1 / 0)
+    assert 't_depth{lane="chat"} 4' in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_serves_local_http():
+    server = await start_metrics_server("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await writer.drain()
+        response = (await reader.read()).decode()
+        writer.close()
+        assert response.startswith("HTTP/1.1 200 OK")
+        assert "bot_events_processed_total" in response
+        assert "bot_event_loop_lag_seconds_count" in response
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /nope HTTP/1.1\r\n\r\n")
+        await writer.drain()
+        assert (await reader.read()).startswith(b"HTTP/1.1 404")
+        writer.close()
+    finally:
+        server.close()
+        await server.wait_closed()
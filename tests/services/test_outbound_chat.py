@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from core.outbound_chat import OutboundChatQueue, game_critical_chat, split_for_chat, truncate_utf8
+from core.rate_limit import TokenBucket
+
+
+def test_split_and_truncate_respect_utf8_boundaries():
+    assert truncate_utf8("gg 🎉🎉", 5) == "gg "
+    chunks = split_for_chat("zerg " + "🎉" * 5 + " rush", 8)
+    assert chunks == ["zerg", "🎉🎉", "🎉🎉", "🎉", "rush"]
+    assert all(len(c.encode("utf-8")) <= 8 for c in chunks)
+
+
+def test_token_bucket_reports_wait_until_refill():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=1, clock=lambda: now[0])
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    now[0] = 0.5
+    assert bucket.try_acquire() == 0.0
+
+
+def test_not_started_sends_directly_in_byte_sized_lines():
+    sent = []
+    queue = OutboundChatQueue(lambda ch, text: sent.append(text), byte_limit=10)
+    queue.send("#chan", "hello there\r\nfriends")
+    assert sent == ["hello", "there |", "friends"]
+
+
+@pytest.mark.asyncio
+async def test_queue_packs_waiting_lines_and_sends_priority_first():
+    sent = []
+    queue = OutboundChatQueue(lambda ch, text: sent.append((ch, text)), byte_limit=40,
+                              messages_per_window=2, window_seconds=0.2, burst=1)
+    task = asyncio.create_task(queue.run())
+    await asyncio.sleep(0)
+
+    queue.send("#chan", "first")
+    await asyncio.sleep(0.01)
+    # Budget is spent: these wait for the next token and get packed
+    queue.send("#chan", "nice")
+    queue.send("#chan", "lol")
+    queue.send("#other", "elsewhere")
+
+    @game_critical_chat
+    async def game_end():
+        queue.send("#chan", "Game over: win vs Bob")
+
+    await game_end()
+    await asyncio.sleep(0.8)
+
+    assert sent == [
+        ("#chan", "first"),
+        ("#chan", "Game over: win vs Bob"),
+        ("#chan", "nice | lol"),
+        ("#other", "elsewhere"),
+    ]
+    assert queue.stats()["packed"] == 1
+    queue.stop()
+    await task
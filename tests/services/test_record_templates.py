@@ -0,0 +1,110 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from core import record_templates
+from core.command_service import CommandContext
+from core.interfaces import ILanguageModel, IPlayerRepository
+
+
+OVERALL = "Overall matchup records for KJ: 425 wins - 394 losses"
+MATCHUPS = (
+    "Race matchup records for KJ: Zerg vs Protoss: 170 wins - 137 losses, "
+    "Zerg vs Terran: 120 wins - 130 losses, Zerg vs Zerg: 135 wins - 127 losses"
+)
+
+
+def test_matchup_abbreviation():
+    assert record_templates.matchup_abbreviation("Zerg", "protoss") == "ZvP"
+    assert record_templates.matchup_abbreviation("Random", "Terran") == "RvT"
+    assert record_templates.matchup_abbreviation("Zerg", "Unknown") is None
+
+
+def test_format_career_compresses_records():
+    lines = record_templates.format_career("KJ", OVERALL, MATCHUPS)
+    assert lines == ["KJ overall: 425-394, each matchup: ZvP 170-137, ZvT 120-130, ZvZ 135-127."]
+
+
+def test_format_career_unparseable_falls_back():
+    assert record_templates.format_career("KJ", "10 wins 5 losses", "PvP: 5-2") is None
+    assert record_templates.format_career("KJ", None, None) is None
+
+
+def test_format_history_and_head_to_head():
+    history = record_templates.format_history("KJ", ["KJ, Serral, 3 wins, 1 losses", "KJ, Maru, 0 wins, 2 losses"])
+    assert history == ["KJ's record by opponent: Serral 3-1, Maru 0-2."]
+
+    h2h = record_templates.format_head_to_head("KJ", "Serral", [
+        "KJ (Zerg) vs Serral (Zerg), 5 wins - 7 wins",
+        "KJ (Protoss) vs Serral (Zerg), 2 wins - 1 wins",
+    ])
+    assert h2h == ["KJ vs Serral overall: 7-8, each matchup: ZvZ 5-7, PvZ 2-1."]
+
+    assert record_templates.format_history("KJ", ["garbage"]) is None
+    assert record_templates.format_head_to_head("KJ", "Serral", ["KJ vs Serral"]) is None
+
+
+def test_pack_messages_splits_between_items_only():
+    items = [f"Opponent{i} {i}-{i}" for i in range(40)]
+    messages = record_templates.pack_messages("Header: ", items, suffix=".", max_bytes=80)
+    assert all(len(m.encode("utf-8")) <= 80 for m in messages)
+    assert messages[0].startswith("Header: ")
+    assert messages[-1].endswith(".")
+    rejoined = ", ".join(m.rstrip(",") for m in messages)
+    for item in items:
+        assert item in rejoined
+
+
+def test_pack_messages_cuts_an_oversized_item_and_keeps_prefix_alone():
+    messages = record_templates.pack_messages("", ["x" * 25], max_bytes=10)
+    assert messages == ["x" * 10, "x" * 10, "x" * 5]
+    assert record_templates.pack_messages("Games: ", [], separator=" and ") == ["Games:"]
+
+
+def _context():
+    chat = MagicMock()
+    chat.send_message = AsyncMock()
+    return CommandContext("career KJ", "channel1", "user1", "twitch", chat), chat
+
+
+@pytest.mark.asyncio
+async def test_career_handler_template_skips_llm(monkeypatch):
+    from core.handlers.career_handler import CareerHandler
+
+    monkeypatch.setattr(record_templates.config, "RECORD_TEMPLATE_FLOURISH", False, raising=False)
+    repo = MagicMock(spec=IPlayerRepository)
+    repo.get_player_stats = AsyncMock(return_value=OVERALL)
+    repo.get_matchup_stats = AsyncMock(return_value=MATCHUPS)
+    llm = MagicMock(spec=ILanguageModel)
+    llm.generate_raw = AsyncMock(return_value="should not be used")
+    context, chat = _context()
+
+    await CareerHandler(repo, llm).handle(context, "KJ")
+
+    llm.generate_raw.assert_not_called()
+    chat.send_message.assert_called_once_with(
+        "channel1", "KJ overall: 425-394, each matchup: ZvP 170-137, ZvT 120-130, ZvZ 135-127.")
+
+
+@pytest.mark.asyncio
+async def test_flourish_follows_facts(monkeypatch):
+    monkeypatch.setattr(record_templates.config, "RECORD_TEMPLATE_FLOURISH", True, raising=False)
+    llm = MagicMock(spec=ILanguageModel)
+    llm.generate_raw = AsyncMock(return_value=" Solid ZvP! ")
+    context, chat = _context()
+
+    await record_templates.send_with_flourish(context, llm, ["KJ overall: 1-0."], "career")
+
+    assert [c.args[1] for c in chat.send_message.call_args_list] == ["KJ overall: 1-0.", "Solid ZvP!"]
+    assert llm.generate_raw.call_args.kwargs["cache"] == "career"
+
+
+@pytest.mark.asyncio
+async def test_flourish_failure_keeps_facts(monkeypatch):
+    monkeypatch.setattr(record_templates.config, "RECORD_TEMPLATE_FLOURISH", True, raising=False)
+    llm = MagicMock(spec=ILanguageModel)
+    llm.generate_raw = AsyncMock(side_effect=RuntimeError("down"))
+    context, chat = _context()
+
+    await record_templates.send_with_flourish(context, llm, ["KJ overall: 1-0."], "career")
+
+    chat.send_message.assert_called_once_with("channel1", "KJ overall: 1-0.")
@@ -0,0 +1,42 @@
+import os
+from unittest.mock import patch
+
+import spawningtool.parser
+
+from core.replay_access import LazyReplay, ReplayTier, read_header
+
+REPLAY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "test", "replays", "1v1 TESTFILE - VICTORY - Altitude LE (330).SC2Replay"
+)
+
+
+def test_header_matches_full_parse_fields():
+    full = spawningtool.parser.parse_replay(REPLAY)
+    header = read_header(REPLAY)
+
+    for key in ("unix_timestamp", "frames", "frames_per_second", "game_type", "region", "map"):
+        assert header[key] == full[key]
+    for key, player in header["players"].items():
+        for field in ("name", "pick_race", "race", "is_winner", "result"):
+            assert player[field] == full["players"][key][field]
+        assert "buildOrder" not in player
+
+
+def test_lazy_replay_upgrades_once_and_answers_lower_tiers_from_cache():
+    full = {"map": "M", "frames": 100, "players": {1: {
+        "name": "A", "race": "Zerg", "buildOrder": [{"time": "0:30"}, {"time": "9:00"}], "unitsLost": []}}}
+    replay = LazyReplay("x.SC2Replay")
+
+    with patch("core.replay_access.replay_parser_pool.parse_header",
+               return_value={"map": "M", "players": {}}) as header, \
+         patch("core.replay_access.replay_parser_pool.parse_replay", return_value=full) as parse:
+        replay.header()
+        replay.header()
+        assert replay.tier == ReplayTier.HEADER
+        assert replay.full() is full
+        assert replay.get(ReplayTier.FULL) is full
+        assert "buildOrder" not in replay.header()["players"][1]
+
+    header.assert_called_once_with("x.SC2Replay")
+    parse.assert_called_once_with("x.SC2Replay")
+    assert replay.tier == ReplayTier.FULL
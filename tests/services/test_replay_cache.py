@@ -0,0 +1,63 @@
+import os
+from unittest.mock import MagicMock
+
+from core.replay_cache import ParsedReplayCache
+
+
+def _replay(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_second_parse_is_served_from_cache(tmp_path):
+    cache = ParsedReplayCache(directory=str(tmp_path / "cache"), max_mb=10, parser_tag="v1")
+    path = _replay(tmp_path, "a.SC2Replay", b"replay-bytes")
+    parse = MagicMock(return_value={"map": "Altitude LE", "players": {1: {"name": "KJ"}}})
+
+    first = cache.get_or_parse(path, parse)
+    second = cache.get_or_parse(path, parse)
+
+    assert first == second
+    parse.assert_called_once_with(path)
+    assert cache.hits == 1
+
+
+def test_key_is_content_addressed_and_versioned(tmp_path):
+    directory = str(tmp_path / "cache")
+    a = _replay(tmp_path, "a.SC2Replay", b"same")
+    b = _replay(tmp_path, "copy of a.SC2Replay", b"same")
+    c = _replay(tmp_path, "c.SC2Replay", b"different")
+
+    cache = ParsedReplayCache(directory=directory, parser_tag="v1")
+    assert cache.key_for(a) == cache.key_for(b)
+    assert cache.key_for(a) != cache.key_for(c)
+    assert cache.key_for(a) != ParsedReplayCache(directory=directory, parser_tag="v2").key_for(a)
+
+
+def test_lru_eviction_keeps_recent_entries(tmp_path):
+    directory = str(tmp_path / "cache")
+    cache = ParsedReplayCache(directory=directory, max_mb=0.002, parser_tag="v1")  # ~2 KB budget
+    payload = {"blob": os.urandom(800)}
+
+    for i in range(4):
+        cache.put(f"key{i}", payload)
+        entry = os.path.join(directory, f"key{i}.replay.zpkl")
+        os.utime(entry, (1000 + i, 1000 + i))
+
+    cache.put("key4", payload)
+
+    assert cache.get("key4") is not None
+    assert cache.get("key0") is None
+    total = sum(os.path.getsize(os.path.join(directory, n)) for n in os.listdir(directory))
+    assert total <= cache.max_bytes
+
+
+def test_corrupt_entry_is_dropped(tmp_path):
+    directory = tmp_path / "cache"
+    directory.mkdir()
+    (directory / "bad.replay.zpkl").write_bytes(b"garbage")
+    cache = ParsedReplayCache(directory=str(directory), parser_tag="v1")
+
+    assert cache.get("bad") is None
+    assert not (directory / "bad.replay.zpkl").exists()
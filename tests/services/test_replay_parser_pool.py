@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from core.replay_parser_pool import ReplayParserPool, ReplayParseError
+
+REPLAY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "test", "replays", "1v1 TESTFILE - VICTORY - Altitude LE (330).SC2Replay"
+)
+
+
+@pytest.fixture
+def pool():
+    p = ReplayParserPool(size=1, timeout=60, memory_limit_mb=0)
+    yield p
+    p.shutdown()
+
+
+def test_parse_returns_replay_data(pool):
+    data = pool.parse(REPLAY)
+    assert data["map"]
+    assert len(data["players"]) == 2
+
+
+def test_parser_error_is_reported_and_worker_survives(pool, tmp_path):
+    bogus = tmp_path / "broken.SC2Replay"
+    bogus.write_bytes(b"not a replay")
+
+    with pytest.raises(ReplayParseError):
+        pool.parse(str(bogus))
+
+    assert pool.parse(REPLAY)["map"]
+
+
+def test_timeout_kills_and_respawns_worker(pool):
+    pool.timeout = 0.01
+    with pytest.raises(ReplayParseError, match="timed out"):
+        pool.parse(REPLAY)
+
+    pool.timeout = 60
+    assert pool.parse(REPLAY)["map"]
+
+
+def test_header_job_runs_in_worker(pool, tmp_path):
+    header = pool.parse(REPLAY, kind="header")
+    assert header["map"]
+    assert all("buildOrder" not in player for player in header["players"].values())
+
+    bogus = tmp_path / "broken.SC2Replay"
+    bogus.write_bytes(b"not a replay")
+    with pytest.raises(ReplayParseError):
+        pool.parse(str(bogus), kind="header")
+    assert pool.parse(REPLAY, kind="header")["players"]
+
+
+def test_failed_respawn_keeps_the_slot_and_original_error(pool):
+    from unittest import mock
+
+    import core.replay_parser_pool as replay_parser_pool
+
+    class _DeadAfterParse:
+        def __init__(self, memory_limit_mb):
+            self.dead = False
+
+        def alive(self):
+            return not self.dead
+
+        def reap(self):
+            pass
+
+    def _crash(worker, path, kind):
+        worker.dead = True
+        raise ReplayParseError("worker crashed")
+
+    pool._started = True
+    pool._idle.put(_DeadAfterParse(0))
+    with mock.patch.object(pool, "_parse_with", side_effect=_crash), \
+         mock.patch.object(replay_parser_pool, "_Worker", side_effect=OSError("EMFILE")):
+        with pytest.raises(ReplayParseError, match="crashed"):
+            pool.parse(REPLAY)
+        assert pool._idle.qsize() == 1
+        # The next parse gets the empty slot back and reports the spawn failure instead of blocking
+        with pytest.raises(OSError):
+            pool.parse(REPLAY)
+        assert pool._idle.qsize() == 1
+
+    assert pool.parse(REPLAY)["map"]
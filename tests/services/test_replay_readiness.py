@@ -0,0 +1,85 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from core import replay_readiness
+from core.replay_readiness import ReplayReadinessDetector
+
+
+def _detector():
+    return ReplayReadinessDetector(poll_interval=0.01, stable_window=0.02, find_deadline=0.2, ready_deadline=0.5)
+
+
+@pytest.mark.asyncio
+async def test_stable_file_is_ready_and_sets_event(tmp_path):
+    path = tmp_path / "game.SC2Replay"
+    path.write_bytes(b"x" * 2048)
+    detector = _detector()
+
+    status = await detector.wait_until_ready(str(path))
+
+    assert status == replay_readiness.READY
+    assert detector.ready_event(str(path)).is_set()
+
+
+@pytest.mark.asyncio
+async def test_missing_file_reports_missing(tmp_path):
+    detector = _detector()
+    status = await detector.wait_until_ready(str(tmp_path / "nope.SC2Replay"))
+    assert status == replay_readiness.MISSING
+
+
+@pytest.mark.asyncio
+async def test_empty_file_reports_empty(tmp_path):
+    path = tmp_path / "empty.SC2Replay"
+    path.write_bytes(b"")
+    status = await _detector().wait_until_ready(str(path))
+    assert status == replay_readiness.EMPTY
+
+
+@pytest.mark.asyncio
+async def test_locked_file_reports_locked_without_real_sleeps(tmp_path):
+    path = tmp_path / "locked.SC2Replay"
+    path.write_bytes(b"x" * 2048)
+    detector = _detector()
+
+    with patch('asyncio.sleep', new_callable=AsyncMock), \
+         patch('builtins.open', side_effect=PermissionError("in use")):
+        status = await detector.wait_until_ready(str(path))
+
+    assert status == replay_readiness.LOCKED
+    assert not detector.ready_event(str(path)).is_set()
+
+
+@pytest.mark.asyncio
+async def test_growing_file_waits_for_stable_size(tmp_path):
+    path = tmp_path / "growing.SC2Replay"
+    sizes = iter([1000, 2000, 3000, 3000, 3000, 3000])
+    detector = ReplayReadinessDetector(poll_interval=0.01, stable_window=0.02, ready_deadline=1)
+
+    with patch('asyncio.sleep', new_callable=AsyncMock) as mock_sleep, \
+         patch('os.path.exists', return_value=True), \
+         patch('os.path.getsize', side_effect=lambda _p: next(sizes)), \
+         patch('builtins.open', create=True):
+        status = await detector.wait_until_ready(str(path))
+
+    assert status == replay_readiness.READY
+    # 3 growth samples + 2 stable samples before declaring ready
+    assert mock_sleep.await_count == 4
+
+
+@pytest.mark.asyncio
+async def test_wait_for_new_replay_skips_excluded_path():
+    results = iter(["old.SC2Replay", "old.SC2Replay", "new.SC2Replay"])
+    detector = _detector()
+
+    with patch('asyncio.sleep', new_callable=AsyncMock):
+        path = await detector.wait_for_new_replay(lambda: next(results), exclude="old.SC2Replay")
+
+    assert path == "new.SC2Replay"
+
+
+@pytest.mark.asyncio
+async def test_wait_for_new_replay_gives_up():
+    detector = _detector()
+    with patch('asyncio.sleep', new_callable=AsyncMock):
+        assert await detector.wait_for_new_replay(lambda: None) is None
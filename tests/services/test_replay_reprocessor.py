@@ -0,0 +1,129 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.replay_reprocessor import ReplayReprocessor, ReplayTimestampIndex, compute_fields
+
+
+def _replay_data(ts):
+    return {
+        "players": {
+            1: {"name": "KJ_Account", "race": "Zerg", "pick_race": "Zerg", "is_winner": True,
+                "buildOrder": [], "unitsLost": []},
+            2: {"name": "Rival", "race": "Protoss", "pick_race": "Random", "is_winner": False,
+                "buildOrder": [], "unitsLost": []},
+        },
+        "map": "Royal Blood LE", "region": "us", "game_type": "1v1",
+        "unix_timestamp": ts, "frames": 16 * 300, "frames_per_second": 16,
+    }
+
+
+def _row(replay_id, ts, summary="old summary"):
+    return {
+        "ReplayId": replay_id, "UnixTimestamp": ts, "Replay_Summary": summary,
+        "Player1_Name": "KJ", "Player2_Name": "Rival",
+        "Player1_PickRace": "Zerg", "Player2_PickRace": "Protoss",
+        "Player1_Race": "Zerg", "Player2_Race": "Protoss",
+    }
+
+
+def _index(tmp_path, timestamps):
+    for ts in timestamps:
+        (tmp_path / f"{ts}.SC2Replay").write_bytes(b"x")
+    return ReplayTimestampIndex(str(tmp_path), read_timestamp=lambda p: int(p.rsplit("/", 1)[-1].split(".")[0]))
+
+
+def _db(pages):
+    db = MagicMock()
+    db.get_replays_for_reprocessing.side_effect = pages + [[]]
+    db.update_replays_batch.side_effect = lambda updates: len(updates)
+    return db
+
+
+@patch("core.replay_reprocessor.config")
+def test_compute_fields_records_random_pick(mock_config):
+    mock_config.SC2_PLAYER_ACCOUNTS = ["KJ_Account"]
+    mock_config.STREAMER_NICKNAME = "KJ"
+    with patch("core.game_summarizer.config", mock_config):
+        fields = compute_fields(_row(1, 100), _replay_data(100))
+    assert fields["Player2_PickRace"] == "Random"
+    assert fields["Player2_Race"] == "Protoss"
+    assert "Winners: KJ\n" in fields["Replay_Summary"]
+    assert "KJ_Account" not in fields["Replay_Summary"]
+
+
+def test_run_batches_updates_and_checkpoints(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    db = _db([[_row(1, 100), _row(2, 200)], [_row(3, 300), _row(4, 999)]])
+    parse = MagicMock(side_effect=lambda path: _replay_data(int(path.rsplit("/", 1)[-1].split(".")[0])))
+    reprocessor = ReplayReprocessor(db, workers=2, batch_size=2, checkpoint_file=str(checkpoint),
+                                    min_db_interval=0, parse=parse, index=_index(tmp_path, [100, 200, 300]))
+
+    stats = reprocessor.run()
+
+    assert db.update_replays_batch.call_count == 2
+    first_batch = db.update_replays_batch.call_args_list[0].args[0]
+    assert [u["replay_id"] for u in first_batch] == [1, 2]
+    assert first_batch[0]["fields"]["Player2_PickRace"] == "Random"
+    assert stats.updated == 3 and stats.missing_file == 1
+    assert json.loads(checkpoint.read_text())["last_replay_id"] == 4
+
+
+def test_resume_starts_after_checkpoint(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text(json.dumps({"last_replay_id": 42}))
+    db = MagicMock()
+    db.get_replays_for_reprocessing.return_value = []
+    reprocessor = ReplayReprocessor(db, checkpoint_file=str(checkpoint), min_db_interval=0,
+                                    parse=MagicMock(), index=_index(tmp_path, []))
+
+    reprocessor.run()
+    db.get_replays_for_reprocessing.assert_called_with(42, reprocessor.batch_size)
+
+    reprocessor.run(restart=True)
+    db.get_replays_for_reprocessing.assert_called_with(0, reprocessor.batch_size)
+
+
+def test_db_read_failure_stops_run_and_keeps_checkpoint(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    db = MagicMock()
+    db.get_replays_for_reprocessing.side_effect = [[_row(1, 100)], ConnectionError("db down")]
+    db.update_replays_batch.side_effect = lambda updates: len(updates)
+    reprocessor = ReplayReprocessor(db, checkpoint_file=str(checkpoint), min_db_interval=0,
+                                    parse=lambda path: _replay_data(100), index=_index(tmp_path, [100]))
+
+    with pytest.raises(ConnectionError):
+        reprocessor.run()
+    assert json.loads(checkpoint.read_text())["last_replay_id"] == 1
+
+
+def test_dry_run_diffs_without_writing(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    db = _db([[_row(1, 100)]])
+    reprocessor = ReplayReprocessor(db, dry_run=True, checkpoint_file=str(checkpoint), min_db_interval=0,
+                                    parse=lambda path: _replay_data(100), index=_index(tmp_path, [100]))
+
+    stats = reprocessor.run()
+
+    db.update_replays_batch.assert_not_called()
+    assert not checkpoint.exists()
+    assert stats.changed == 1
+    assert "Player2_PickRace: Protoss -> Random" in stats.diffs[0]
+    assert "+Map: Royal Blood LE" in stats.diffs[0]
+
+
+def test_index_reuses_cached_header_reads(tmp_path):
+    replays = tmp_path / "replays"
+    replays.mkdir()
+    (replays / "a.SC2Replay").write_bytes(b"x")
+    cache_file = str(tmp_path / "index.json")
+    reader = MagicMock(return_value=1234)
+
+    first = ReplayTimestampIndex(str(replays), cache_file, read_timestamp=reader)
+    first.build()
+    second = ReplayTimestampIndex(str(replays), cache_file, read_timestamp=reader)
+    second.build()
+
+    reader.assert_called_once()
+    assert second.get("1234").endswith("a.SC2Replay")
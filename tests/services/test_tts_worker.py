@@ -0,0 +1,161 @@
+import os
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from core.tts_worker import PhraseAudioCache, TTSWorker, restore_punctuation
+
+
+class _FakeEngine:
+    def __init__(self):
+        self.said = []
+        self.rendered = []
+        self.thread = None
+        self._pending_file = None
+
+    def say(self, text):
+        self.thread = threading.current_thread().name
+        self.said.append(text)
+
+    def save_to_file(self, text, path):
+        self._pending_file = (text, path)
+
+    def runAndWait(self):
+        if self._pending_file is not None:
+            text, path = self._pending_file
+            with open(path, "wb") as f:
+                f.write(b"RIFF")
+            self.rendered.append(text)
+            self._pending_file = None
+
+
+class _NoWaitScheduler:
+    @contextmanager
+    def speaking(self):
+        yield
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("gg wp", "Gg wp."),
+    ("what build was that", "What build was that?"),
+    ("well i think he wins  but  the zerg is ahead", "Well, I think he wins, but the zerg is ahead."),
+    ("nice game . next one", "Nice game. Next one."),
+    ("already done!", "Already done!"),
+    ("", ""),
+])
+def test_restore_punctuation(raw, expected):
+    assert restore_punctuation(raw) == expected
+
+
+def test_worker_creates_engine_once_on_its_own_thread():
+    created = []
+
+    def factory():
+        created.append(threading.current_thread().name)
+        return engine
+
+    engine = _FakeEngine()
+    modes = []
+    worker = TTSWorker(factory, configure=lambda e, mode: modes.append(mode), scheduler=_NoWaitScheduler())
+    try:
+        worker.speak("first")
+        assert worker.speak("second", wait=True, timeout=5).is_set()
+    finally:
+        worker.stop()
+
+    assert created == ["tts-worker"]
+    assert engine.said == ["first", "second"]
+    assert engine.thread == "tts-worker"
+    assert modes == [1]
+
+
+def test_speak_returns_before_line_is_spoken():
+    release = threading.Event()
+    engine = _FakeEngine()
+
+    class _Blocking:
+        @contextmanager
+        def speaking(self):
+            release.wait(5)
+            yield
+
+    worker = TTSWorker(lambda: engine, scheduler=_Blocking())
+    try:
+        done = worker.speak("queued")
+        assert not done.is_set()
+        release.set()
+        assert done.wait(5)
+    finally:
+        worker.stop()
+    assert engine.said == ["queued"]
+
+
+def test_repeated_phrase_is_spoken_then_rendered_on_repeat(tmp_path):
+    engine = _FakeEngine()
+    played = []
+    cache = PhraseAudioCache(directory=str(tmp_path), max_chars=40, phrases=())
+    worker = TTSWorker(lambda: engine, phrase_cache=cache, play_file=lambda p: played.append(p) or True,
+                       scheduler=_NoWaitScheduler())
+    try:
+        for _ in range(3):
+            worker.speak("Good game.", wait=True, timeout=5)
+        worker.speak("Once only.", wait=True, timeout=5)
+        worker.speak("A long reply that is well over the forty character phrase limit.", wait=True, timeout=5)
+    finally:
+        worker.stop()
+
+    # First two occurrences go straight to the engine (no render before audio); the repeat is rendered after
+    assert engine.said == ["Good game.", "Good game.", "Once only.",
+                           "A long reply that is well over the forty character phrase limit."]
+    assert engine.rendered == ["Good game."]
+    assert len(played) == 1 and os.path.isfile(played[0])
+
+
+def test_allowlisted_phrases_are_rendered_at_start(tmp_path):
+    engine = _FakeEngine()
+    played = []
+    cache = PhraseAudioCache(directory=str(tmp_path), max_chars=40, phrases=("yes?",))
+    worker = TTSWorker(lambda: engine, phrase_cache=cache, play_file=lambda p: played.append(p) or True,
+                       scheduler=_NoWaitScheduler())
+    try:
+        worker.speak("yes?", wait=True, timeout=5)
+    finally:
+        worker.stop()
+    assert engine.rendered == ["yes?"]
+    assert engine.said == []
+    assert len(played) == 1
+
+
+def test_cache_directory_is_capped(tmp_path):
+    cache = PhraseAudioCache(directory=str(tmp_path), max_chars=40, max_files=2, phrases=())
+    for i, text in enumerate(["a", "b", "c"]):
+        path = cache.path_for(text, 1)
+        with open(path, "wb") as f:
+            f.write(b"RIFF")
+        os.utime(path, (1000 + i, 1000 + i))
+    cache.evict()
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(cache.path_for(t, 1)) for t in ("b", "c"))
+
+
+def test_unplayable_cached_phrase_falls_back_to_engine(tmp_path):
+    engine = _FakeEngine()
+    cache = PhraseAudioCache(directory=str(tmp_path), max_chars=40, phrases=("yes?",))
+    worker = TTSWorker(lambda: engine, phrase_cache=cache, play_file=lambda p: False,
+                       scheduler=_NoWaitScheduler())
+    try:
+        worker.speak("yes?", wait=True, timeout=5)
+    finally:
+        worker.stop()
+    assert engine.said == ["yes?"]
+
+
+def test_engine_init_failure_does_not_block_callers():
+    def factory():
+        raise RuntimeError("no audio device")
+
+    worker = TTSWorker(factory, scheduler=_NoWaitScheduler())
+    try:
+        assert worker.speak("hello", wait=True, timeout=5).is_set()
+    finally:
+        worker.stop()
@@ -0,0 +1,191 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.bot import BotCore
+from core.events import MessageEvent
+from tests.mocks.all_mocks import MockChatService, MockGameStateProvider, MockLanguageModel
+
+
+class GatedLanguageModel(MockLanguageModel):
+    """Replies with the prompt; prompts containing 'slow' wait until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+        self.order = []
+
+    async def generate_response(self, prompt, context=None):
+        if "slow" in prompt:
+            await self.release.wait()
+        self.order.append(prompt)
+        return prompt
+
+
+def _msg(author, content):
+    return MessageEvent(platform="discord", author=author, content=content, channel="general")
+
+
+@pytest.mark.asyncio
+async def test_slow_reply_does_not_block_other_authors():
+    chat = MockChatService("discord")
+    llm = GatedLanguageModel()
+    bot = BotCore([chat], MockGameStateProvider(), llm)
+    task = asyncio.create_task(bot.start())
+
+    bot.add_event(_msg("viewer1", "slow question"))
+    bot.add_event(_msg("viewer2", "quick question"))
+    await asyncio.sleep(0.05)
+
+    assert [m["message"] for m in chat.sent_messages] == ["quick question"]
+
+    llm.release.set()
+    await asyncio.sleep(0.05)
+    assert [m["message"] for m in chat.sent_messages] == ["quick question", "slow question"]
+
+    bot.stop()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_same_author_events_keep_arrival_order():
+    chat = MockChatService("discord")
+    llm = GatedLanguageModel()
+    bot = BotCore([chat], MockGameStateProvider(), llm)
+    task = asyncio.create_task(bot.start())
+
+    bot.add_event(_msg("viewer1", "slow first"))
+    bot.add_event(_msg("Viewer1", "second"))
+    await asyncio.sleep(0.05)
+    assert chat.sent_messages == []
+
+    llm.release.set()
+    await asyncio.sleep(0.05)
+    assert llm.order == ["slow first", "second"]
+
+    bot.stop()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_add_event_from_another_thread():
+    chat = MockChatService("discord")
+    bot = BotCore([chat], MockGameStateProvider(), MockLanguageModel())
+    task = asyncio.create_task(bot.start())
+    await asyncio.sleep(0)
+
+    thread = threading.Thread(target=bot.add_event, args=(_msg("viewer1", "hello"),))
+    thread.start()
+    thread.join()
+    await asyncio.sleep(0.05)
+
+    assert len(chat.sent_messages) == 1
+    bot.stop()
+    await task
+
+
+class RecordingBot(BotCore):
+    """Records processing order; MessageEvents wait on a gate so the chat lane backs up."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gate = asyncio.Event()
+        self.processed = []
+
+    async def process_event(self, event):
+        if isinstance(event, MessageEvent):
+            await self.gate.wait()
+            self.processed.append(event.content)
+        else:
+            self.processed.append(event.event_type)
+
+
+def _lane_bot(monkeypatch, workers=2, max_depth=3, policy="drop_oldest", command_service=None):
+    import core.bot as bot_module
+    monkeypatch.setattr(bot_module.config, "BOT_CORE_WORKERS", workers, raising=False)
+    monkeypatch.setattr(bot_module.config, "BOT_CORE_CHAT_QUEUE_MAX", max_depth, raising=False)
+    monkeypatch.setattr(bot_module.config, "BOT_CORE_CHAT_OVERFLOW_POLICY", policy, raising=False)
+    return RecordingBot([MockChatService("discord")], MockGameStateProvider(), MockLanguageModel(),
+                        command_service=command_service)
+
+
+@pytest.mark.asyncio
+async def test_game_state_preempts_backed_up_chat(monkeypatch):
+    from core.events import GameStateEvent
+    bot = _lane_bot(monkeypatch, max_depth=50)
+    task = asyncio.create_task(bot.start())
+
+    for i in range(20):
+        bot.add_event(_msg(f"raider{i}", f"hype {i}"))
+    bot.add_event(GameStateEvent(event_type="game_started"))
+    await asyncio.sleep(0.05)
+
+    # Chat holds at most workers-1 workers, so the game event ran while chat is still blocked
+    assert bot.processed == ["game_started"]
+    stats = bot.lane_stats()
+    assert stats["chat"]["depth"] == 19 and stats["chat"]["running"] == 1
+    assert stats["game"]["processed"] == 1
+
+    bot.gate.set()
+    await asyncio.sleep(0.05)
+    assert len(bot.processed) == 21
+    bot.stop()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_chat_lane_bounded(monkeypatch):
+    bot = _lane_bot(monkeypatch, max_depth=3)
+    task = asyncio.create_task(bot.start())
+
+    bot.add_event(_msg("viewer0", "line 0"))
+    await asyncio.sleep(0.01)
+    for i in range(1, 6):
+        bot.add_event(_msg(f"viewer{i}", f"line {i}"))
+    await asyncio.sleep(0.05)
+    bot.gate.set()
+    await asyncio.sleep(0.05)
+
+    # line 0 was already running; lines 1 and 2 were the oldest waiting when the lane overflowed
+    assert bot.processed == ["line 0", "line 3", "line 4", "line 5"]
+    assert bot.lane_stats()["chat"]["dropped"] == 2
+    bot.stop()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_drop_non_commands_and_merge_duplicates(monkeypatch):
+    class Commands:
+        def is_command(self, text):
+            return text.startswith("!")
+
+        async def handle_message(self, *args):
+            return False
+
+    bot = _lane_bot(monkeypatch, max_depth=2, policy="drop_non_commands", command_service=Commands())
+    task = asyncio.create_task(bot.start())
+    bot.add_event(_msg("busy", "busy"))
+    await asyncio.sleep(0.01)
+    for content in ["chat a", "chat b", "chat c", "!wiki zerg"]:
+        bot.add_event(_msg(content, content))
+    await asyncio.sleep(0.05)
+    bot.gate.set()
+    await asyncio.sleep(0.05)
+    assert bot.processed == ["busy", "chat b", "!wiki zerg"]
+    bot.stop()
+    await task
+
+    bot = _lane_bot(monkeypatch, max_depth=2, policy="merge_duplicates")
+    task = asyncio.create_task(bot.start())
+    bot.add_event(_msg("a", "busy"))
+    await asyncio.sleep(0.01)
+    for author, content in [("b", "PogChamp"), ("c", "gg"), ("d", "pogchamp ")]:
+        bot.add_event(_msg(author, content))
+    await asyncio.sleep(0.05)
+    bot.gate.set()
+    await asyncio.sleep(0.05)
+    assert bot.processed == ["busy", "PogChamp", "gg"]
+    assert bot.lane_stats()["chat"]["merged"] == 1
+    bot.stop()
+    await task
@@ -28,7 +28,7 @@ from core.fsl_natural_language import (
 class MockLLM:
     """Unused for exec-only tests."""
 
-    async def generate_raw(self, prompt: str) -> str:
+    async def generate_raw(self, prompt: str, cache=None) -> str:
         return "{}"
 
 
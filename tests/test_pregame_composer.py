@@ -0,0 +1,112 @@
+"""Tests for core.pregame_composer (one completion for several pregame LLM lines)."""
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from settings import config
+
+from core.pregame_composer import (
+    PregameSegment,
+    compose_pregame_segments,
+    emit_pregame_segments,
+    parse_segment_replies,
+)
+from core.pregame_intel import PreGameBrief, run_known_opponent_pregame
+from tests.test_pregame_intel import _minimal_db_row, _ml_analyzer_mock
+
+
+def _completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+class TestParseSegmentReplies(unittest.TestCase):
+    def test_fenced_json_and_missing_labels(self):
+        text = '```json\n{"last_meeting": " Last time on Alcyone... ", "build_order_1": ""}\n```'
+        self.assertEqual(
+            parse_segment_replies(text, ["last_meeting", "build_order_1", "glhf"]),
+            {"last_meeting": "Last time on Alcyone..."},
+        )
+
+    def test_not_json(self):
+        self.assertEqual(parse_segment_replies("Sure! Here you go.", ["last_meeting"]), {})
+
+
+class TestEmitPregameSegments(unittest.TestCase):
+    def setUp(self):
+        self.segments = [
+            PregameSegment("last_meeting", "LM facts", response_suffix="Opening: Pool"),
+            PregameSegment("build_order_1", "BUILD facts"),
+        ]
+
+    @patch("api.chat_utils.send_prompt_to_openai_system_user")
+    def test_one_call_then_replies_in_order(self, send):
+        send.return_value = _completion('{"last_meeting": "LM reply", "build_order_1": "Build reply"}')
+        process = MagicMock()
+        emit_pregame_segments(None, self.segments, MagicMock(), [], process)
+
+        send.assert_called_once()
+        system_msg, user_msg = send.call_args[0]
+        self.assertIn("JSON object", system_msg)
+        self.assertLess(user_msg.index("=== SEGMENT last_meeting ==="), user_msg.index("=== SEGMENT build_order_1 ==="))
+        self.assertEqual([c[0][1] for c in process.call_args_list], ["LM facts", "BUILD facts"])
+        self.assertEqual([c.kwargs["precomputed_reply"] for c in process.call_args_list], ["LM reply", "Build reply"])
+        self.assertEqual(process.call_args_list[0].kwargs["response_suffix"], "Opening: Pool")
+
+    @patch("api.chat_utils.send_prompt_to_openai_system_user", side_effect=RuntimeError("timeout"))
+    def test_failed_call_falls_back_per_segment(self, _send):
+        process = MagicMock()
+        emit_pregame_segments(None, self.segments, MagicMock(), [], process)
+        self.assertEqual(process.call_count, 2)
+        self.assertTrue(all("precomputed_reply" not in c.kwargs for c in process.call_args_list))
+
+    @patch("api.chat_utils.send_prompt_to_openai_system_user")
+    def test_single_segment_uses_its_own_call(self, send):
+        process = MagicMock()
+        emit_pregame_segments(None, self.segments[:1], MagicMock(), [], process)
+        send.assert_not_called()
+        self.assertNotIn("precomputed_reply", process.call_args.kwargs)
+
+    @patch.object(config, "PREGAME_SINGLE_CALL", False, create=True)
+    @patch("api.chat_utils.send_prompt_to_openai_system_user")
+    def test_disabled(self, send):
+        process = MagicMock()
+        emit_pregame_segments(None, self.segments, MagicMock(), [], process)
+        send.assert_not_called()
+        self.assertEqual(process.call_count, 2)
+
+
+class TestKnownOpponentPregameComposer(unittest.TestCase):
+    @patch.object(config, "PREGAME_APPEND_DETERMINISTIC_OPENING", False)
+    @patch("core.pregame_composer.compose_pregame_segments")
+    @patch("core.pregame_intel.get_ml_analyzer")
+    @patch("core.pregame_intel.processMessageForOpenAI")
+    @patch("core.pregame_intel.msgToChannel")
+    def test_last_meeting_and_build_block_share_one_completion(self, _mch, oai, gma, compose):
+        gma.return_value = _ml_analyzer_mock(chat_returns=False, analysis_data=None)
+        compose.side_effect = lambda segments, log: {s.label: f"reply {s.label}" for s in segments}
+        bot = MagicMock()
+        bot.db = None
+        brief = PreGameBrief(
+            opponent_display_name="Bob",
+            opponent_race="Zerg",
+            streamer_current_race="Terran",
+            streamer_race_compare="Terran",
+            today_streamer_race="Terran",
+            today_opponent_race="Zerg",
+            db_result=_minimal_db_row(),
+            how_long_ago="1 day ago",
+            record_vs=None,
+            player_comments=[],
+            first_few_build_steps=["Drone at 12", "Pool at 0:40"],
+        )
+        run_known_opponent_pregame(bot, brief, MagicMock(), [], "MapX")
+
+        compose.assert_called_once()
+        self.assertEqual([s.label for s in compose.call_args[0][0]], ["last_meeting", "build_order_1"])
+        self.assertEqual(oai.call_count, 2)
+        self.assertEqual([c.kwargs["precomputed_reply"] for c in oai.call_args_list],
+                         ["reply last_meeting", "reply build_order_1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
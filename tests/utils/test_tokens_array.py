@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+import utils.tokensArray as tokensArray
+
+
+@pytest.fixture
+def word_tokens(monkeypatch):
+    """One token per whitespace-separated word, no tokenizer download."""
+    monkeypatch.setattr(tokensArray, "num_tokens_from_string", lambda s, enc: len(s.split()))
+    monkeypatch.setattr(tokensArray, "truncate_to_tokens", lambda s, n, enc: " ".join(s.split()[:n]))
+
+
+def test_context_history_keeps_newest_within_budget(word_tokens):
+    history = tokensArray.ContextHistory(max_tokens=6)
+    for msg in ["a b", "c d", "e f", "g h"]:
+        history.add(msg)
+
+    assert [item[0] for item in history] == ["g h", "e f", "c d"]
+    assert history.total_tokens == 6
+    assert len(history) == 3
+    assert tokensArray.get_printed_array("reversed", history) == "c de fg h"
+
+
+def test_context_history_shortens_oversized_message(word_tokens):
+    history = tokensArray.ContextHistory(max_tokens=3)
+    history.add("one two three four five")
+
+    assert list(history) == [("one two three", 3)]
+    assert history.total_tokens == 3
+
+
+def test_context_history_clear_resets_total(word_tokens):
+    history = tokensArray.ContextHistory(max_tokens=10)
+    history.add("a b c")
+    history.clear()
+
+    assert not history
+    assert history.total_tokens == 0
+
+
+def test_add_new_msg_accepts_plain_list(word_tokens, monkeypatch):
+    monkeypatch.setattr(tokensArray, "maxContextTokens", 4)
+    context = []
+    for msg in ["a b", "c d", "e f"]:
+        tokensArray.add_new_msg(context, msg, MagicMock())
+
+    assert context == [("e f", 2), ("c d", 2)]
+
+
+def test_encoding_is_built_once(monkeypatch):
+    encoding = MagicMock()
+    encoding.encode.side_effect = lambda s: s.split()
+    get_encoding = MagicMock(return_value=encoding)
+    monkeypatch.setattr(tokensArray.tiktoken, "get_encoding", get_encoding)
+    monkeypatch.setattr(tokensArray.config, "TOKENIZER", "tiktoken")
+    tokensArray.get_encoding.cache_clear()
+    try:
+        assert tokensArray.num_tokens_from_string("a b c", "test_enc") == 3
+        assert tokensArray.num_tokens_from_string("d e", "test_enc") == 2
+    finally:
+        tokensArray.get_encoding.cache_clear()
+
+    get_encoding.assert_called_once_with("test_enc")
+
+
+def test_nltk_tokenizer_counts_the_given_string(monkeypatch):
+    monkeypatch.setattr(tokensArray.config, "TOKENIZER", "nltk")
+    monkeypatch.setattr(tokensArray.nltk, "word_tokenize", lambda s: s.split())
+
+    assert tokensArray.num_tokens_from_string("three short words", "cl100k_base") == 3
@@ -1,9 +1,7 @@
 from datetime import datetime
-from collections import defaultdict
 import os
 import logging
 import json
-import spawningtool.parser
 import time
 import pytz
 import sys
@@ -12,6 +10,8 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from settings import config
+from core import replay_parser_pool
+from core.game_summarizer import GameSummarizer
 from adapters.database.database_client_factory import create_database_client
 from utils.time_utils import convert_unix_to_datetime
 from datetime import datetime
@@ -105,8 +105,10 @@ class ReplayLoader:
         replay_summary = ""  # Initialize summary string
 
         try:
-            replay_data = spawningtool.parser.parse_replay(result)
-            replay_summary = ""
+            replay_data = replay_parser_pool.parse_replay(result)
+
+            if replay_data['game_type'] != "1v1":
+                return  # we only process 1v1 games
 
             winning_players = []
             losing_players = []
@@ -126,91 +128,12 @@ class ReplayLoader:
             # cache would leave 'please preview' pointing at whatever file was processed last.
             # Those caches belong to the live game-end / 'please retry' flow only.
 
-            # First, create a mapping of player names to their display names (with alias replacement)
-            player_display_names = {}
-            for player_key, player_data in replay_data['players'].items():
-                player_name = player_data['name']
-                # Check if this is a streamer alias and replace with nickname
-                if any(player_name.lower() == alias.lower() for alias in config.SC2_PLAYER_ACCOUNTS):
-                    player_display_names[player_key] = config.STREAMER_NICKNAME
-                else:
-                    player_display_names[player_key] = player_name
-
-            # Players and Map (using display names with alias replacement)
-            players = [f"{player_display_names[player_key]}: {player_data['race']}" for player_key, player_data in
-                       replay_data['players'].items()]
-            region = replay_data['region']
-            game_type = replay_data['game_type']
-
-            if game_type != "1v1":
-                return  # we only process 1v1 games
-
-            unix_timestamp = replay_data['unix_timestamp']
-
-            replay_summary += f"Players: {', '.join(players)}\n"
-            replay_summary += f"Map: {replay_data['map']}\n"
-            replay_summary += f"Region: {region}\n"
-            replay_summary += f"Game Type: {game_type}\n"
-            replay_summary += f"Timestamp: {unix_timestamp}\n"
-            replay_summary += f"Winners: {winner}\n"
-            replay_summary += f"Losers: {loser}\n"
-
-            # Game Duration
-            frames = replay_data['frames']
-            frames_per_second = replay_data['frames_per_second']
-
-            total_seconds = frames / frames_per_second
-            minutes = int(total_seconds // 60)
-            seconds = int(total_seconds % 60)
-
-            game_duration = f"{minutes}m {seconds}s"
-            replay_summary += f"Game Duration: {game_duration}\n\n"
-
-            build_order_count = config.BUILD_ORDER_STEPS_TO_ANALYZE
-
-            # Units Lost
-            units_lost_summary = {player_key: player_data['unitsLost'] for player_key, player_data in
-                                  replay_data['players'].items()}
-            for player_key, units_lost in units_lost_summary.items():
-                # Use the display name (with alias replacement) instead of raw player name
-                display_name = player_display_names[player_key]
-                player_info = f"Units Lost by {display_name}"
-                replay_summary += player_info + '\n'
-                units_lost_aggregate = defaultdict(int)
-                if units_lost:  # Check if units_lost is not empty
-                    for unit in units_lost:
-                        name = unit.get('name', "N/A")
-                        units_lost_aggregate[name] += 1
-                    for unit_name, count in units_lost_aggregate.items():
-                        unit_info = f"{unit_name}: {count}"
-                        replay_summary += unit_info + '\n'
-                else:
-                    replay_summary += "None \n"
-                replay_summary += '\n'
-
-            # Build Orders
-            build_orders = {player_key: player_data['buildOrder'] for player_key, player_data in
-                            replay_data['players'].items()}
-            for player_key, build_order in build_orders.items():
-                # Use the display name (with alias replacement) instead of raw player name
-                display_name = player_display_names[player_key]
-                player_info = f"{display_name}'s Build Order (first set of steps):"
-                replay_summary += player_info + '\n'
-                for order in build_order[:int(build_order_count)]:
-                    time = order['time']
-                    name = order['name']
-                    supply = order['supply']
-                    order_info = f"Time: {time}, Name: {name}, Supply: {supply}"
-                    replay_summary += order_info + '\n'
-                replay_summary += '\n'
-
-            # replace player names with streamer name (case-insensitive, whole word only)
-            import re
-            for player_name in config.SC2_PLAYER_ACCOUNTS:
-                # Use regex for case-insensitive replacement with word boundaries
-                # This prevents "FALSE" from matching "FalseSith"
-                pattern = re.compile(r'\b' + re.escape(player_name) + r'\b', re.IGNORECASE)
-                replay_summary = pattern.sub(config.STREAMER_NICKNAME, replay_summary)
+            # Same builder as the live game-end path (streamer aliases -> nickname included);
+            # only the build order depth differs, matching the pattern-learning step count.
+            replay_summary = GameSummarizer.build(
+                replay_data, winner, loser,
+                build_order_steps=config.BUILD_ORDER_STEPS_TO_ANALYZE
+            ).text
 
             # NOTE: Do NOT write LAST_REPLAY_SUMMARY_FILE here either (same reason as the JSON
             # cache above) — bulk import must not clobber the live "last game" summary cache.
@@ -1,4 +1,6 @@
 import json
+from collections import deque
+from functools import lru_cache
 import requests
 import nltk  # token libraries
 import tiktoken
@@ -102,53 +104,94 @@ def get_toxicity_probability(message, logger):
 # toxicity_score = get_toxicity_probability("You're an idiot.")
 # print("Toxicity probability:", toxicity_score)
 
+class ContextHistory:
+    """
+    The conversation context: (message, token size) tuples, newest first, with a running token total.
+
+    Adding a message is O(1) and trimming is O(1) per dropped message, so the cost of keeping the
+    context under ``max_tokens`` does not grow with the history. It behaves like the list it replaces
+    (``len``, iteration, ``reversed``, indexing, ``clear``), so ``get_printed_array`` and the
+    ``len(contextHistory) > 15`` checks work unchanged. One instance is shared by Twitch chat, speech
+    commands and the Discord bridge.
+    """
+
+    def __init__(self, max_tokens=None, encoding_name=None):
+        self.max_tokens = int(max_tokens if max_tokens is not None else maxContextTokens)
+        self.encoding_name = encoding_name or getattr(config, "TOKENIZER_ENCODING", "cl100k_base")
+        self._items = deque()
+        self.total_tokens = 0
+
+    def add(self, newMsg, logger=None):
+        """Add ``newMsg`` as the newest message, then drop/shorten the oldest until the total fits."""
+        newMsgTokenSize = num_tokens_from_string(newMsg, self.encoding_name)
+        self._items.appendleft((newMsg, newMsgTokenSize))
+        self.total_tokens += newMsgTokenSize
+        while self.total_tokens > self.max_tokens and self._items:
+            lastItemString, lastItemTokenSize = self._items[-1]
+            # Keep the part of the oldest message that still fits (only possible when it alone is over the limit)
+            keep = self.max_tokens - (self.total_tokens - lastItemTokenSize)
+            if lastItemTokenSize <= self.max_tokens or keep <= 0:
+                self._items.pop()
+                self.total_tokens -= lastItemTokenSize
+            else:
+                shortened = truncate_to_tokens(lastItemString, keep, self.encoding_name)
+                shortenedTokenSize = num_tokens_from_string(shortened, self.encoding_name)
+                self._items[-1] = (shortened, shortenedTokenSize)
+                self.total_tokens += shortenedTokenSize - lastItemTokenSize
+                if shortenedTokenSize >= lastItemTokenSize:
+                    # Tokenizer could not shorten it; drop it rather than loop
+                    self._items.pop()
+                    self.total_tokens -= shortenedTokenSize
+        if logger is not None:
+            logger.debug(f"newMsgTokenSize: {newMsgTokenSize}, totalTokens: {self.total_tokens}")
+
+    def clear(self):
+        self._items.clear()
+        self.total_tokens = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __reversed__(self):
+        return reversed(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __bool__(self):
+        return bool(self._items)
+
+
 def add_new_msg(contextHistory, newMsg, logger):
     logger.debug("received newMsg: " + newMsg)
+    if isinstance(contextHistory, ContextHistory):
+        contextHistory.add(newMsg, logger)
+        return
 
-    # get token size of newMsg
+    # Plain list (callers that keep a throwaway context): same trimming, one sum up front
     newMsgTokenSize = num_tokens_from_string(newMsg, "cl100k_base")
-    logger.debug("newMsgTokenSize: " + str(newMsgTokenSize))
-
-    # add newMsg and its token size to the beginning of the array
     contextHistory.insert(0, (newMsg, newMsgTokenSize))
-
-    # keep deleting items until total tokens is less than maxContextTokens
-    totalTokens = sum([item[1] for item in contextHistory])
-    logger.debug("totalTokens: " + str(totalTokens))
-    while totalTokens > maxContextTokens:
-        # get last item
-        lastItem = contextHistory[-1]
-        lastItemTokenSize = lastItem[1]
-        # When the function needs to remove tokens from a message string to reduce its token size, it does so
-        # by removing tokens from the end of the string, token by token (or word by word).
-        # For example, suppose the last message in the array has a token size of 150, and the maxContextTokens
-        # threshold is 100. To reduce the token size of the message to 100, the function would start by removing
-        # the last token of the message, then the second-to-last token, and so on, until the token size of the
-        # message is less than or equal to 100. This way, we can keep as much of the message content as possible
-        # while still ensuring that the total number of tokens in the array is below the threshold.
-        if lastItemTokenSize <= maxContextTokens:
-            # if last item can be removed completely, remove it
+    totalTokens = sum(item[1] for item in contextHistory)
+    while totalTokens > maxContextTokens and contextHistory:
+        lastItemString, lastItemTokenSize = contextHistory[-1]
+        keep = maxContextTokens - (totalTokens - lastItemTokenSize)
+        if lastItemTokenSize <= maxContextTokens or keep <= 0:
             contextHistory.pop()
+            totalTokens -= lastItemTokenSize
         else:
-            # otherwise, remove tokens from last item and keep its string
-            lastItemString = lastItem[0]
-            lastItemTokens = nltk.word_tokenize(lastItemString)
-            newLastItemTokens = lastItemTokens[:-lastItemTokenSize]
-            newLastItemString = ' '.join(newLastItemTokens)
-            contextHistory[-1] = (newLastItemString, len(newLastItemTokens))
-        totalTokens = sum([item[1] for item in contextHistory])
-        logger.debug("reduced totalTokens: " + str(totalTokens))
+            shortened = truncate_to_tokens(lastItemString, keep, "cl100k_base")
+            shortenedTokenSize = min(num_tokens_from_string(shortened, "cl100k_base"), keep)
+            contextHistory[-1] = (shortened, shortenedTokenSize)
+            totalTokens += shortenedTokenSize - lastItemTokenSize
+    logger.debug("totalTokens: " + str(totalTokens))
 
 
 def get_printed_array(order, contextHistory):
-    arrayString = ""
-    if order == "reversed":
-        for item in reversed(contextHistory):
-            arrayString = arrayString + item[0]
-    else:
-        for item in contextHistory:
-            arrayString = arrayString + item[0]
-    return arrayString
+    items = reversed(contextHistory) if order == "reversed" else contextHistory
+    return "".join(item[0] for item in items)
 
 def apply_stop_words_filter(words):
     """
@@ -216,16 +259,31 @@ def truncate_to_byte_limit(input_string, byte_limit):
         print(f"Current byte total: {current_byte_total} bytes, truncated to {new_byte_total} bytes")
         return final_string
 
+@lru_cache(maxsize=None)
+def get_encoding(encoding_name: str):
+    # tiktoken builds (and may download) the BPE tables on every get_encoding call; do it once per name
+    return tiktoken.get_encoding(encoding_name)
+
+
 def num_tokens_from_string(string: str, encoding_name: str) -> int:
     # Returns the number of tokens in a text string depending on tokenizer used
-    encoding = tiktoken.get_encoding(encoding_name)
     if (config.TOKENIZER == "tiktoken"):
-        num_tokens = len(encoding.encode(string))
+        num_tokens = len(get_encoding(encoding_name).encode(string))
     else:
-        num_tokens = len(nltk.word_tokenize(str))
+        num_tokens = len(nltk.word_tokenize(string))
 
     return num_tokens
 
+
+def truncate_to_tokens(string: str, max_tokens: int, encoding_name: str) -> str:
+    # Keeps the first max_tokens tokens of string (words for nltk)
+    if max_tokens <= 0:
+        return ""
+    if (config.TOKENIZER == "tiktoken"):
+        encoding = get_encoding(encoding_name)
+        return encoding.decode(encoding.encode(string)[:max_tokens])
+    return ' '.join(nltk.word_tokenize(string)[:max_tokens])
+
 def find_master_name(alias):
     for master_name, alias_list in ALIASES.values():  # Loop over the values of the ALIASES dictionary
         if alias in alias_list: